@@ -23,6 +23,23 @@ from .error_code_calculations import (
     validate_register_access,
 )
 
+#----logging helpers----
+from .logging_helpers import (
+    LOG_MODES,
+    EventLog,
+    LazyHead,
+    setup_logging,
+)
+
+#----run instrumentation----
+from .instrumentation import RunMetrics
+
+#----csv reader----
+from .csv_reader import (
+    CSV_ENGINES,
+    read_csv_table,
+)
+
 
 __all__ = [
     'get_table_config',
@@ -41,5 +58,12 @@ __all__ = [
     'get_all_patterns',
     'get_pattern_types',
     'validate_register_access',
+    'LOG_MODES',
+    'EventLog',
+    'LazyHead',
+    'setup_logging',
+    'RunMetrics',
+    'CSV_ENGINES',
+    'read_csv_table',
 ]
 
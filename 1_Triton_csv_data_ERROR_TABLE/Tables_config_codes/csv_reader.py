@@ -0,0 +1,107 @@
+import csv
+import logging
+from typing import Optional, Sequence
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # pandas is used for everything without pyarrow
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# auto:    pyarrow if installed, pandas otherwise
+# pyarrow: multithreaded pyarrow.csv reader (raises if not installed)
+# pandas:  single-threaded pd.read_csv
+CSV_ENGINES = ("auto", "pyarrow", "pandas")
+
+# Cells read as missing values (pd.read_csv defaults)
+NULL_VALUES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+               "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"]
+
+
+def _read_header(path: str, encoding: str) -> list:
+    with open(path, encoding=encoding, newline='') as f:
+        header = next(csv.reader(f), [])
+    if header:
+        header[0] = header[0].lstrip('\ufeff')  # pyarrow drops the UTF-8 BOM too
+    return header
+
+
+def _read_pandas(path, dtype, timestamp_columns, timestamp_format, dictionary_columns, encoding):
+    df = pd.read_csv(path, encoding=encoding, dtype=dtype)
+    for column in timestamp_columns:
+        df[column] = pd.to_datetime(df[column], format=timestamp_format)
+    for column in dictionary_columns:
+        df[column] = df[column].astype('category')
+    return df
+
+
+def read_csv_table(path: str, dtype=None, timestamp_columns: Sequence[str] = (),
+                   timestamp_format: Optional[str] = None, dictionary_columns: Sequence[str] = (),
+                   engine: str = "auto", encoding: str = "utf-8", use_threads: bool = True) -> pd.DataFrame:
+    """
+    Read a raw export (Triton / postgres / parsed CSV) into a DataFrame.
+
+    With the pyarrow engine the file is split into blocks that are parsed
+    and converted on all cores; the pandas engine is the fallback.
+
+    Args:
+        path: CSV file path
+        dtype: None to infer column types, str to keep every column as
+               text (register words like "0000" / "1CA2" must stay strings),
+               or {column: dtype} for some columns only. pyarrow infers
+               ISO timestamps (tz-aware ones are converted to UTC), so pass
+               {column: str} for timestamp text that must be kept as is
+        timestamp_columns: Columns parsed to datetime64[ns] while reading
+        timestamp_format: strptime format of timestamp_columns (None = ISO 8601)
+        dictionary_columns: Low-cardinality text columns (e.g. Machine_Name)
+               read dictionary-encoded and returned as pandas categoricals
+        engine: One of CSV_ENGINES
+        encoding: File encoding
+        use_threads: Let pyarrow use all cores
+
+    Returns:
+        DataFrame (missing cells are NaN/None as with pd.read_csv)
+    """
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"CSV engine '{engine}' not supported. Use one of {CSV_ENGINES}")
+    if engine == "pyarrow" and pa is None:
+        raise ImportError("pyarrow is required for engine='pyarrow'")
+
+    if engine == "pandas" or pa is None:
+        return _read_pandas(path, dtype, timestamp_columns, timestamp_format, dictionary_columns, encoding)
+
+    column_types = {}
+    if dtype is str:
+        column_types = dict.fromkeys(_read_header(path, encoding), pa.string())
+    elif isinstance(dtype, dict):
+        column_types = {column: pa.string() if column_type is str else pa.from_numpy_dtype(np.dtype(column_type))
+                        for column, column_type in dtype.items()}
+    for column in timestamp_columns:
+        column_types[column] = pa.timestamp('ns')
+    for column in dictionary_columns:
+        column_types[column] = pa.dictionary(pa.int32(), pa.string())
+
+    try:
+        table = pa_csv.read_csv(
+            path,
+            read_options=pa_csv.ReadOptions(use_threads=use_threads, encoding=encoding),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=column_types,
+                null_values=NULL_VALUES,
+                strings_can_be_null=True,
+                timestamp_parsers=[timestamp_format] if timestamp_format else None,
+            ),
+        )
+    except pa.ArrowInvalid as e:
+        # Types inferred from the first block can fail on a later one
+        # (e.g. a register column that turns hex further down)
+        if engine == "pyarrow":
+            raise
+        logger.warning("pyarrow could not read %s (%s); falling back to pandas", path, e)
+        return _read_pandas(path, dtype, timestamp_columns, timestamp_format, dictionary_columns, encoding)
+    logger.debug("Read %d rows x %d columns from %s with pyarrow", table.num_rows, table.num_columns, path)
+    return table.to_pandas(use_threads=use_threads)
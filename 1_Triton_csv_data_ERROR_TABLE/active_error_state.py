@@ -0,0 +1,141 @@
+import struct
+import numpy as np
+from typing import Dict, Tuple
+from Tables_config_codes import ERROR_PATTERN_TYPES, get_bit_number
+
+
+class ErrorBitLayout:
+    """
+    Register/bit -> bit number lookup for one error pattern, built once.
+
+    Attributes:
+        registers: Monitored registers in ascending order (e.g. 550..589)
+        register_index: {register: row in bit_numbers}
+        bit_numbers: int array (n_registers, 16) of absolute bit numbers
+        error_codes: uint8 array (n_bits,) of error type code per bit number
+        error_types: {error code: error type name} (e.g. {1: '起動時異常'})
+    """
+
+    def __init__(self, pattern: str):
+        if pattern not in ERROR_PATTERN_TYPES:
+            raise ValueError(f"Pattern '{pattern}' not found in ERROR_PATTERN_TYPES")
+
+        self.pattern = pattern
+        pattern_config = ERROR_PATTERN_TYPES[pattern]
+        self.error_types = {int(config['code']): error_type
+                            for error_type, config in pattern_config.items()}
+
+        self.registers = sorted(
+            register
+            for config in pattern_config.values()
+            for register in range(config['register_start'], config['register_end'] + 1)
+        )
+        self.register_index = {register: i for i, register in enumerate(self.registers)}
+
+        self.bit_numbers = np.zeros((len(self.registers), 16), dtype=np.int64)
+        codes = {}
+        for i, register in enumerate(self.registers):
+            for bit_position in range(16):
+                bit_number, _, error_code = get_bit_number(register, bit_position, pattern)
+                self.bit_numbers[i, bit_position] = bit_number
+                codes[bit_number] = int(error_code)
+
+        self.n_bits = int(self.bit_numbers.max()) + 1
+        self.error_codes = np.zeros(self.n_bits, dtype=np.uint8)
+        self.error_codes[list(codes)] = list(codes.values())
+
+
+class ActiveErrorState:
+    """
+    Active errors of one machine, indexed by bit number.
+
+    Replaces the {bit_number: {'start_time', 'error_type'}} dict with a
+    bit mask plus preallocated arrays:
+        active:      bool  (n_bits,)  - bit currently on
+        start_times: int64 (n_bits,)  - start time in ns since epoch
+        error_types: uint8 (n_bits,)  - error type code, 0 when inactive
+    """
+
+    # n_bits, number of active bits
+    _HEADER = struct.Struct('<HH')
+
+    def __init__(self, n_bits: int = 640):
+        self.n_bits = n_bits
+        self.active = np.zeros(n_bits, dtype=bool)
+        self.start_times = np.zeros(n_bits, dtype=np.int64)
+        self.error_types = np.zeros(n_bits, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.active))
+
+    def __contains__(self, bit_number: int) -> bool:
+        return bool(self.active[bit_number])
+
+    def changes(self, bit_numbers: np.ndarray, bit_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compare incoming bits against the active mask.
+
+        Args:
+            bit_numbers: Bit numbers being updated
+            bit_values: bool array aligned with bit_numbers
+
+        Returns:
+            Tuple of (newly_set, newly_cleared) masks aligned with bit_numbers
+        """
+        was_active = self.active[bit_numbers]
+        return bit_values & ~was_active, ~bit_values & was_active
+
+    def start(self, bit_numbers: np.ndarray, start_time: int, error_codes: np.ndarray):
+        """Mark bits as active from start_time (ns since epoch)."""
+        self.active[bit_numbers] = True
+        self.start_times[bit_numbers] = start_time
+        self.error_types[bit_numbers] = error_codes
+
+    def end(self, bit_numbers: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Clear bits and return their (start_times, error_codes)."""
+        start_times = self.start_times[bit_numbers].copy()
+        error_codes = self.error_types[bit_numbers].copy()
+        self.active[bit_numbers] = False
+        self.start_times[bit_numbers] = 0
+        self.error_types[bit_numbers] = 0
+        return start_times, error_codes
+
+    def summary(self, current_time: int) -> Dict[str, np.ndarray]:
+        """Active bits with start time, error code and seconds active at current_time (ns)."""
+        bits = np.flatnonzero(self.active)
+        return {
+            'bit_number': bits,
+            'start_time': self.start_times[bits],
+            'error_type': self.error_types[bits],
+            'duration_so_far': (current_time - self.start_times[bits]) / 1e9,
+        }
+
+    def to_bytes(self) -> bytes:
+        """Serialize for checkpoints: header, packed mask, then start times/codes of active bits."""
+        bits = np.flatnonzero(self.active)
+        return b''.join([
+            self._HEADER.pack(self.n_bits, len(bits)),
+            np.packbits(self.active).tobytes(),
+            self.start_times[bits].astype('<i8').tobytes(),
+            self.error_types[bits].tobytes(),
+        ])
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'ActiveErrorState':
+        """Restore a state written by to_bytes()."""
+        n_bits, count = cls._HEADER.unpack_from(payload)
+        state = cls(n_bits)
+
+        offset = cls._HEADER.size
+        mask_size = (n_bits + 7) // 8
+        mask = np.frombuffer(payload, dtype=np.uint8, count=mask_size, offset=offset)
+        state.active[:] = np.unpackbits(mask, count=n_bits).astype(bool)
+        offset += mask_size
+
+        bits = np.flatnonzero(state.active)
+        if len(bits) != count:
+            raise ValueError(f"Corrupt state: header says {count} active bits, mask has {len(bits)}")
+        state.start_times[bits] = np.frombuffer(payload, dtype='<i8', count=count, offset=offset)
+        offset += 8 * count
+        state.error_types[bits] = np.frombuffer(payload, dtype=np.uint8, count=count, offset=offset)
+        return state
@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from typing import Optional, Tuple
+from error_episodes import ErrorEpisodeStore
+
+
+def _machine_starts(store: ErrorEpisodeStore, machine_name: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Start times (ns, sorted) and bit numbers of one machine's episodes."""
+    index = store.indexes.get(machine_name)
+    if index is None:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    return index.start, store.episodes['bit_number'].values[index.rows].astype(np.int64)
+
+
+def _n_bits(store: ErrorEpisodeStore) -> int:
+    return int(store.episodes['bit_number'].max()) + 1 if len(store) else 0
+
+
+def cooccurrence_matrix(store: ErrorEpisodeStore, machine_name: str, window: str = '30s') -> sparse.csr_matrix:
+    """
+    Symmetric bit x bit count of time windows in which both bits started.
+
+    Starts are binned into tumbling windows; with X the (window x bit)
+    incidence matrix, the co-occurrence counts are X^T X. The diagonal
+    holds the number of windows in which each bit started.
+    """
+    start, bits = _machine_starts(store, machine_name)
+    n_bits = _n_bits(store)
+    if not len(start):
+        return sparse.csr_matrix((n_bits, n_bits), dtype=np.int64)
+
+    window_ids = np.unique((start - start[0]) // pd.Timedelta(window).value, return_inverse=True)[1]
+    incidence = sparse.csr_matrix(
+        (np.ones(len(bits), dtype=np.int64), (window_ids, bits)),
+        shape=(window_ids.max() + 1, n_bits))
+    incidence.sum_duplicates()
+    incidence.data[:] = 1  # a bit starting twice in one window counts once
+    return (incidence.T @ incidence).tocsr()
+
+
+def precedence_matrix(store: ErrorEpisodeStore, machine_name: str, window: str = '30s') -> sparse.csr_matrix:
+    """
+    Directed bit x bit counts: [a, b] = starts of b within `window` after a start of a.
+
+    Built with a sorted sweep: for every start, the following starts within
+    the window form a contiguous slice, so the work is proportional to the
+    number of such pairs rather than to the square of the episode count.
+    """
+    start, bits = _machine_starts(store, machine_name)
+    n_bits = _n_bits(store)
+    if not len(start):
+        return sparse.csr_matrix((n_bits, n_bits), dtype=np.int64)
+
+    first = np.arange(1, len(start) + 1)
+    last = np.searchsorted(start, start + pd.Timedelta(window).value, side='right')
+    counts = last - first
+    leaders = np.repeat(np.arange(len(start)), counts)
+    followers = np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+    pairs = sparse.coo_matrix(
+        (np.ones(len(leaders), dtype=np.int64), (bits[leaders], bits[followers])),
+        shape=(n_bits, n_bits))
+    return pairs.tocsr()
+
+
+def strongest_pairs(store: ErrorEpisodeStore, window: str = '30s', machine_name: Optional[str] = None,
+                    top: int = 20, min_count: int = 2) -> pd.DataFrame:
+    """
+    Bit pairs that most often start in the same window, per machine.
+
+    Returns:
+        DataFrame with Machine_Name, bit_a, bit_b, count, windows_a,
+        windows_b and jaccard = count / (windows_a + windows_b - count)
+    """
+    machines = [machine_name] if machine_name is not None else list(store.indexes)
+    results = []
+    for machine in machines:
+        matrix = cooccurrence_matrix(store, machine, window)
+        support = matrix.diagonal()
+        pairs = sparse.triu(matrix, k=1).tocoo()
+        keep = pairs.data >= min_count
+        bit_a, bit_b, count = pairs.row[keep], pairs.col[keep], pairs.data[keep]
+        results.append(pd.DataFrame({
+            'Machine_Name': machine,
+            'bit_a': bit_a,
+            'bit_b': bit_b,
+            'count': count,
+            'windows_a': support[bit_a],
+            'windows_b': support[bit_b],
+            'jaccard': count / (support[bit_a] + support[bit_b] - count),
+        }))
+
+    if not results:
+        return pd.DataFrame(columns=['Machine_Name', 'bit_a', 'bit_b', 'count', 'windows_a', 'windows_b', 'jaccard'])
+    pairs = pd.concat(results, ignore_index=True)
+    pairs = pairs.sort_values(['count', 'jaccard'], ascending=False, kind='stable')
+    return pairs.groupby('Machine_Name', sort=False).head(top).reset_index(drop=True)
+
+
+def first_cause_bits(store: ErrorEpisodeStore, window: str = '30s',
+                     machine_name: Optional[str] = None, min_size: int = 2) -> pd.DataFrame:
+    """
+    Likely "first cause" bits of alarm cascades.
+
+    A cascade is a chain of starts on one machine where each start follows
+    the previous one within `window`; cascades with fewer than min_size
+    starts are ignored. For each bit the result counts the cascades it led
+    and took part in, plus how often it preceded / followed other bits.
+
+    Returns:
+        DataFrame with Machine_Name, bit_number, cascades_led,
+        cascades_joined, lead_ratio, preceded, followed - sorted by
+        cascades_led
+    """
+    window_ns = pd.Timedelta(window).value
+    machines = [machine_name] if machine_name is not None else list(store.indexes)
+    results = []
+    for machine in machines:
+        start, bits = _machine_starts(store, machine)
+        if not len(start):
+            continue
+
+        cascade_ids = np.cumsum(np.r_[True, np.diff(start) > window_ns])
+        sizes = np.bincount(cascade_ids)
+        in_cascade = sizes[cascade_ids] >= min_size
+        is_leader = np.r_[True, cascade_ids[1:] != cascade_ids[:-1]] & in_cascade
+
+        n_bits = _n_bits(store)
+        cascades_led = np.bincount(bits[is_leader], minlength=n_bits)
+        # Count each bit once per cascade it joined
+        joined = np.unique(np.stack([cascade_ids[in_cascade], bits[in_cascade]]), axis=1)
+        cascades_joined = np.bincount(joined[1], minlength=n_bits)
+
+        precedence = precedence_matrix(store, machine, window)
+        precedence.setdiag(0)
+        preceded = np.asarray(precedence.sum(axis=1)).ravel()
+        followed = np.asarray(precedence.sum(axis=0)).ravel()
+
+        involved = np.flatnonzero(cascades_joined)
+        results.append(pd.DataFrame({
+            'Machine_Name': machine,
+            'bit_number': involved,
+            'cascades_led': cascades_led[involved],
+            'cascades_joined': cascades_joined[involved],
+            'lead_ratio': cascades_led[involved] / cascades_joined[involved],
+            'preceded': preceded[involved],
+            'followed': followed[involved],
+        }))
+
+    if not results:
+        return pd.DataFrame(columns=['Machine_Name', 'bit_number', 'cascades_led', 'cascades_joined',
+                                     'lead_ratio', 'preceded', 'followed'])
+    causes = pd.concat(results, ignore_index=True)
+    return causes.sort_values(['Machine_Name', 'cascades_led', 'lead_ratio'],
+                              ascending=[True, False, False], kind='stable').reset_index(drop=True)
@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from Tables_config_codes import ERROR_PATTERN_TYPES
+from error_events import EVENT_COLUMNS, OFF_STATUS, pair_error_events, episodes_to_events
+
+# Example: {'起動時異常': {'min_on_time': 1, 'min_off_time': 2}}
+#   min_on_time:  episodes shorter than this (seconds) are dropped as glitches
+#   min_off_time: episodes re-starting within this gap (seconds) are merged
+
+
+def validate_debounce_config(debounce_config: Dict[str, Dict[str, float]]):
+    """Check that every configured error type exists in ERROR_PATTERN_TYPES."""
+    error_types = {error_type
+                   for pattern_config in ERROR_PATTERN_TYPES.values()
+                   for error_type in pattern_config}
+    for error_type, limits in debounce_config.items():
+        if error_type not in error_types:
+            raise ValueError(f"Error type '{error_type}' not found in ERROR_PATTERN_TYPES")
+        unknown = set(limits) - {'min_on_time', 'min_off_time'}
+        if unknown:
+            raise ValueError(f"Unknown debounce setting(s) for '{error_type}': {sorted(unknown)}")
+
+
+def merge_error_episodes(episodes: pd.DataFrame,
+                         debounce_config: Dict[str, Dict[str, float]]) -> pd.DataFrame:
+    """Merge episodes of a bit re-starting within min_off_time of the previous end, ordered by start_seq."""
+    ep = episodes.sort_values(['Machine_Name', 'bit_number', 'start'], kind='stable').reset_index(drop=True)
+    min_off_time = ep['error_type'].map(
+        {t: limits.get('min_off_time', 0) for t, limits in debounce_config.items()}).fillna(0)
+
+    # Merge an episode into the previous one of the same bit when the gap is short
+    previous_end = ep.groupby(['Machine_Name', 'bit_number'], sort=False)['end'].shift()
+    gap = (ep['start'] - previous_end).dt.total_seconds()
+    merge = gap.notna() & (gap < min_off_time)
+    group = (~merge).cumsum()
+
+    grouped = ep.groupby(group, sort=False)
+    merged = grouped.head(1).reset_index(drop=True)
+    last = grouped.tail(1).reset_index(drop=True)
+    merged['end'] = last['end'].values
+    merged['end_seq'] = last['end_seq'].values
+    return merged.sort_values('start_seq', kind='stable').reset_index(drop=True)
+
+
+def drop_error_glitches(episodes: pd.DataFrame,
+                        debounce_config: Dict[str, Dict[str, float]]) -> pd.DataFrame:
+    """Drop closed episodes shorter than min_on_time of their error type."""
+    min_on_time = episodes['error_type'].map(
+        {t: limits.get('min_on_time', 0) for t, limits in debounce_config.items()}).fillna(0)
+    duration = (episodes['end'] - episodes['start']).dt.total_seconds()
+    keep = episodes['end'].isna() | (duration >= min_on_time)
+    return episodes[keep].reset_index(drop=True)
+
+
+def debounce_error_episodes(episodes: pd.DataFrame,
+                            debounce_config: Dict[str, Dict[str, float]]) -> pd.DataFrame:
+    """
+    Merge short off-gaps and drop short on-glitches, per error type.
+
+    Gaps are merged first so that a chattering bit becomes one long episode
+    instead of being dropped piece by piece. Episodes still active (no end)
+    are never dropped.
+
+    Args:
+        episodes: Episodes from pair_error_events()
+        debounce_config: {error_type: {'min_on_time': s, 'min_off_time': s}}
+
+    Returns:
+        Debounced episodes with the same columns
+    """
+    if episodes.empty or not debounce_config:
+        return episodes
+    return drop_error_glitches(merge_error_episodes(episodes, debounce_config), debounce_config)
+
+
+def debounce_error_events(events: pd.DataFrame,
+                          debounce_config: Dict[str, Dict[str, float]]) -> pd.DataFrame:
+    """Debounce an error event stream (see debounce_error_episodes)."""
+    if events.empty or not debounce_config:
+        return events
+    episodes = debounce_error_episodes(pair_error_events(events), debounce_config)
+    return episodes_to_events(episodes)
+
+
+class EventDebouncer:
+    """
+    Debounce an event stream that arrives in batches (one push() per flush).
+
+    debounce_error_events() pairs starts and ends within one batch, so an
+    end whose start went out in an earlier batch would be dropped. This
+    keeps the state between batches instead:
+      - episodes whose start was already emitted get their end passed
+        through (duration measured from the emitted start), unless a
+        restart within min_off_time merges it away; with final=False an
+        end younger than min_off_time is held back until that is known
+      - with final=False, episodes that can still change are held back:
+        open ones younger than min_on_time (may still be a glitch) and
+        closed ones that ended less than min_off_time ago (may still be
+        merged with a restart); their raw events are replayed in the next
+        push()
+      - with final=True nothing is held back; open episodes are emitted
+        as starts and their ends pass through later
+
+    Example:
+        >>> debouncer = EventDebouncer({'起動時異常': {'min_on_time': 1}})
+        >>> rows = debouncer.push(events, final=False)   # every flush
+        >>> rows = debouncer.push(last_events)          # at the end
+    """
+
+    def __init__(self, debounce_config: Dict[str, Dict[str, float]]):
+        validate_debounce_config(debounce_config)
+        self.debounce_config = debounce_config
+        self.min_on_time = {t: limits.get('min_on_time', 0) for t, limits in debounce_config.items()}
+        self.min_off_time = {t: limits.get('min_off_time', 0) for t, limits in debounce_config.items()}
+        # Raw events replayed in the next push()
+        self.held = pd.DataFrame(columns=EVENT_COLUMNS)
+        # {(machine, bit): start time} of episodes emitted while still open
+        self.open_starts: Dict[Tuple[str, int], pd.Timestamp] = {}
+
+    def push(self, events: pd.DataFrame, final: bool = True, as_of: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Debounce the next batch of raw events; returns the events to emit (EVENT_COLUMNS).
+
+        Held episodes are judged at the latest event time, or at `as_of` when
+        that is later (the time up to which the scans are known to have no
+        further events, so held episodes can be released in quiet periods).
+        """
+        pieces = [frame[EVENT_COLUMNS] for frame in (self.held, events) if not frame.empty]
+        self.held = pd.DataFrame(columns=EVENT_COLUMNS)
+        if not pieces:
+            return pd.DataFrame(columns=EVENT_COLUMNS)
+        events = pd.concat(pieces, ignore_index=True) if len(pieces) > 1 else pieces[0].reset_index(drop=True)
+        keys = list(zip(events['Machine_Name'], events['bit_number']))
+
+        # Events of already emitted open episodes: an end followed by a
+        # restart within min_off_time is merged away (the episode goes on),
+        # any other end is passed through, or held while a restart could
+        # still come (final=False)
+        latest = pd.Timestamp(events['Timestamp'].max())
+        as_of = latest if as_of is None else max(latest, pd.Timestamp(as_of))
+        passthrough = np.zeros(len(events), dtype=bool)
+        merged_away = np.zeros(len(events), dtype=bool)
+        held_ends = np.zeros(len(events), dtype=bool)
+        durations = events['duration'].astype(float).to_numpy(copy=True)
+        if self.open_starts:
+            positions: Dict[Tuple[str, int], list] = {}
+            for i, key in enumerate(keys):
+                if key in self.open_starts:
+                    positions.setdefault(key, []).append(i)
+            statuses = events['number_status'].to_numpy()
+            timestamps = pd.to_datetime(events['Timestamp'])
+            error_types = events['error_type'].to_numpy()
+            for key, rows in positions.items():
+                j = 0
+                while j < len(rows) and statuses[rows[j]] == OFF_STATUS:
+                    end = timestamps.iat[rows[j]]
+                    min_off = self.min_off_time.get(error_types[rows[j]], 0)
+                    if j + 1 < len(rows):
+                        if (timestamps.iat[rows[j + 1]] - end).total_seconds() < min_off:
+                            merged_away[[rows[j], rows[j + 1]]] = True
+                            j += 2
+                            continue
+                    elif not final and (as_of - end).total_seconds() < min_off:
+                        held_ends[rows[j]] = True
+                        break
+                    passthrough[rows[j]] = True
+                    durations[rows[j]] = (end - self.open_starts.pop(key)).total_seconds()
+                    break
+
+        rest_positions = np.flatnonzero(~(passthrough | merged_away | held_ends))
+        rest = events.iloc[rest_positions].reset_index(drop=True)
+        # Glitches are dropped only once their episode is final: a short
+        # episode may still be merged with a restart
+        episodes = pair_error_events(rest)
+        if not episodes.empty:
+            episodes = merge_error_episodes(episodes, self.debounce_config)
+
+        hold = np.zeros(len(episodes), dtype=bool)
+        if not final and not episodes.empty:
+            min_on = episodes['error_type'].map(self.min_on_time).fillna(0).to_numpy()
+            min_off = episodes['error_type'].map(self.min_off_time).fillna(0).to_numpy()
+            open_episode = episodes['end'].isna().to_numpy()
+            open_for = (as_of - episodes['start']).dt.total_seconds().to_numpy()
+            closed_for = (as_of - episodes['end']).dt.total_seconds().to_numpy()
+            hold = (open_episode & (open_for < min_on)) | (~open_episode & (closed_for < min_off))
+
+        # Once an episode of a bit is held, everything after it on that bit is held too
+        held_from: Dict[Tuple[str, int], int] = {}
+        for key, start_seq in zip(zip(episodes['Machine_Name'][hold], episodes['bit_number'][hold]),
+                                  episodes['start_seq'][hold]):
+            held_from[key] = min(held_from.get(key, start_seq), start_seq)
+        if held_from:
+            episode_keys = zip(episodes['Machine_Name'], episodes['bit_number'], episodes['start_seq'])
+            hold = np.array([key[:2] in held_from and key[2] >= held_from[key[:2]] for key in episode_keys])
+            rest_keys = list(zip(rest['Machine_Name'], rest['bit_number']))
+            held_rows = [i for i, key in enumerate(rest_keys) if key in held_from and i >= held_from[key]]
+            held_ends[rest_positions[held_rows]] = True
+        if held_ends.any():
+            self.held = events[held_ends].reset_index(drop=True)
+
+        emitted = drop_error_glitches(episodes[~hold], self.debounce_config) if not episodes.empty \
+            else episodes.copy()
+        for machine, bit, start in zip(emitted['Machine_Name'][emitted['end'].isna()],
+                                       emitted['bit_number'][emitted['end'].isna()],
+                                       emitted['start'][emitted['end'].isna()]):
+            self.open_starts[(machine, bit)] = pd.Timestamp(start)
+
+        # Back to positions in the combined batch so passthrough ends keep their place
+        closed = emitted['end'].notna()
+        emitted['start_seq'] = rest_positions[emitted['start_seq'].to_numpy(dtype=np.int64)]
+        emitted.loc[closed, 'end_seq'] = rest_positions[emitted.loc[closed, 'end_seq'].to_numpy(dtype=np.int64)]
+        out = episodes_to_events(emitted)
+        # episodes_to_events orders by these positions, so sorting them gives each row's position
+        out['seq'] = np.sort(np.concatenate([emitted['start_seq'].to_numpy(dtype=np.int64),
+                                             emitted.loc[closed, 'end_seq'].to_numpy(dtype=np.int64)]))
+        ends = events[passthrough].assign(duration=durations[passthrough], seq=np.flatnonzero(passthrough))
+        if not ends.empty:
+            out = pd.concat([out, ends], ignore_index=True) if not out.empty else ends
+        return out.sort_values('seq', kind='stable')[EVENT_COLUMNS].reset_index(drop=True)
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+from error_events import pair_error_events
+
+# End time used for episodes that are still active
+OPEN_END = np.iinfo(np.int64).max
+
+EPISODE_RESULT_COLUMNS = ['Machine_Name', 'bit_number', 'error_type', 'start', 'end', 'duration']
+
+
+class _MachineEpisodeIndex:
+    """
+    Interval index over one machine's episodes.
+
+    Episodes are sorted by start; max_end[i] is the largest end among the
+    first i+1 episodes. For a window [t0, t1) every overlapping episode lies
+    in [searchsorted(max_end, t0), searchsorted(start, t1)), so a query
+    costs two binary searches plus a vector filter over that slice.
+    """
+
+    def __init__(self, rows: np.ndarray, start: np.ndarray, end: np.ndarray):
+        order = np.argsort(start, kind='stable')
+        self.rows = rows[order]
+        self.start = start[order]
+        self.end = end[order]
+        self.max_end = np.maximum.accumulate(self.end) if len(self.end) else self.end
+
+    def overlapping(self, t0: int, t1: int) -> np.ndarray:
+        """Rows of episodes with start < t1 and end > t0 (start <= t0 for points)."""
+        lo = np.searchsorted(self.max_end, t0, side='right')
+        hi = np.searchsorted(self.start, t1, side='right' if t0 == t1 else 'left')
+        hits = self.end[lo:hi] > t0
+        return self.rows[lo:hi][hits]
+
+
+class ErrorEpisodeStore:
+    """
+    Error episodes (start, end, machine, bit_number, type) with fast
+    "active during window" queries.
+
+    An episode covers [start, end): the end time is the scan where the bit
+    was seen cleared. Episodes still active have no end; their duration is
+    measured up to `as_of` (default: the last start/end time in the data).
+    """
+
+    def __init__(self, episodes: pd.DataFrame, as_of: Optional[datetime] = None):
+        self.episodes = episodes.reset_index(drop=True)
+        start = pd.to_datetime(self.episodes['start']).values.astype('datetime64[ns]').astype(np.int64)
+        end_times = pd.to_datetime(self.episodes['end'])
+        self.is_open = end_times.isna().values
+        end = end_times.values.astype('datetime64[ns]').astype(np.int64)
+        end[self.is_open] = OPEN_END
+
+        if as_of is not None:
+            as_of_ns = pd.Timestamp(as_of).value
+        elif len(start):
+            as_of_ns = max(start.max(), end[~self.is_open].max(initial=start.max()))
+        else:
+            as_of_ns = 0
+        self.as_of = pd.Timestamp(as_of_ns)
+        self.duration = (np.minimum(end, as_of_ns) - start) / 1e9
+
+        self.start_ns = start
+        self.end_ns = end
+        self.indexes: Dict[str, _MachineEpisodeIndex] = {}
+        for machine, rows in self.episodes.groupby('Machine_Name', sort=False).indices.items():
+            self.indexes[machine] = _MachineEpisodeIndex(rows, start[rows], end[rows])
+
+    @classmethod
+    def from_events(cls, events: pd.DataFrame, as_of: Optional[datetime] = None) -> 'ErrorEpisodeStore':
+        """Build the store from an error event stream (EVENT_COLUMNS)."""
+        return cls(pair_error_events(events), as_of=as_of)
+
+    def __len__(self) -> int:
+        return len(self.episodes)
+
+    def _machines(self, machine: Optional[str]) -> Iterable[_MachineEpisodeIndex]:
+        if machine is None:
+            return self.indexes.values()
+        index = self.indexes.get(machine)
+        return [index] if index is not None else []
+
+    def _result(self, rows: np.ndarray) -> pd.DataFrame:
+        result = self.episodes.loc[rows, ['Machine_Name', 'bit_number', 'error_type', 'start', 'end']]
+        result['duration'] = self.duration[rows]
+        return result.reset_index(drop=True)
+
+    def _query(self, t0: int, t1: int, machine: Optional[str],
+               bit_numbers: Optional[Iterable[int]]) -> np.ndarray:
+        parts = [index.overlapping(t0, t1) for index in self._machines(machine)]
+        rows = np.sort(np.concatenate(parts)) if parts else np.array([], dtype=np.int64)
+        if bit_numbers is not None:
+            rows = rows[np.isin(self.episodes['bit_number'].values[rows], list(bit_numbers))]
+        return rows
+
+    def overlapping(self, start: datetime, end: datetime, machine: Optional[str] = None,
+                    bit_numbers: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """
+        Episodes active at any time in [start, end).
+
+        Example:
+            >>> store.overlapping("2025-11-27 14:15:27", "2025-11-27 14:39:49", machine="AM323")
+        """
+        rows = self._query(pd.Timestamp(start).value, pd.Timestamp(end).value, machine, bit_numbers)
+        return self._result(rows)
+
+    def active_at(self, timestamp: datetime, machine: Optional[str] = None,
+                  bit_numbers: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """Episodes active at a single point in time."""
+        t = pd.Timestamp(timestamp).value
+        return self._result(self._query(t, t, machine, bit_numbers))
+
+    def top_by_duration(self, n: int = 10, machine: Optional[str] = None,
+                        start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
+        """Longest n episodes, optionally restricted to a machine and/or window."""
+        if start is not None or end is not None:
+            t0 = pd.Timestamp(start).value if start is not None else np.iinfo(np.int64).min
+            t1 = pd.Timestamp(end).value if end is not None else OPEN_END
+            rows = self._query(t0, t1, machine, None)
+        elif machine is not None:
+            rows = np.concatenate([index.rows for index in self._machines(machine)] or [np.array([], dtype=np.int64)])
+        else:
+            rows = np.arange(len(self.episodes))
+
+        if len(rows) > n:
+            rows = rows[np.argpartition(-self.duration[rows], n - 1)[:n]]
+        rows = rows[np.argsort(-self.duration[rows], kind='stable')]
+        return self._result(rows)
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+from Tables_config_codes import ERROR_TABLE
+
+# Status values written to the ON/OFF column of the error table
+ON_STATUS = "on"
+OFF_STATUS = "異常処置終了"
+
+# IO_0502 word -> operation mode (運転モード)
+MODE_NAMES = {"9000": "自動", "A000": "手動", "8000": "払出"}
+
+# Error event stream: one row per error start/end, in emission order
+EVENT_COLUMNS = ['Timestamp', 'Machine_Name', 'bit_number', 'error_type', 'number_status', 'duration']
+
+# Error episodes: one row per start with its matching end (NaT while still active)
+EPISODE_COLUMNS = ['Machine_Name', 'bit_number', 'error_type', 'start', 'end', 'start_seq', 'end_seq']
+
+
+def pair_error_events(events: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pair the start and end events of each (machine, bit) into episodes.
+
+    Args:
+        events: Event stream with EVENT_COLUMNS, in emission order
+
+    Returns:
+        DataFrame with EPISODE_COLUMNS sorted by start_seq; start_seq/end_seq
+        are the positions of the start/end events in the input stream.
+        End events without a preceding start are ignored.
+    """
+    if events.empty:
+        return pd.DataFrame(columns=EPISODE_COLUMNS)
+
+    ev = events.reset_index(drop=True)
+    ev['seq'] = np.arange(len(ev))
+    ev = ev.sort_values(['Machine_Name', 'bit_number', 'seq'], kind='stable')
+
+    # Per (machine, bit) the tracker alternates start, end, start, ...
+    # so a start is closed by the next event of the same key
+    nxt = ev.shift(-1)
+    is_on = ev['number_status'] == ON_STATUS
+    closes = (
+        is_on
+        & (nxt['Machine_Name'] == ev['Machine_Name'])
+        & (nxt['bit_number'] == ev['bit_number'])
+        & (nxt['number_status'] == OFF_STATUS)
+    )
+
+    starts = ev[is_on]
+    episodes = pd.DataFrame({
+        'Machine_Name': starts['Machine_Name'].values,
+        'bit_number': starts['bit_number'].values,
+        'error_type': starts['error_type'].values,
+        'start': pd.to_datetime(starts['Timestamp'].values),
+        'end': pd.to_datetime(nxt['Timestamp'].where(closes)[is_on].values),
+        'start_seq': starts['seq'].values,
+        'end_seq': nxt['seq'].where(closes)[is_on].astype('Int64').values,
+    })
+    return episodes.sort_values('start_seq', kind='stable').reset_index(drop=True)
+
+
+def episodes_to_events(episodes: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turn episodes back into an event stream (inverse of pair_error_events).
+
+    Start events get duration 0, end events the episode duration in
+    seconds; events are ordered by their original stream position.
+    """
+    if episodes.empty:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+
+    on_rows = pd.DataFrame({
+        'Timestamp': episodes['start'].values,
+        'Machine_Name': episodes['Machine_Name'].values,
+        'bit_number': episodes['bit_number'].values,
+        'error_type': episodes['error_type'].values,
+        'number_status': ON_STATUS,
+        'duration': 0.0,
+        'seq': episodes['start_seq'].values,
+    })
+
+    closed = episodes[episodes['end'].notna()]
+    off_rows = pd.DataFrame({
+        'Timestamp': closed['end'].values,
+        'Machine_Name': closed['Machine_Name'].values,
+        'bit_number': closed['bit_number'].values,
+        'error_type': closed['error_type'].values,
+        'number_status': OFF_STATUS,
+        'duration': (closed['end'] - closed['start']).dt.total_seconds().values,
+        'seq': closed['end_seq'].astype('int64').values,
+    })
+
+    events = pd.concat([on_rows, off_rows], ignore_index=True)
+    events = events.sort_values('seq', kind='stable').reset_index(drop=True)
+    return events[EVENT_COLUMNS]
+
+
+def events_from_error_table(table: pd.DataFrame) -> pd.DataFrame:
+    """Rebuild the event stream from an error table (output DataFrame or exported CSV)."""
+    columns = list(ERROR_TABLE['columns'].keys())
+    return pd.DataFrame({
+        'Timestamp': pd.to_datetime(table[columns[0]], format="%Y/%m/%d %H:%M:%S"),   # 日付
+        'Machine_Name': table[columns[5]].values,                                     # 機番
+        'bit_number': table[columns[10]].astype(int).values,                          # 異常№
+        'error_type': table[columns[9]].values,                                       # 異常種類
+        'number_status': table[columns[12]].values,                                   # ON/OFF
+        'duration': (table[columns[13]].astype(float)                                 # 起動時異常
+                     + table[columns[14]].astype(float)).values,                      # 運転中異常
+    })
@@ -0,0 +1,148 @@
+import heapq
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from error_events import ON_STATUS
+from error_episodes import ErrorEpisodeStore
+
+
+class SpaceSaving:
+    """
+    Space-Saving top-k summary with a fixed number of counters.
+
+    When full, a new item replaces the item with the smallest count and
+    inherits that count as its error, so counts are over-estimates by at
+    most `error`. Any item with true frequency > total / capacity is kept.
+
+    The smallest counter is found with a lazy min-heap of (count, item):
+    an increment pushes a fresh entry and outdated ones are skipped when
+    popped, so eviction costs O(log capacity) instead of a scan.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        # {item: [count, error]}
+        self.counters: Dict[int, list] = {}
+        # (count, item), possibly outdated; rebuilt when it outgrows the counters
+        self._heap: List[Tuple[int, int]] = []
+
+    def add(self, item: int, count: int = 1):
+        if item in self.counters:
+            self.counters[item][0] += count
+        elif len(self.counters) < self.capacity:
+            self.counters[item] = [count, 0]
+        else:
+            floor = self._pop_min()
+            self.counters[item] = [floor + count, floor]
+        heapq.heappush(self._heap, (self.counters[item][0], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(counter[0], key) for key, counter in self.counters.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> int:
+        """Remove the item with the smallest count; returns its count."""
+        while True:
+            count, victim = heapq.heappop(self._heap)
+            counter = self.counters.get(victim)
+            if counter is not None and counter[0] == count:
+                del self.counters[victim]
+                return count
+
+
+class ErrorHeavyHitters:
+    """
+    Streaming top-K error numbers (異常№) per machine over rolling windows.
+
+    Error starts are counted into one SpaceSaving summary per machine and
+    time pane (1 day by default). A query merges the summaries of the panes
+    inside the window, so its cost depends on panes x capacity, not on the
+    length of the history. Panes older than max_panes are dropped.
+    """
+
+    def __init__(self, capacity: int = 64, pane: str = '1D', max_panes: int = 31):
+        self.capacity = capacity
+        self.pane_ns = pd.Timedelta(pane).value
+        self.max_panes = max_panes
+        # {machine: {pane_start_ns: SpaceSaving}}
+        self.panes: Dict[str, Dict[int, SpaceSaving]] = {}
+
+    def add(self, timestamp: datetime, machine_name: str, bit_number: int, count: int = 1):
+        """Count one error start."""
+        t = pd.Timestamp(timestamp).value
+        pane_start = t - t % self.pane_ns
+        machine_panes = self.panes.setdefault(machine_name, {})
+        if pane_start not in machine_panes:
+            machine_panes[pane_start] = SpaceSaving(self.capacity)
+            oldest = pane_start - (self.max_panes - 1) * self.pane_ns
+            for expired in [p for p in machine_panes if p < oldest]:
+                del machine_panes[expired]
+        machine_panes[pane_start].add(int(bit_number), count)
+
+    def add_events(self, events: pd.DataFrame):
+        """Count the error starts of an event stream (EVENT_COLUMNS)."""
+        starts = events[events['number_status'] == ON_STATUS]
+        for event in starts.itertuples(index=False):
+            self.add(event.Timestamp, event.Machine_Name, event.bit_number)
+
+    def _window(self, window: str, now: Optional[datetime]) -> Tuple[int, int]:
+        end = pd.Timestamp(now).value if now is not None else pd.Timestamp.now().value
+        return end - pd.Timedelta(window).value, end
+
+    def top(self, machine_name: str, n: int = 20, window: str = '7D',
+            now: Optional[datetime] = None) -> List[Tuple[int, int, int]]:
+        """
+        Estimated top-n error numbers of a machine over the last `window`.
+
+        Panes overlapping the window are merged whole, so the window is
+        rounded out to pane boundaries.
+
+        Returns:
+            List of (bit_number, estimated_count, max_overcount), highest first
+        """
+        t0, t1 = self._window(window, now)
+        merged: Dict[int, list] = {}
+        for pane_start, summary in self.panes.get(machine_name, {}).items():
+            if pane_start + self.pane_ns <= t0 or pane_start > t1:
+                continue
+            for item, (count, error) in summary.counters.items():
+                total = merged.setdefault(item, [0, 0])
+                total[0] += count
+                total[1] += error
+
+        ranked = sorted(merged.items(), key=lambda kv: (-kv[1][0], kv[0]))[:n]
+        return [(item, count, error) for item, (count, error) in ranked]
+
+    def top_exact(self, store: ErrorEpisodeStore, machine_name: str, n: int = 20,
+                  window: str = '7D', now: Optional[datetime] = None,
+                  candidates: int = None) -> List[Tuple[int, int]]:
+        """
+        Top-n with exact counts: take the best `candidates` (default 2n)
+        estimates and recount their starts in the episode store.
+
+        Returns:
+            List of (bit_number, exact_count), highest first
+        """
+        bit_numbers = [item for item, _, _ in
+                       self.top(machine_name, candidates or 2 * n, window, now)]
+        t0, t1 = self._window(window, now)
+        counts = exact_start_counts(store, machine_name, t0, t1, bit_numbers)
+        ranked = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+        return ranked
+
+
+def exact_start_counts(store: ErrorEpisodeStore, machine_name: str, start: datetime,
+                       end: datetime, bit_numbers: Iterable[int]) -> Dict[int, int]:
+    """Exact number of episodes of each bit that started in [start, end) on a machine."""
+    bit_numbers = list(bit_numbers)
+    counts = dict.fromkeys(bit_numbers, 0)
+    index = store.indexes.get(machine_name)
+    if index is None or not bit_numbers:
+        return counts
+
+    lo = np.searchsorted(index.start, pd.Timestamp(start).value, side='left')
+    hi = np.searchsorted(index.start, pd.Timestamp(end).value, side='left')
+    bits = store.episodes['bit_number'].values[index.rows[lo:hi]]
+    found, found_counts = np.unique(bits[np.isin(bits, bit_numbers)], return_counts=True)
+    counts.update(zip(found.tolist(), found_counts.tolist()))
+    return counts
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+from error_episodes import ErrorEpisodeStore
+
+# Shift start hours: (昼夜勤 label, hour the shift starts)
+DEFAULT_SHIFTS = (("昼勤", 8), ("夜勤", 20))
+
+BUCKETS = (None, 'hour', 'day', 'shift')
+
+
+def _bucket_edges(t_min: int, t_max: int, bucket: Optional[str],
+                  shifts: Sequence[Tuple[str, int]]) -> Tuple[np.ndarray, List[Optional[str]]]:
+    """Bucket boundaries (ns) covering [t_min, t_max] and the shift label of each bucket."""
+    first, last = pd.Timestamp(t_min), pd.Timestamp(t_max)
+    if bucket is None:
+        return np.array([t_min, max(t_max, t_min + 1)], dtype=np.int64), [None]
+
+    if bucket in ('hour', 'day'):
+        freq = 'h' if bucket == 'hour' else 'D'
+        edges = pd.date_range(first.floor(freq), last.floor(freq) + pd.Timedelta(1, unit=freq), freq=freq)
+        return edges.values.astype(np.int64), [None] * (len(edges) - 1)
+
+    # Shift edges: every shift start hour of every day, one day of margin on each side
+    days = pd.date_range(first.floor('D') - pd.Timedelta(days=1), last.floor('D') + pd.Timedelta(days=1), freq='D')
+    starts = sorted((day + pd.Timedelta(hours=hour), label) for day in days for label, hour in shifts)
+    edges = np.array([edge.value for edge, _ in starts], dtype=np.int64)
+    labels = [label for _, label in starts]
+    lo = np.searchsorted(edges, t_min, side='right') - 1
+    hi = np.searchsorted(edges, t_max, side='right')
+    return edges[lo:hi + 1], labels[lo:hi]
+
+
+def split_episodes(store: ErrorEpisodeStore, bucket: Optional[str] = 'hour',
+                   window: Optional[Tuple[datetime, datetime]] = None,
+                   shifts: Sequence[Tuple[str, int]] = DEFAULT_SHIFTS) -> Tuple[pd.DataFrame, np.ndarray, List]:
+    """
+    Split episodes at bucket boundaries.
+
+    Each episode becomes one piece per bucket it touches; pieces carry the
+    clipped duration and interval (piece_start/piece_end, ns) and an
+    `is_start` flag for the bucket where the episode started. Episodes
+    still active are measured up to store.as_of.
+
+    Returns:
+        (pieces DataFrame, bucket edges in ns, shift label per bucket)
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket '{bucket}'. Supported: {BUCKETS}")
+
+    start = store.start_ns
+    end = np.minimum(store.end_ns, store.as_of.value)
+    if window is not None:
+        t_min, t_max = pd.Timestamp(window[0]).value, pd.Timestamp(window[1]).value
+        keep = (start < t_max) & (end >= t_min)
+    else:
+        t_min = start.min() if len(start) else store.as_of.value
+        t_max = store.as_of.value
+        keep = np.ones(len(start), dtype=bool)
+
+    rows = np.flatnonzero(keep)
+    start, end = start[rows], end[rows]
+    edges, labels = _bucket_edges(t_min, t_max, bucket, shifts)
+
+    # Bucket of the first and last instant of each episode ([start, end) intervals)
+    first = np.clip(np.searchsorted(edges, start, side='right') - 1, 0, len(edges) - 2)
+    last = np.clip(np.searchsorted(edges, end, side='left') - 1, first, len(edges) - 2)
+    counts = last - first + 1
+
+    piece_rows = np.repeat(np.arange(len(rows)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    buckets = first[piece_rows] + offsets
+
+    lower = np.maximum(edges[buckets], t_min)
+    upper = np.minimum(edges[buckets + 1], t_max)
+    piece_start = np.clip(start[piece_rows], lower, upper)
+    piece_end = np.clip(end[piece_rows], lower, upper)
+
+    episodes = store.episodes.iloc[rows[piece_rows]]
+    pieces = pd.DataFrame({
+        'Machine_Name': episodes['Machine_Name'].values,
+        'error_type': episodes['error_type'].values,
+        'bit_number': episodes['bit_number'].values,
+        'bucket_id': buckets,
+        'downtime': (piece_end - piece_start) / 1e9,
+        'piece_start': piece_start,
+        'piece_end': piece_end,
+        'is_start': (offsets == 0) & (start[piece_rows] >= t_min),
+        'repair_time': (end - start)[piece_rows] / 1e9,
+        'period': (upper - lower) / 1e9,
+    })
+    return pieces, edges, labels
+
+
+def compute_error_metrics(store: ErrorEpisodeStore, by: Sequence[str] = ('Machine_Name',),
+                          bucket: Optional[str] = None,
+                          window: Optional[Tuple[datetime, datetime]] = None,
+                          shifts: Sequence[Tuple[str, int]] = DEFAULT_SHIFTS) -> pd.DataFrame:
+    """
+    Downtime, error count, MTTR and MTBF per group and time bucket.
+
+    Args:
+        store: Error episodes
+        by: Grouping keys among 'Machine_Name', 'error_type', 'bit_number'
+        bucket: None (whole window), 'hour', 'day' or 'shift'
+        window: Optional (start, end) observation window; defaults to the
+                first episode start up to store.as_of
+        shifts: (label, start hour) pairs used when bucket='shift'
+
+    Returns:
+        DataFrame with the `by` columns, bucket_start (and shift), and
+        error_count, downtime, max_duration, mttr, mtbf (all in seconds).
+        Downtime is the time at least one error of the group was active
+        (overlapping episodes of several bits count once), split at bucket
+        boundaries; an episode is counted (and its full repair time used for
+        MTTR) in the bucket where it started.
+        MTBF = (bucket period - downtime) / error_count, at least 0.
+    """
+    by = list(by)
+    unknown = set(by) - {'Machine_Name', 'error_type', 'bit_number'}
+    if unknown:
+        raise ValueError(f"Unknown grouping key(s): {sorted(unknown)}")
+
+    pieces, edges, labels = split_episodes(store, bucket=bucket, window=window, shifts=shifts)
+    pieces['repair_time'] = pieces['repair_time'].where(pieces['is_start'], 0.0)
+
+    keys = by + ['bucket_id']
+    if 'bit_number' not in by:
+        # Union of the episodes of each group: only the part of a piece not
+        # already covered by an earlier piece of the group counts
+        pieces = pieces.sort_values(keys + ['piece_start'], kind='stable')
+        covered_until = pieces.groupby(keys, sort=False)['piece_end'].cummax() \
+            .groupby([pieces[key] for key in keys], sort=False).shift(fill_value=0)
+        uncovered_start = np.maximum(pieces['piece_start'], covered_until)
+        pieces['downtime'] = (pieces['piece_end'] - uncovered_start).clip(lower=0) / 1e9
+
+    metrics = pieces.groupby(keys, sort=True).agg(
+        error_count=('is_start', 'sum'),
+        downtime=('downtime', 'sum'),
+        max_duration=('repair_time', 'max'),
+        repair_time=('repair_time', 'sum'),
+        period=('period', 'first'),
+    ).reset_index()
+
+    error_count = metrics['error_count'].replace(0, np.nan)
+    metrics['mttr'] = metrics['repair_time'] / error_count
+    metrics['mtbf'] = ((metrics['period'] - metrics['downtime']) / error_count).clip(lower=0)
+
+    bucket_ids = metrics.pop('bucket_id').values
+    if bucket is not None:
+        metrics.insert(len(by), 'bucket_start', pd.to_datetime(edges[bucket_ids]))
+    if bucket == 'shift':
+        metrics.insert(len(by) + 1, 'shift', [labels[i] for i in bucket_ids])
+    return metrics.drop(columns=['repair_time', 'period'])
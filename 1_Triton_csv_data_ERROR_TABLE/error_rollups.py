@@ -0,0 +1,148 @@
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple
+from error_events import ON_STATUS, OFF_STATUS
+from error_metrics import DEFAULT_SHIFTS
+
+HOUR_NS = 3600 * 10**9
+
+ROLLUP_COLUMNS = ['Machine_Name', 'hour', 'error_type', 'error_count', 'total_duration', 'max_duration']
+
+
+class ErrorRollupTable:
+    """
+    Materialized machine x hour x error type rollup of error events.
+
+    Fed incrementally with the events emitted by CreateErrorTableCode:
+    a start adds to error_count of its hour; an end spreads the episode
+    duration over every hour it covered (correcting earlier hours when a
+    long episode closes later) and updates max_duration of the start hour.
+    Episodes still open are kept so they can be closed by a later batch.
+    """
+
+    def __init__(self):
+        # {(machine, hour_ns, error_type): [error_count, total_duration, max_duration]}
+        self.rows: Dict[Tuple[str, int, str], list] = {}
+        # {(machine, bit_number): (start_ns, error_type)}
+        self.open_episodes: Dict[Tuple[str, int], Tuple[int, str]] = {}
+
+    def _row(self, machine: str, hour: int, error_type: str) -> list:
+        key = (machine, hour, error_type)
+        if key not in self.rows:
+            self.rows[key] = [0, 0.0, 0.0]
+        return self.rows[key]
+
+    def _spread(self, rows: Dict, machine: str, error_type: str, start: int, end: int):
+        """Add the [start, end) duration to each hour it covers."""
+        hour = start - start % HOUR_NS
+        while hour < end:
+            piece = min(end, hour + HOUR_NS) - max(start, hour)
+            key = (machine, hour, error_type)
+            if key not in rows:
+                rows[key] = [0, 0.0, 0.0]
+            rows[key][1] += piece / 1e9
+            hour += HOUR_NS
+
+    def add_event(self, timestamp: datetime, machine_name: str, bit_number: int,
+                  error_type: str, number_status: str):
+        """Apply one error start/end event."""
+        t = pd.Timestamp(timestamp).value
+        key = (machine_name, int(bit_number))
+
+        if number_status == ON_STATUS:
+            self.open_episodes[key] = (t, error_type)
+            self._row(machine_name, t - t % HOUR_NS, error_type)[0] += 1
+
+        elif number_status == OFF_STATUS and key in self.open_episodes:
+            start, error_type = self.open_episodes.pop(key)
+            self._spread(self.rows, machine_name, error_type, start, t)
+            start_row = self._row(machine_name, start - start % HOUR_NS, error_type)
+            start_row[2] = max(start_row[2], (t - start) / 1e9)
+
+    def add_events(self, events: pd.DataFrame):
+        """Apply an event stream (EVENT_COLUMNS) in order."""
+        for event in events.itertuples(index=False):
+            self.add_event(event.Timestamp, event.Machine_Name, event.bit_number,
+                           event.error_type, event.number_status)
+
+    def to_dataframe(self, as_of: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Rollup rows sorted by machine, hour and error type.
+
+        If as_of is given, episodes still open contribute their duration up
+        to as_of (without changing the stored table).
+        """
+        rows = self.rows
+        if as_of is not None:
+            t = pd.Timestamp(as_of).value
+            rows = {key: list(values) for key, values in self.rows.items()}
+            for (machine, _), (start, error_type) in self.open_episodes.items():
+                self._spread(rows, machine, error_type, start, t)
+                start_key = (machine, start - start % HOUR_NS, error_type)
+                rows[start_key][2] = max(rows[start_key][2], max(t - start, 0) / 1e9)
+
+        table = pd.DataFrame(
+            [(machine, hour, error_type, *values) for (machine, hour, error_type), values in rows.items()],
+            columns=ROLLUP_COLUMNS)
+        table['hour'] = pd.to_datetime(table['hour'])
+        table['error_count'] = table['error_count'].astype('int64')
+        return table.sort_values(['Machine_Name', 'hour', 'error_type']).reset_index(drop=True)
+
+    def query(self, start: datetime, end: datetime, machine: Optional[str] = None,
+              error_type: Optional[str] = None, as_of: Optional[datetime] = None) -> pd.DataFrame:
+        """Totals per machine and error type over the hours in [start, end)."""
+        table = self.to_dataframe(as_of)
+        mask = (table['hour'] >= pd.Timestamp(start)) & (table['hour'] < pd.Timestamp(end))
+        if machine is not None:
+            mask &= table['Machine_Name'] == machine
+        if error_type is not None:
+            mask &= table['error_type'] == error_type
+        return table[mask].groupby(['Machine_Name', 'error_type'], as_index=False).agg(
+            error_count=('error_count', 'sum'),
+            total_duration=('total_duration', 'sum'),
+            max_duration=('max_duration', 'max'),
+        )
+
+    def shift_rollup(self, shifts: Sequence[Tuple[str, int]] = DEFAULT_SHIFTS,
+                     as_of: Optional[datetime] = None) -> pd.DataFrame:
+        """Re-aggregate the hourly rows into shifts (shift start hours must be whole hours)."""
+        table = self.to_dataframe(as_of)
+        hours = sorted(hour for _, hour in shifts)
+        labels = dict((hour, label) for label, hour in shifts)
+
+        # Start hour of the shift each hour belongs to (night shift wraps past midnight)
+        hour_of_day = table['hour'].dt.hour
+        shift_hour = pd.Series(hours[-1], index=table.index)
+        for hour in hours:
+            shift_hour[hour_of_day >= hour] = hour
+        shift_day = table['hour'].dt.floor('D') - pd.to_timedelta((hour_of_day < hours[0]).astype(int), unit='D')
+
+        table['shift_start'] = shift_day + pd.to_timedelta(shift_hour, unit='h')
+        table['shift'] = shift_hour.map(labels)
+        return table.groupby(['Machine_Name', 'shift_start', 'shift', 'error_type'], as_index=False).agg(
+            error_count=('error_count', 'sum'),
+            total_duration=('total_duration', 'sum'),
+            max_duration=('max_duration', 'max'),
+        )
+
+    def save(self, path_prefix: str):
+        """Write the rollup rows and open episodes to <prefix>_rollup.csv / <prefix>_open.csv."""
+        self.to_dataframe().to_csv(f"{path_prefix}_rollup.csv", index=False, encoding='utf-8-sig')
+        pd.DataFrame(
+            [(machine, bit, pd.Timestamp(start), error_type)
+             for (machine, bit), (start, error_type) in self.open_episodes.items()],
+            columns=['Machine_Name', 'bit_number', 'start', 'error_type'],
+        ).to_csv(f"{path_prefix}_open.csv", index=False, encoding='utf-8-sig')
+
+    @classmethod
+    def load(cls, path_prefix: str) -> 'ErrorRollupTable':
+        """Restore a table written by save()."""
+        table = cls()
+        rollup = pd.read_csv(f"{path_prefix}_rollup.csv", encoding='utf-8-sig', parse_dates=['hour'])
+        for row in rollup.itertuples(index=False):
+            table.rows[(row.Machine_Name, row.hour.value, row.error_type)] = [
+                int(row.error_count), float(row.total_duration), float(row.max_duration)]
+        open_episodes = pd.read_csv(f"{path_prefix}_open.csv", encoding='utf-8-sig', parse_dates=['start'])
+        for row in open_episodes.itertuples(index=False):
+            table.open_episodes[(row.Machine_Name, int(row.bit_number))] = (row.start.value, row.error_type)
+        return table
@@ -1,45 +1,90 @@
-from Tables_config_codes import ERROR_TABLE, ERROR_PATTERN_TYPES, get_bit_number
+from Tables_config_codes import ERROR_TABLE, ERROR_PATTERN_TYPES, EventLog, RunMetrics, read_csv_table, setup_logging
+import logging
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
+from scan_compression import compress_identical_scans, get_error_register_columns
+from active_error_state import ActiveErrorState, ErrorBitLayout
+from error_events import EVENT_COLUMNS, ON_STATUS, OFF_STATUS
+from error_debounce import EventDebouncer
+from error_episodes import ErrorEpisodeStore
 # some of the predefined data 
-
+logger = logging.getLogger(__name__)
+BIT_POSITIONS = np.arange(16, dtype=np.uint16)
 
 
 
 class CreateErrorTableCode:
     def __init__(self, machine_name_code=None, day_night="昼勤", 
-                 unit_code="10-1719", data_path=None):
+                 unit_code="10-1719", data_path=None, compress_runs=False,
+                 debounce_config=None, rollup_table=None, heavy_hitters=None,
+                 log_mode="sampled", log_sample_every=1000, profile_memory=False,
+                 csv_engine="auto"):
         self.day_night = day_night
         self.unit_code = unit_code
         self.machine_name_code = machine_name_code
         self.working_mode = {"502.12": "自動", "502.13": "手動", "502.14": "払出"}
         self.data = None
+        # Collapse runs of identical scans before bit processing
+        self.compress_runs = compress_runs
+        self.scan_runs = None
+        # Glitch filter per error type: {error_type: {'min_on_time': s, 'min_off_time': s}}
+        self.debounce_config = debounce_config
+        # Keeps unfinished episodes between flushes
+        self.debouncer = EventDebouncer(debounce_config) if debounce_config else None
+        # Optional ErrorRollupTable updated with every flushed event
+        self.rollup_table = rollup_table
+        # Optional ErrorHeavyHitters counting every flushed error start
+        self.heavy_hitters = heavy_hitters
+        # Stage timers and counters of the run (see export_metrics);
+        # profile_memory adds per-stage peak/retained memory and allocation sites
+        self.metrics = RunMetrics("error_table", profile_memory=profile_memory)
+        # Hot-path logging: "full", "sampled" or "summary" (see LOG_MODES)
+        self.run_log = EventLog(logger, mode=log_mode, sample_every=log_sample_every,
+                                counters=self.metrics.counters)
 
         # Initilaize ERROR_TABLE
         self.ERROR_TABLE = ERROR_TABLE
         self.error_columns_details = self.ERROR_TABLE.get("columns", {})
         self.error_column_names = list(self.error_columns_details.keys())
-        # Active error tracking: {machine_name: {bit_number: {start_time, error_type}}}
+        # Active error tracking: {machine_name: ActiveErrorState}
         self.active_errors = {}
+        # Last seen words: {machine_name: uint16 array aligned with ErrorBitLayout.registers}
+        self.previous_words = {}
+        # Register/bit -> bit number lookups: {pattern: ErrorBitLayout}
+        self.bit_layouts = {}
         
+        # Error start/end events waiting for flush_error_events()
+        self.error_events = []
+        # Flushed (debounced) events, one DataFrame per flush
+        self.event_log = []
+
         # Output rows: List of dictionaries for CSV
         self.output_rows = []
+        # Register words of live scans without a data file, looked up by
+        # add_output_row(): {(machine_name, Timestamp): {register column: word}}
+        self.scan_context = {}
         
         if data_path is not None:
-            self.data = pd.read_csv(data_path, encoding="utf-8", dtype=str)
-            print()
+            # Register words stay text; timestamps are converted while
+            # reading ("auto" uses pyarrow on all cores). Machine_Name stays
+            # plain text: the per-machine groupbys (scan compression) must
+            # not see unobserved categories
+            with self.metrics.stage("load"):
+                self.data = read_csv_table(data_path, dtype=str, timestamp_columns=['Timestamp'],
+                                           engine=csv_engine)
+            self.metrics.count("rows_read", len(self.data))
+            logger.info("Data loaded: %d rows from %s", len(self.data), data_path)
     
     
-    def extract_bit_value(self, register_value, bit_position: int) -> int:
-        """Extract specific bit value from register value 
-        (16-bit integer or 4-digit hex string).
+    def parse_register_value(self, register_value) -> int:
+        """Convert a register value to its 16-bit integer word.
 
         Args:
             register_value: int or str (hex) [my case is str from csv]
-            bit_position: int (0-15)
-        Returns: 
-            int: 0 or 1        
+        Returns:
+            int: 0 - 0xFFFF (0 for empty cells)
         """
         if pd.isna(register_value) or register_value in ('nan', ''):
             return 0
@@ -55,10 +100,23 @@ class CreateErrorTableCode:
             # Pad with leading zeros to make 4 digits
             cleaned = cleaned.zfill(4)
             # Convert to integer
-            register_value = int(cleaned, 16)
+            return int(cleaned, 16)
+
+        return int(register_value)
 
+
+    def extract_bit_value(self, register_value, bit_position: int) -> int:
+        """Extract specific bit value from register value 
+        (16-bit integer or 4-digit hex string).
+
+        Args:
+            register_value: int or str (hex) [my case is str from csv]
+            bit_position: int (0-15)
+        Returns: 
+            int: 0 or 1        
+        """
         # Extract the bit (works for integers)
-        return (int(register_value) >> bit_position) & 1
+        return (self.parse_register_value(register_value) >> bit_position) & 1
 
     
     def add_output_row(self, timestamp: datetime, machine_code: int, machine_name: str,
@@ -67,7 +125,21 @@ class CreateErrorTableCode:
         Add a row to output.
         duration: 0 for start, calculated seconds for end, None for other error type
         """
+        with self.metrics.stage("enrichment"):
+            self._add_output_row(timestamp, machine_code, machine_name, bit_number,
+                                 error_type, number_status, duration)
+
+
+    def add_scan_context(self, machine_name: str, timestamp: datetime, registers: Dict[str, str]):
+        """Register words of a live scan, for the output rows of its events when no data file is loaded."""
+        self.scan_context[(machine_name, pd.Timestamp(timestamp))] = registers
+
+
+    def _add_output_row(self, timestamp: datetime, machine_code: int, machine_name: str,
+                        bit_number: int, error_type: str, number_status: str, duration: Optional[int]):
         row = {}
+        # Live scans carry their own register words; batch runs look them up in self.data
+        context = self.scan_context.get((machine_name, pd.Timestamp(timestamp)), {}) if self.data is None else None
         columns = list(self.error_columns_details.keys())
         # in the timestamp repace - with /
         timestamp = timestamp.strftime("%Y/%m/%d %H:%M:%S")
@@ -81,7 +153,7 @@ class CreateErrorTableCode:
             date = dt_object.date().strftime("%Y/%m/%d")
             row[columns[1]] = date
         except Exception as e :
-            print("Error parsing timestamp:", timestamp, e)
+            logger.warning("Error parsing timestamp %s: %s", timestamp, e)
         
 
         # column 2 - 昼夜勤
@@ -104,12 +176,15 @@ class CreateErrorTableCode:
 
         # column 8 - 運転モード -- has to be developed
         
-        filer_value = self.data.loc[
-                    (self.data['Timestamp'] == timestamp) &
-                    (self.data['Machine_Name'] == machine_name)
-                    ]["IO_0502"]
-        if not filer_value.empty:
-            mode_value = filer_value.values[0]
+        if context is not None:
+            mode_value = context.get("IO_0502")
+        else:
+            filer_value = self.data.loc[
+                        (self.data['Timestamp'] == timestamp) &
+                        (self.data['Machine_Name'] == machine_name)
+                        ]["IO_0502"]
+            if not filer_value.empty:
+                mode_value = filer_value.values[0]
         # print("mode_value:", mode_value)
         if mode_value == "9000":
             row[columns[8]] = "自動"
@@ -159,9 +234,15 @@ class CreateErrorTableCode:
                 # Convert "DM31651" to "D_31651" format
                 register_col = plc_address.replace("M", "_")  # DM31651 -> D_31651
 
-                # Debug print
-                # print(f"Looking for: timestamp={timestamp}, machine={machine_name}, reg={register_col}")
+                # Debug print (sampled)
+                self.run_log.event(
+                    "register_lookups", "Looking for: timestamp=%s, machine=%s, reg=%s",
+                    timestamp, machine_name, register_col)
         
+                if context is not None:
+                    row[col] = context.get(register_col, 0)
+                    continue
+
                 # Filter data to get the value
                 filtered = self.data.loc[
                     (self.data['Timestamp'] == timestamp) &
@@ -181,70 +262,139 @@ class CreateErrorTableCode:
         self.output_rows.append(row)
     
     
-    def process_register_bits(self, machine_name: str, register: int, 
-                              register_value: int, timestamp: datetime):
-        """Process all 16 bits of a register for error tracking."""
-        machine_code = self.machine_name_code[machine_name]['code']
+    def get_bit_layout(self, machine_name: str) -> ErrorBitLayout:
+        """Get the (cached) register/bit -> bit number layout for a machine's pattern."""
         pattern = self.machine_name_code[machine_name]['error_pattern']
-        
+        if pattern not in self.bit_layouts:
+            self.bit_layouts[pattern] = ErrorBitLayout(pattern)
+        return self.bit_layouts[pattern]
+    
+    
+    def get_machine_state(self, machine_name: str) -> ActiveErrorState:
+        """Get the active error state of a machine, creating it on first use."""
         if machine_name not in self.active_errors:
-            self.active_errors[machine_name] = {}
-        
-        for bit_position in range(16):
-            bit_value = self.extract_bit_value(register_value, bit_position)
-            
-            try:
+            layout = self.get_bit_layout(machine_name)
+            self.active_errors[machine_name] = ActiveErrorState(layout.n_bits)
+            self.previous_words[machine_name] = np.zeros(len(layout.registers), dtype=np.uint16)
+        return self.active_errors[machine_name]
+    
+    
+    def process_register_word(self, machine_name: str, register: int,
+                              register_value, timestamp: datetime):
+        """Process a single register word (see process_words)."""
+        layout = self.get_bit_layout(machine_name)
+        if register not in layout.register_index:
+            return  # Skip if register not in monitoring range
+
+        word = self.parse_register_value(register_value)
+        self.process_words(machine_name, np.array([layout.register_index[register]]),
+                           np.array([word], dtype=np.uint16), timestamp)
+    
+    
+    def process_words(self, machine_name: str, word_indices: np.ndarray,
+                      words: np.ndarray, timestamp: datetime):
+        """
+        Process register words of one scan for error tracking.
 
-                bit_number, error_type, _ = get_bit_number(register, bit_position, pattern)
-                # print(f"from process register_bits: register: {register}, bit_position: {bit_position}, pattern: {pattern}, bit_number: {bit_number}, error_type: {error_type}")
-            except ValueError:
-                continue  # Skip if register not in monitoring range
-            
-            # Check if this bit is currently active
-            is_active = bit_number in self.active_errors[machine_name]
-            
-            if bit_value == 1 and not is_active:
-                # print(f"All details - bit number: {bit_number} error_type:{error_type} register value: {register_value}, bit_position: {bit_position}, bit_value: {bit_value}")
-                # ===== BIT BECAME 1 (ERROR STARTED) =====
-                # Record start time
-                self.active_errors[machine_name][bit_number] = {
-                    'start_time': timestamp,
-                    'error_type': error_type
-                }
-                
-                # Add row with duration = 0
-                self.add_output_row(
-                    timestamp=timestamp,
-                    machine_code=machine_code,
-                    machine_name=machine_name,
-                    bit_number=bit_number,
-                    error_type=error_type,
-                    number_status= "on",
-                    duration=0
-                )
-                
-            elif bit_value == 0 and is_active:
-                # ===== BIT BECAME 0 (ERROR ENDED) =====
-                start_info = self.active_errors[machine_name][bit_number]
-                start_time = start_info['start_time']
-                error_type = start_info['error_type']
-                
-                # Calculate duration in seconds
-                duration_sec = int((timestamp - start_time).total_seconds())
-                
-                # Add row with calculated duration
-                self.add_output_row(
-                    timestamp=timestamp,
-                    machine_code=machine_code,
-                    machine_name=machine_name,
-                    bit_number=bit_number,
-                    error_type=error_type,
-                    number_status= "異常処置終了",
-                    duration=duration_sec
-                )
-                
-                # Remove from active errors
-                del self.active_errors[machine_name][bit_number]
+        Words are compared with the last value seen for (machine, register);
+        only words that changed are decoded, and the decoded bits are checked
+        against the machine's active mask in one vector operation.
+
+        Args:
+            machine_name: Machine the scan belongs to
+            word_indices: Rows of the machine's ErrorBitLayout.registers
+            words: uint16 register values aligned with word_indices
+            timestamp: Scan timestamp
+        """
+        layout = self.get_bit_layout(machine_name)
+        state = self.get_machine_state(machine_name)
+        previous = self.previous_words[machine_name]
+
+        self.metrics.count("registers_scanned", len(words))
+        changed = words != previous[word_indices]
+        if not changed.any():
+            return
+        word_indices = word_indices[changed]
+        words = words[changed]
+        previous[word_indices] = words
+        self.metrics.count("bits_evaluated", 16 * len(words))
+
+        bit_numbers = layout.bit_numbers[word_indices].ravel()
+        bit_values = ((words[:, None] >> BIT_POSITIONS) & 1).astype(bool).ravel()
+        newly_set, newly_cleared = state.changes(bit_numbers, bit_values)
+
+        # ===== BITS BECAME 1 (ERROR STARTED) =====
+        timestamp_ns = pd.Timestamp(timestamp).value
+        started = bit_numbers[newly_set]
+        state.start(started, timestamp_ns, layout.error_codes[started])
+
+        # ===== BITS BECAME 0 (ERROR ENDED) =====
+        ended = bit_numbers[newly_cleared]
+        start_times, error_codes = state.end(ended)
+        # Calculate duration in seconds
+        durations = (timestamp_ns - start_times) // 10**9
+        ended_info = dict(zip(ended.tolist(), zip(error_codes.tolist(), durations.tolist())))
+
+        # Queue events in bit number order
+        for i in np.flatnonzero(newly_set | newly_cleared):
+            bit_number = int(bit_numbers[i])
+            if newly_set[i]:
+                error_type = layout.error_types[int(layout.error_codes[bit_number])]
+                self.run_log.event("error_starts", "Error start: machine=%s, bit=%d, type=%s, time=%s",
+                                   machine_name, bit_number, error_type, timestamp)
+                self.error_events.append(
+                    (timestamp, machine_name, bit_number, error_type, ON_STATUS, 0))
+            else:
+                error_code, duration_sec = ended_info[bit_number]
+                self.run_log.event("error_ends", "Error end: machine=%s, bit=%d, duration=%ss, time=%s",
+                                   machine_name, bit_number, duration_sec, timestamp)
+                self.error_events.append(
+                    (timestamp, machine_name, bit_number, layout.error_types[error_code],
+                     OFF_STATUS, duration_sec))
+    
+    
+    def flush_error_events(self, final: bool = True, as_of: Optional[datetime] = None):
+        """
+        Debounce the queued error events (if configured) and add them as output rows.
+
+        The debouncer keeps its state between flushes, so an end whose start
+        was flushed earlier is still emitted. For incremental use flush with
+        final=False: episodes that debouncing may still change (open and
+        shorter than min_on_time, or closed less than min_off_time ago) are
+        then held back until a later flush; pass as_of (the time the scans
+        have been processed up to) to release them when no new events come.
+        process_data flushes once, final.
+        """
+        events = pd.DataFrame(self.error_events, columns=EVENT_COLUMNS)
+        self.error_events = []
+        if self.debouncer is not None:
+            queued = len(events) + len(self.debouncer.held)
+            events = self.debouncer.push(events, final=final, as_of=as_of)
+            self.run_log.count("events_debounced", queued - len(events) - len(self.debouncer.held))
+        self.run_log.count("events_emitted", len(events))
+        self.event_log.append(events)
+        if self.rollup_table is not None:
+            self.rollup_table.add_events(events)
+        if self.heavy_hitters is not None:
+            self.heavy_hitters.add_events(events)
+
+        for event in events.itertuples(index=False):
+            self.add_output_row(
+                timestamp=event.Timestamp,
+                machine_code=self.machine_name_code[event.Machine_Name]['code'],
+                machine_name=event.Machine_Name,
+                bit_number=int(event.bit_number),
+                error_type=event.error_type,
+                number_status=event.number_status,
+                # duration = 0 for start, seconds for end
+                duration=int(event.duration)
+            )
+        if self.scan_context:
+            # Only scans of events held back by the debouncer are still needed
+            held = self.debouncer.held if self.debouncer is not None else events.iloc[:0]
+            keep = {(machine, pd.Timestamp(timestamp))
+                    for machine, timestamp in zip(held['Machine_Name'], held['Timestamp'])}
+            self.scan_context = {key: words for key, words in self.scan_context.items() if key in keep}
     
     
     def get_register_range_for_machine(self, machine_name: str) -> List[Tuple[int, int]]:
@@ -264,35 +414,59 @@ class CreateErrorTableCode:
         if self.data is None:
             raise ValueError("No data loaded. Please provide data_path.")
         
-        # Reset tracking
-        self.active_errors = {}
-        self.output_rows = []
+        try:
+            # Reset tracking
+            self.active_errors = {}
+            self.previous_words = {}
+            self.error_events = []
+            self.event_log = []
+            self.output_rows = []
+            if self.debounce_config:
+                self.debouncer = EventDebouncer(self.debounce_config)
         
-        # Convert Timestamp column to datetime
-        self.data['Timestamp'] = pd.to_datetime(self.data['Timestamp'])
+            # Convert Timestamp column to datetime
+            with self.metrics.stage("parse"):
+                self.data['Timestamp'] = pd.to_datetime(self.data['Timestamp'])
+
+            # Bits can only change on the first scan of a run of identical
+            # register vectors, so only run heads need to go through the
+            # edge detector; durations are still taken between run heads
+            scans = self.data
+            if self.compress_runs:
+                register_columns = []
+                for pattern in {info['error_pattern'] for info in self.machine_name_code.values()}:
+                    register_columns += get_error_register_columns(ERROR_PATTERN_TYPES[pattern])
+                with self.metrics.stage("compress_runs"):
+                    self.scan_runs = compress_identical_scans(self.data, list(dict.fromkeys(register_columns)))
+                scans = self.scan_runs
+                logger.info("Collapsed %d scans into %d runs", len(self.data), len(scans))
         
-        # Process each row (each cycle)
-        for idx, row in self.data.iterrows():
-            timestamp = row['Timestamp']
-            machine_name = row['Machine_Name']
-            
-            if machine_name not in self.machine_name_code:
-                continue  # Skip unknown machines
-            
-            # Get register ranges to monitor for this machine
-            register_ranges = self.get_register_range_for_machine(machine_name)
-            # print("register_ranges:", register_ranges)
-            # Check all registers in the monitoring range
-            for start_reg, end_reg in register_ranges:
-                for register in range(start_reg, end_reg + 1):
-                    col_name = f"IO_{register:04d}"  # Format: IO_0550
-                    
-                    if col_name in row:
-                        register_value = row[col_name]
-                        self.process_register_bits(machine_name, register, 
-                                                   register_value, timestamp)
+            # Process each row (each cycle)
+            with self.metrics.stage("edge_detection"):
+                for idx, row in scans.iterrows():
+                    timestamp = row['Timestamp']
+                    machine_name = row['Machine_Name']
+                
+                    if machine_name not in self.machine_name_code:
+                        continue  # Skip unknown machines
+                    self.run_log.count("scans_processed")
+                
+                    # Check all registers in the monitoring range
+                    layout = self.get_bit_layout(machine_name)
+                    word_indices = [i for i, register in enumerate(layout.registers)
+                                    if f"IO_{register:04d}" in row]  # Format: IO_0550
+                    words = np.array([self.parse_register_value(row[f"IO_{layout.registers[i]:04d}"])
+                                      for i in word_indices], dtype=np.uint16)
+                    self.process_words(machine_name, np.array(word_indices, dtype=np.int64),
+                                       words, timestamp)
+
+            self.flush_error_events()
+            self.run_log.log_summary()
         
-        return self.get_output_dataframe()
+            return self.get_output_dataframe()
+        finally:
+            # Stops tracemalloc / RSS sampling with profile_memory
+            self.metrics.close()
     
     
     def get_output_dataframe(self) -> pd.DataFrame:
@@ -306,14 +480,29 @@ class CreateErrorTableCode:
         return df
     
     
+    def get_error_episodes(self, as_of: datetime = None) -> ErrorEpisodeStore:
+        """Get the flushed error events as an episode store for window queries."""
+        events = pd.concat(self.event_log, ignore_index=True) if self.event_log \
+            else pd.DataFrame(columns=EVENT_COLUMNS)
+        return ErrorEpisodeStore.from_events(events, as_of=as_of)
+    
+    
     def export_to_csv(self, output_path: str):
         """Export error log to CSV."""
         df = self.get_output_dataframe()
         if not df.empty:
-            df.to_csv(output_path, index=False, encoding='utf-8-sig')
-            print(f"Error log exported to {output_path} ({len(df)} rows)")
+            with self.metrics.stage("export"):
+                df.to_csv(output_path, index=False, encoding='utf-8-sig')
+            logger.info("Error log exported to %s (%d rows)", output_path, len(df))
         else:
-            print("No errors to export")
+            logger.warning("No errors to export")
+    
+    
+    def export_metrics(self, output_path: str):
+        """Export the run's stage timings and counters to JSON."""
+        self.metrics.close()
+        self.metrics.export_json(output_path)
+        logger.info("Run metrics exported to %s", output_path)
     
     
     def get_active_errors_summary(self, current_timestamp: datetime = None) -> Dict:
@@ -321,15 +510,21 @@ class CreateErrorTableCode:
         if current_timestamp is None:
             current_timestamp = datetime.now()
         
+        current_time = pd.Timestamp(current_timestamp).value
+
         summary = {}
-        for machine, errors in self.active_errors.items():
+        for machine, state in self.active_errors.items():
+            error_types = self.get_bit_layout(machine).error_types
+            active = state.summary(current_time)
             summary[machine] = {
-                bit_num: {
-                    'start_time': info['start_time'],
-                    'error_type': info['error_type'],
-                    'duration_so_far': (current_timestamp - info['start_time']).total_seconds()
+                int(bit_num): {
+                    'start_time': pd.Timestamp(start_time),
+                    'error_type': error_types[int(error_code)],
+                    'duration_so_far': float(duration)
                 }
-                for bit_num, info in errors.items()
+                for bit_num, start_time, error_code, duration in zip(
+                    active['bit_number'], active['start_time'],
+                    active['error_type'], active['duration_so_far'])
             }
         return summary
     
@@ -339,7 +534,8 @@ class CreateErrorTableCode:
 
 
 if __name__ == "__main__":
-        # Machine Configuration
+    setup_logging()
+    # Machine Configuration
     MACHINE_NAME_CODE = {
         "AM322": {"code": 1, "error_pattern": "pattern_1"}, 
         "AM323": {"code": 2, "error_pattern": "pattern_2"}
@@ -350,11 +546,12 @@ if __name__ == "__main__":
         machine_name_code=MACHINE_NAME_CODE,
         day_night="昼勤",
         unit_code="10-1719",
-        data_path=plc_data_file  # Your CSV file path
+        data_path=plc_data_file,  # Your CSV file path
+        compress_runs=True
     )
     
     # Process the data
-    print("Processing data...")
+    logger.info("Processing data...")
     output_df = tracker.process_data()
     
     # # Display results
@@ -367,6 +564,7 @@ if __name__ == "__main__":
     
     # # Export to CSV
     tracker.export_to_csv("proper_output3.csv")
+    tracker.export_metrics("proper_output3_metrics.json")
     
 
 
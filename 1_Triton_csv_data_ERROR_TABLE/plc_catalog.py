@@ -0,0 +1,170 @@
+import logging
+import duckdb
+import pandas as pd
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Union
+from error_events import EVENT_COLUMNS, EPISODE_COLUMNS, MODE_NAMES, ON_STATUS
+
+logger = logging.getLogger(__name__)
+
+# Views registered by PLCCatalog
+PARSED_LONG_VIEW = "parsed_long"      # Timestamp, Machine_Name, reg_address, value
+TRITON_WIDE_VIEW = "triton_wide"      # Timestamp, IO_0500 ..., D_31600 ..., Machine_Name
+EVENTS_VIEW = "error_events"          # EVENT_COLUMNS
+EPISODES_VIEW = "error_episodes"      # EPISODE_COLUMNS
+
+_MODE_CASE = ("CASE IO_0502 " + " ".join(f"WHEN '{word}' THEN '{mode}'" for word, mode in MODE_NAMES.items())
+              + " ELSE 'None' END")
+
+# Ready-made parametrized queries ($name parameters)
+QUERIES = {
+    # Error starts per machine and error type in [$start, $end)
+    'error_counts': f"""
+        SELECT Machine_Name, error_type, count(*) AS error_count
+        FROM {EVENTS_VIEW}
+        WHERE number_status = '{ON_STATUS}'
+          AND "Timestamp" >= $start AND "Timestamp" < $end
+        GROUP BY ALL
+        ORDER BY Machine_Name, error_type
+    """,
+    # Downtime per machine and error type from closed episodes starting in [$start, $end)
+    'error_downtime': f"""
+        SELECT Machine_Name, error_type, count(*) AS error_count,
+               sum(epoch("end") - epoch(start)) AS downtime,
+               max(epoch("end") - epoch(start)) AS max_duration
+        FROM {EPISODES_VIEW}
+        WHERE "end" IS NOT NULL AND start >= $start AND start < $end
+        GROUP BY ALL
+        ORDER BY Machine_Name, error_type
+    """,
+    # Seconds spent in each operation mode (IO_0502), a scan lasting until the next one
+    'mode_durations': f"""
+        WITH scans AS (
+            SELECT Machine_Name, "Timestamp",
+                   {_MODE_CASE} AS mode,
+                   lead("Timestamp") OVER (PARTITION BY Machine_Name ORDER BY "Timestamp") AS next_scan
+            FROM {TRITON_WIDE_VIEW}
+            WHERE "Timestamp" >= $start AND "Timestamp" < $end
+        )
+        SELECT Machine_Name, mode, sum(epoch(next_scan) - epoch("Timestamp")) AS seconds
+        FROM scans
+        WHERE next_scan IS NOT NULL
+        GROUP BY ALL
+        ORDER BY Machine_Name, mode
+    """,
+}
+
+
+def _sql_string(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _columns(columns: List[str]) -> str:
+    return ", ".join(f'"{col}"' for col in columns)
+
+
+def _reader(path: Union[str, Sequence[str]], all_varchar: bool = False) -> str:
+    """read_parquet / read_csv table function for a path, glob or list of paths."""
+    paths = [path] if isinstance(path, str) else list(path)
+    sources = "[" + ", ".join(_sql_string(p) for p in paths) + "]"
+    if all(p.endswith(".parquet") for p in paths):
+        return f"read_parquet({sources}, union_by_name = true)"
+    return f"read_csv({sources}, header = true, union_by_name = true{', all_varchar = true' if all_varchar else ''})"
+
+
+class PLCCatalog:
+    """
+    Embedded DuckDB catalog over parsed PLC data.
+
+    Parquet/CSV files (paths or globs such as "raw/*.parquet") are registered
+    as views, so every query scans the files directly - columnar and
+    multithreaded - without loading them into pandas first. DataFrames
+    (e.g. tracker.event_log, ErrorEpisodeStore.episodes) can be registered
+    under the same view names.
+
+    Example:
+        >>> catalog = PLCCatalog()
+        >>> catalog.register_triton_wide("Combined_sorted.csv")
+        >>> catalog.register_events(tracker_events)
+        >>> catalog.run('error_counts', start="2025-11-27", end="2025-11-28")
+    """
+
+    def __init__(self, database: str = ":memory:", threads: Optional[int] = None):
+        self.database = database
+        self.connection = duckdb.connect(database)
+        if threads is not None:
+            self.connection.execute(f"SET threads = {int(threads)}")
+
+    def _create_view(self, view: str, select_sql: str):
+        self.connection.execute(f'CREATE OR REPLACE VIEW "{view}" AS {select_sql}')
+        logger.info("Registered view %s", view)
+
+    def _register_frame(self, view: str, df: pd.DataFrame, columns: List[str]):
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"DataFrame for view '{view}' is missing columns {missing}")
+        # The view reads the DataFrame in place (for this connection only)
+        self.connection.register(f"{view}_frame", df[columns])
+        self._create_view(view, f'SELECT * FROM "{view}_frame"')
+
+    def register_parsed_long(self, path: Union[str, Sequence[str]], work_date: Optional[str] = None):
+        """
+        Register the parsed long table (TableFormatter output) as parsed_long.
+
+        Timestamps are stored as "HH:MM:SS:mmm"; with work_date ("YYYY/MM/DD")
+        they become full timestamps, otherwise they stay text.
+        """
+        timestamp = '"Timestamp"'
+        if work_date:
+            timestamp = (f"strptime({_sql_string(work_date)} || ' ' || \"Timestamp\", "
+                         f"'%Y/%m/%d %H:%M:%S:%g') AS \"Timestamp\"")
+        self._create_view(PARSED_LONG_VIEW, f"""
+            SELECT {timestamp}, Machine_Name, reg_address, value
+            FROM {_reader(path, all_varchar=True)}
+        """)
+
+    def register_triton_wide(self, path: Union[str, Sequence[str]]):
+        """Register Triton wide exports as triton_wide (register words stay text)."""
+        self._create_view(TRITON_WIDE_VIEW, f"""
+            SELECT * REPLACE (CAST("Timestamp" AS TIMESTAMP) AS "Timestamp")
+            FROM {_reader(path, all_varchar=True)}
+        """)
+
+    def register_events(self, source: Union[str, Sequence[str], pd.DataFrame]):
+        """Register error events (EVENT_COLUMNS) from files or a DataFrame as error_events."""
+        if isinstance(source, pd.DataFrame):
+            self._register_frame(EVENTS_VIEW, source, EVENT_COLUMNS)
+        else:
+            self._create_view(EVENTS_VIEW, f"SELECT {_columns(EVENT_COLUMNS)} FROM {_reader(source)}")
+
+    def register_episodes(self, source: Union[str, Sequence[str], pd.DataFrame]):
+        """Register error episodes (EPISODE_COLUMNS) from files or a DataFrame as error_episodes."""
+        if isinstance(source, pd.DataFrame):
+            self._register_frame(EPISODES_VIEW, source, EPISODE_COLUMNS)
+        else:
+            self._create_view(EPISODES_VIEW, f"SELECT {_columns(EPISODE_COLUMNS)} FROM {_reader(source)}")
+
+    def views(self) -> List[str]:
+        """Registered views (without the DataFrames backing them)."""
+        return [row[0] for row in self.connection.execute(
+            "SELECT view_name FROM duckdb_views() WHERE NOT internal ORDER BY view_name").fetchall()
+            if not row[0].endswith("_frame")]
+
+    def query(self, sql: str, params: Optional[Union[Dict[str, Any], Sequence[Any]]] = None) -> pd.DataFrame:
+        """Run SQL with ?-style (sequence) or $name (dict) parameters and return a DataFrame."""
+        return self.connection.execute(sql, params).df()
+
+    def run(self, name: str, start: datetime, end: datetime, **params) -> pd.DataFrame:
+        """Run one of QUERIES over the window [start, end)."""
+        if name not in QUERIES:
+            raise ValueError(f"Query '{name}' not found. Use one of {list(QUERIES)}")
+        params = dict(params, start=pd.Timestamp(start).to_pydatetime(), end=pd.Timestamp(end).to_pydatetime())
+        return self.query(QUERIES[name], params)
+
+    def export_parquet(self, view: str, output_path: str):
+        """Write a view to Parquet (e.g. to convert a day's CSV exports once)."""
+        self.connection.execute(f'COPY (SELECT * FROM "{view}") TO {_sql_string(output_path)} (FORMAT parquet)')
+        logger.info("View %s exported to %s", view, output_path)
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,179 @@
+from Tables_config_codes import ERROR_TABLE
+import logging
+import polars as pl
+import pandas as pd
+from typing import Dict, Optional
+from active_error_state import ErrorBitLayout
+from error_events import MODE_NAMES, ON_STATUS, OFF_STATUS
+
+logger = logging.getLogger(__name__)
+
+
+class PolarsErrorTableBuilder:
+    """
+    Error table of a Triton wide export built as one Polars lazy query.
+
+    Same rows and columns as CreateErrorTableCode.get_output_dataframe()
+    (without compress_runs / debounce_config), but nothing is materialized
+    until collect(), so Polars can push filters and column selection into
+    the CSV scan and run the plan with the streaming engine:
+
+        scan -> filter machines / running / time window
+             -> unpivot error registers -> keep words that changed
+             -> unpack bits -> edge detection via shift over (machine, bit)
+             -> durations via shift over edges -> join enrichment columns
+
+    Example:
+        >>> builder = PolarsErrorTableBuilder(MACHINE_NAME_CODE)
+        >>> output_df = builder.process_data("Combined_sorted.csv")
+    """
+
+    def __init__(self, machine_name_code: Dict, day_night="昼勤", unit_code="10-1719"):
+        self.machine_name_code = machine_name_code
+        self.day_night = day_night
+        self.unit_code = unit_code
+        self.error_columns_details = ERROR_TABLE.get("columns", {})
+        self.error_column_names = list(self.error_columns_details.keys())
+        self.output_df = None
+
+    def _machines(self) -> pl.LazyFrame:
+        return pl.LazyFrame({
+            'Machine_Name': list(self.machine_name_code),
+            'machine_code': [info['code'] for info in self.machine_name_code.values()],
+            'pattern': [info['error_pattern'] for info in self.machine_name_code.values()],
+        })
+
+    def _bit_layouts(self) -> pl.LazyFrame:
+        """One row per (pattern, register column, bit position) with its bit number and error type."""
+        rows = []
+        for pattern in sorted({info['error_pattern'] for info in self.machine_name_code.values()}):
+            layout = ErrorBitLayout(pattern)
+            for i, register in enumerate(layout.registers):
+                for bit_position in range(16):
+                    bit_number = int(layout.bit_numbers[i, bit_position])
+                    rows.append((pattern, f"IO_{register:04d}", bit_position, bit_number,
+                                 layout.error_types[int(layout.error_codes[bit_number])]))
+        return pl.LazyFrame(rows, schema=['pattern', 'reg', 'bit_position', 'bit_number', 'error_type'],
+                            orient='row')
+
+    def build_query(self, source: pl.LazyFrame, start_time: Optional[str] = None,
+                    end_time: Optional[str] = None) -> pl.LazyFrame:
+        """
+        Lazy query producing the error table from a Triton wide frame.
+
+        Args:
+            source: Lazy Triton export with every column as text
+                    (e.g. pl.scan_csv(path, infer_schema=False))
+            start_time, end_time: Optional time window (inclusive)
+        """
+        schema = source.collect_schema()
+        layouts = self._bit_layouts()
+        register_columns = [reg for reg in layouts.select('reg').unique().collect().to_series().to_list()
+                            if reg in schema]
+
+        scans = (source
+                 .with_row_index('scan')
+                 .filter(pl.col('Machine_Name').is_in(list(self.machine_name_code)))
+                 .with_columns(pl.col('Timestamp').str.to_datetime(time_unit='ns')))
+        running = [col for col in schema if 'running' in col.lower()]
+        if running:
+            scans = scans.filter(pl.col(running[0]).str.to_lowercase() == 'true')
+        if start_time:
+            scans = scans.filter(pl.col('Timestamp') >= pd.Timestamp(start_time).to_pydatetime())
+        if end_time:
+            scans = scans.filter(pl.col('Timestamp') <= pd.Timestamp(end_time).to_pydatetime())
+
+        # Register words, keeping only those that differ from the previous
+        # word of the same (machine, register); the tracker starts from 0
+        words = (scans
+                 .select(['scan', 'Timestamp', 'Machine_Name'] + register_columns)
+                 .unpivot(on=register_columns, index=['scan', 'Timestamp', 'Machine_Name'],
+                          variable_name='reg', value_name='word')
+                 .with_columns(pl.col('word').str.to_integer(base=16).fill_null(0))
+                 .sort('scan')
+                 .with_columns(previous=pl.col('word').shift(1, fill_value=0).over(['Machine_Name', 'reg']))
+                 .filter(pl.col('word') != pl.col('previous')))
+
+        # Unpack the changed words and keep the bits that flipped
+        edges = (words
+                 .join(self._machines(), on='Machine_Name')
+                 .join(layouts, on=['pattern', 'reg'])
+                 .with_columns(
+                     value=(pl.col('word') // (2 ** pl.col('bit_position'))) % 2,
+                     was=(pl.col('previous') // (2 ** pl.col('bit_position'))) % 2)
+                 .filter(pl.col('value') != pl.col('was'))
+                 .sort(['scan', 'bit_number'])
+                 .with_columns(
+                     number_status=pl.when(pl.col('value') == 1).then(pl.lit(ON_STATUS)).otherwise(pl.lit(OFF_STATUS)),
+                     started_at=pl.col('Timestamp').shift(1).over(['Machine_Name', 'bit_number']))
+                 .with_columns(
+                     duration=pl.when(pl.col('value') == 1).then(0)
+                     .otherwise((pl.col('Timestamp') - pl.col('started_at')).dt.total_nanoseconds() // 10**9))
+                 .select(['scan', 'Timestamp', 'Machine_Name', 'machine_code', 'bit_number',
+                          'error_type', 'number_status', 'duration']))
+
+        return self._enrich(edges, scans, schema)
+
+    def _enrich(self, edges: pl.LazyFrame, scans: pl.LazyFrame, schema) -> pl.LazyFrame:
+        """Join the mode and PLC columns of the first scan at the same second and name the output columns."""
+        columns = self.error_column_names
+        plc_columns = {col: self.error_columns_details[col].get("PLC_Memory_Address", "").replace("M", "_")
+                       for col in columns[15:]}
+        lookup_columns = sorted({reg for reg in plc_columns.values() if reg and reg in schema})
+
+        lookup = (scans
+                  .select(['scan', 'Timestamp', 'Machine_Name', 'IO_0502'] + lookup_columns)
+                  .sort('scan')
+                  .unique(subset=['Timestamp', 'Machine_Name'], keep='first', maintain_order=True)
+                  .drop('scan'))
+        joined = (edges
+                  .with_columns(second=pl.col('Timestamp').dt.truncate('1s'))
+                  .join(lookup, left_on=['second', 'Machine_Name'], right_on=['Timestamp', 'Machine_Name'],
+                        how='left', suffix='_lookup')
+                  .sort(['scan', 'bit_number']))
+
+        startup = pl.col('error_type') == "起動時異常"
+        running = pl.col('error_type') == "運転中異常"
+        output = [
+            pl.col('Timestamp').dt.strftime("%Y/%m/%d %H:%M:%S").alias(columns[0]),
+            pl.col('Timestamp').dt.strftime("%Y/%m/%d").alias(columns[1]),
+            pl.lit(self.day_night).alias(columns[2]),
+            pl.lit(self.unit_code).alias(columns[3]),
+            pl.col('machine_code').alias(columns[4]),
+            pl.col('Machine_Name').cast(pl.String).alias(columns[5]),
+            pl.lit("-").alias(columns[6]),
+            pl.lit("--").alias(columns[7]),
+            pl.col('IO_0502').replace_strict(MODE_NAMES, default="None").alias(columns[8]),
+            pl.col('error_type').alias(columns[9]),
+            pl.col('bit_number').alias(columns[10]),
+            pl.lit("need_data").alias(columns[11]),
+            pl.col('number_status').alias(columns[12]),
+            pl.when(startup).then(pl.col('duration')).otherwise(0).alias(columns[13]),
+            pl.when(running).then(pl.col('duration')).otherwise(0).alias(columns[14]),
+        ]
+        for col, register_col in plc_columns.items():
+            if not register_col:
+                output.append(pl.lit("None").alias(col))
+            elif register_col in lookup_columns:
+                output.append(pl.col(register_col).alias(col))
+            else:
+                output.append(pl.lit(0).alias(col))
+        return joined.select(output)
+
+    def process_data(self, data_path: str, start_time: Optional[str] = None,
+                     end_time: Optional[str] = None, streaming: bool = True) -> pd.DataFrame:
+        """Scan a Triton CSV, run the query and return the error table as pandas."""
+        source = pl.scan_csv(data_path, infer_schema=False)
+        query = self.build_query(source, start_time, end_time)
+        result = query.collect(engine="streaming" if streaming else "auto")
+        logger.info("Polars error table: %d rows from %s", result.height, data_path)
+        self.output_df = result.to_pandas() if result.height else pd.DataFrame(columns=self.error_column_names)
+        return self.output_df
+
+    def export_to_csv(self, output_path: str):
+        """Export error log to CSV (same format as CreateErrorTableCode.export_to_csv)."""
+        if self.output_df is not None and not self.output_df.empty:
+            self.output_df.to_csv(output_path, index=False, encoding='utf-8-sig')
+            logger.info("Error log exported to %s (%d rows)", output_path, len(self.output_df))
+        else:
+            logger.warning("No errors to export")
@@ -0,0 +1,61 @@
+import pandas as pd
+from typing import List
+
+
+def get_error_register_columns(pattern_config: dict) -> List[str]:
+    """Get the Triton column names (IO_0550 ...) monitored by an error pattern."""
+    columns = []
+    for config in pattern_config.values():
+        for register in range(config['register_start'], config['register_end'] + 1):
+            columns.append(f"IO_{register:04d}")
+    return columns
+
+
+def compress_identical_scans(data: pd.DataFrame, register_columns: List[str],
+                             machine_column: str = 'Machine_Name',
+                             timestamp_column: str = 'Timestamp') -> pd.DataFrame:
+    """
+    Collapse consecutive scans with identical register vectors into runs.
+
+    Each machine is handled on its own, in the original row order. A run
+    keeps the first scan of the stretch (the only one where bits can
+    change) plus the repeat count and time span of the stretch.
+
+    Args:
+        data: Triton wide table, one row per scan
+        register_columns: Columns compared between scans (e.g. IO_0550..IO_0589)
+        machine_column: Column holding the machine name
+        timestamp_column: Column holding the scan timestamp
+
+    Returns:
+        DataFrame of run heads with extra columns
+        'Repeat_Count', 'Run_Start' and 'Run_End'
+    """
+    if data.empty:
+        return data.assign(Repeat_Count=pd.Series(dtype='int64'),
+                           Run_Start=data[timestamp_column],
+                           Run_End=data[timestamp_column])
+
+    register_columns = [col for col in register_columns if col in data.columns]
+    registers = data[register_columns].fillna('')
+
+    machines = data[machine_column]
+
+    # A new run starts whenever any register differs from the previous scan
+    # of the same machine (the first scan of every machine always starts one).
+    # observed=True: a categorical machine column must not add empty groups
+    previous = registers.groupby(machines, sort=False, observed=True).shift()
+    changed = (registers != previous.fillna('')).any(axis=1)
+    changed |= previous.isna().all(axis=1)
+
+    run_id = changed.groupby(machines, sort=False, observed=True).cumsum()
+    runs = data.groupby([machines, run_id], sort=False, observed=True)[timestamp_column].agg(
+        Repeat_Count='size', Run_Start='first', Run_End='last')
+
+    # Look the runs up by (machine, run id) of each head rather than by position
+    heads = data.loc[changed].copy()
+    runs = runs.reindex(pd.MultiIndex.from_arrays([machines[changed], run_id[changed]]))
+    heads['Repeat_Count'] = runs['Repeat_Count'].to_numpy()
+    heads['Run_Start'] = runs['Run_Start'].to_numpy()
+    heads['Run_End'] = runs['Run_End'].to_numpy()
+    return heads
@@ -1,11 +1,15 @@
 # read the csv and add the column called as the machine_name in the last column as defualt value "what the input is given" 
+import logging
 import pandas as pd
+from Tables_config_codes import read_csv_table, setup_logging
+
+logger = logging.getLogger(__name__)
 
 
 # step 1: 
 def add_default_value_column(csv_file_path, output_csv_file_path, column_name, default_value):
     # Read the CSV file into a DataFrame
-    df = pd.read_csv(csv_file_path)
+    df = read_csv_table(csv_file_path)
 
     # Drop the column if "running is present in the name of the columns Ex P6_running"
     df = df.loc[:, ~df.columns.str.contains('running', case=False)]
@@ -27,19 +31,20 @@ def add_default_value_column(csv_file_path, output_csv_file_path, column_name, d
 
     # Save the modified DataFrame back to a new CSV file
     df.to_csv(output_csv_file_path, index=False)
-    print(f"Added column '{column_name}' with default value '{default_value}' to {output_csv_file_path}")
+    logger.info("Added column '%s' with default value '%s' to %s", column_name, default_value, output_csv_file_path)
 
 # add_default_value_column(r"Vina_data/Triton_AM323_192_168_16_2.csv", "AM323.csv", "Machine_Name", "AM323")
 
 # step2: 
 # 2 csv files read it and combine the data into csv file and arranged by the time stamp column
 def combine_and_sort_csv(csv_file_path1, csv_file_path2, output_csv_file_path):
-    df1 = pd.read_csv(csv_file_path1)
-    df2 = pd.read_csv(csv_file_path2)
+    df1 = read_csv_table(csv_file_path1, dtype={'Timestamp': str})
+    df2 = read_csv_table(csv_file_path2, dtype={'Timestamp': str})
 
     df = pd.concat([df1, df2], ignore_index=True)
     df = df.sort_values(by='Timestamp')
     df.to_csv(output_csv_file_path, index=False)
-    print(f"Combined and sorted data saved to {output_csv_file_path}")
+    logger.info("Combined and sorted data saved to %s", output_csv_file_path)
 
+setup_logging()
 combine_and_sort_csv("AM322.csv", "AM323.csv", "Combined_sorted.csv")
\ No newline at end of file
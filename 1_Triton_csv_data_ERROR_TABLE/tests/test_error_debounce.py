@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from error_debounce import EventDebouncer, debounce_error_events
+from error_events import EVENT_COLUMNS, OFF_STATUS, ON_STATUS
+from main_error_table_code import CreateErrorTableCode
+from Tables_config_codes import ERROR_TABLE
+
+MACHINE_NAME_CODE = {"AM322": {"code": 1, "error_pattern": "pattern_1"}}
+T0 = datetime(2025, 11, 27, 10, 0, 0)
+
+
+def _scan_table(seconds):
+    """Loaded scans at the given offsets, as add_output_row() looks up the row context there."""
+    registers = [details['PLC_Memory_Address'].replace("M", "_")
+                 for details in list(ERROR_TABLE['columns'].values())[15:] if details.get('PLC_Memory_Address')]
+    return pd.DataFrame([dict({'Timestamp': T0 + timedelta(seconds=s), 'Machine_Name': "AM322",
+                               'IO_0502': "9000"}, **dict.fromkeys(registers, "0000")) for s in seconds])
+
+
+def _set_word(tracker, word, seconds):
+    layout = tracker.get_bit_layout("AM322")
+    tracker.process_words("AM322", np.array([0]), np.array([word], dtype=np.uint16),
+                          T0 + timedelta(seconds=seconds))
+    return layout
+
+
+def _events(*rows):
+    return pd.DataFrame([(T0 + timedelta(seconds=s), "AM322", bit, "起動時異常", status, duration)
+                         for s, bit, status, duration in rows], columns=EVENT_COLUMNS)
+
+
+def test_end_is_emitted_when_start_was_flushed_earlier():
+    tracker = CreateErrorTableCode(machine_name_code=MACHINE_NAME_CODE, log_mode="summary",
+                                   debounce_config={'起動時異常': {'min_on_time': 1}})
+    tracker.data = _scan_table([0, 3, 5])
+    _set_word(tracker, 0x0001, 0)
+    _set_word(tracker, 0x0001, 3)
+    tracker.flush_error_events()
+    _set_word(tracker, 0x0000, 5)
+    tracker.flush_error_events()
+
+    first, second = tracker.event_log
+    assert first['number_status'].tolist() == [ON_STATUS]
+    assert second['number_status'].tolist() == [OFF_STATUS]
+    assert second['duration'].tolist() == [5]
+    episodes = tracker.get_error_episodes().episodes
+    assert episodes['end'].notna().all()
+
+
+def test_young_episode_is_held_until_it_outlives_min_on_time():
+    debouncer = EventDebouncer({'起動時異常': {'min_on_time': 2}})
+    assert debouncer.push(_events((0, 5, ON_STATUS, 0)), final=False).empty
+    # Still younger than 2 s at the latest event of the batch
+    assert debouncer.push(_events((1, 6, ON_STATUS, 0)), final=False).empty
+    emitted = debouncer.push(_events((3, 7, ON_STATUS, 0)), final=False)
+    assert emitted['bit_number'].tolist() == [5, 6]
+
+    ends = debouncer.push(_events((4, 5, OFF_STATUS, 4), (4, 7, OFF_STATUS, 1)), final=False)
+    # Bit 5 ends after 4 s; bit 7 was a 1 s glitch and is dropped with its start
+    assert ends['bit_number'].tolist() == [5]
+    assert ends['duration'].tolist() == [4.0]
+
+
+def test_restart_after_flush_is_merged_within_min_off_time():
+    debouncer = EventDebouncer({'起動時異常': {'min_off_time': 2}})
+    assert debouncer.push(_events((0, 5, ON_STATUS, 0), (5, 5, OFF_STATUS, 5)), final=False).empty
+    merged = debouncer.push(_events((6, 5, ON_STATUS, 0), (9, 5, OFF_STATUS, 3)))
+    assert merged['number_status'].tolist() == [ON_STATUS, OFF_STATUS]
+    assert merged['Timestamp'].tolist() == [T0, T0 + timedelta(seconds=9)]
+
+
+def test_single_final_push_matches_batch_debounce():
+    events = _events((0, 5, ON_STATUS, 0), (0.5, 5, OFF_STATUS, 0), (1, 6, ON_STATUS, 0),
+                     (2, 5, ON_STATUS, 0), (8, 6, OFF_STATUS, 7), (9, 7, ON_STATUS, 0))
+    config = {'起動時異常': {'min_on_time': 1, 'min_off_time': 1}}
+    expected = debounce_error_events(events, config)
+    pd.testing.assert_frame_equal(EventDebouncer(config).push(events), expected, check_dtype=False)
+
+
+def test_end_of_emitted_episode_is_held_and_merged_with_restart():
+    debouncer = EventDebouncer({'起動時異常': {'min_off_time': 2}})
+    assert debouncer.push(_events((0, 5, ON_STATUS, 0)), final=False)['number_status'].tolist() == [ON_STATUS]
+    # The start is out; its end may still be merged with a restart
+    assert debouncer.push(_events((5, 5, OFF_STATUS, 5)), final=False).empty
+    assert debouncer.push(_events((6, 5, ON_STATUS, 0)), final=False).empty
+    ends = debouncer.push(_events((9, 5, OFF_STATUS, 3)))
+
+    assert ends['number_status'].tolist() == [OFF_STATUS]
+    assert ends['duration'].tolist() == [9.0]
+    assert debouncer.open_starts == {}
+
+
+def test_held_end_passes_once_older_than_min_off_time():
+    debouncer = EventDebouncer({'起動時異常': {'min_off_time': 2}})
+    debouncer.push(_events((0, 5, ON_STATUS, 0)), final=False)
+    assert debouncer.push(_events((5, 5, OFF_STATUS, 5)), final=False).empty
+    ends = debouncer.push(_events((8, 6, ON_STATUS, 0)), final=False)
+    assert ends['bit_number'].tolist() == [5, 6]
+    assert ends['duration'].tolist() == [5.0, 0.0]
+
+
+def test_short_episode_is_held_not_dropped_while_a_restart_can_merge_it():
+    config = {'起動時異常': {'min_on_time': 3, 'min_off_time': 3}}
+    events = _events((3, 5, ON_STATUS, 0), (5, 5, OFF_STATUS, 2), (7, 5, ON_STATUS, 0))
+    debouncer = EventDebouncer(config)
+    first = debouncer.push(events.iloc[:2], final=False)
+    rest = debouncer.push(events.iloc[2:], final=False)
+
+    assert first.empty
+    assert rest['Timestamp'].tolist() == debounce_error_events(events, config)['Timestamp'].tolist()
@@ -0,0 +1,34 @@
+import numpy as np
+from error_heavy_hitters import SpaceSaving
+
+
+def _reference(items, capacity):
+    """Space-Saving with a linear scan for the smallest counter (ties: smallest item)."""
+    counters = {}
+    for item in items:
+        if item in counters:
+            counters[item][0] += 1
+        elif len(counters) < capacity:
+            counters[item] = [1, 0]
+        else:
+            victim = min(counters, key=lambda key: (counters[key][0], key))
+            floor = counters.pop(victim)[0]
+            counters[item] = [floor + 1, floor]
+    return counters
+
+
+def test_evicts_the_smallest_counter():
+    summary = SpaceSaving(capacity=3)
+    for item in [1, 1, 1, 2, 2, 3]:
+        summary.add(item)
+    summary.add(4)
+    assert summary.counters == {1: [3, 0], 2: [2, 0], 4: [2, 1]}
+
+
+def test_matches_linear_scan_on_a_skewed_stream():
+    items = np.random.default_rng(0).zipf(1.3, 20000) % 500
+    summary = SpaceSaving(capacity=16)
+    for item in items.tolist():
+        summary.add(item)
+    assert summary.counters == _reference(items.tolist(), 16)
+    assert len(summary._heap) <= 4 * summary.capacity
@@ -0,0 +1,41 @@
+import pandas as pd
+from datetime import datetime, timedelta
+from error_episodes import ErrorEpisodeStore
+from error_metrics import compute_error_metrics
+
+T0 = datetime(2025, 11, 27, 10, 0, 0)
+
+
+def _store(*episodes, as_of=10):
+    return ErrorEpisodeStore(pd.DataFrame(
+        [{'Machine_Name': machine, 'bit_number': bit, 'error_type': "起動時異常",
+          'start': T0 + timedelta(seconds=start), 'end': T0 + timedelta(seconds=end)}
+         for machine, bit, start, end in episodes]), as_of=T0 + timedelta(seconds=as_of))
+
+
+def test_overlapping_bits_count_downtime_once():
+    store = _store(("AM322", 1, 0, 9), ("AM322", 2, 1, 10))
+    metrics = compute_error_metrics(store, window=(T0, T0 + timedelta(seconds=10)))
+
+    row = metrics.iloc[0]
+    assert row['error_count'] == 2
+    assert row['downtime'] == 10.0
+    assert row['mtbf'] == 0.0
+    assert row['mttr'] == 9.0
+
+
+def test_union_per_machine_and_bucket():
+    store = _store(("AM322", 1, 0, 4), ("AM322", 2, 2, 6), ("AM322", 3, 8, 9), ("AM323", 1, 1, 3),
+                   as_of=20)
+    metrics = compute_error_metrics(store, window=(T0, T0 + timedelta(seconds=20))).set_index('Machine_Name')
+
+    assert metrics.loc["AM322", 'downtime'] == 7.0
+    assert metrics.loc["AM322", 'mtbf'] == (20 - 7) / 3
+    assert metrics.loc["AM323", 'downtime'] == 2.0
+
+
+def test_per_bit_downtime_is_not_merged():
+    store = _store(("AM322", 1, 0, 9), ("AM322", 2, 1, 10))
+    metrics = compute_error_metrics(store, by=('Machine_Name', 'bit_number'),
+                                    window=(T0, T0 + timedelta(seconds=10)))
+    assert metrics['downtime'].tolist() == [9.0, 9.0]
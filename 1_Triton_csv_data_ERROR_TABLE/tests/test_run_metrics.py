@@ -0,0 +1,36 @@
+import tracemalloc
+import pandas as pd
+import pytest
+from datetime import datetime, timedelta
+from main_error_table_code import CreateErrorTableCode
+from Tables_config_codes import ERROR_TABLE
+
+MACHINE_NAME_CODE = {"AM322": {"code": 1, "error_pattern": "pattern_1"}}
+T0 = datetime(2025, 11, 27, 10, 0, 0)
+
+
+def _tracker(words):
+    tracker = CreateErrorTableCode(machine_name_code=MACHINE_NAME_CODE, log_mode="summary", profile_memory=True)
+    registers = [details['PLC_Memory_Address'].replace("M", "_")
+                 for details in list(ERROR_TABLE['columns'].values())[15:] if details.get('PLC_Memory_Address')]
+    tracker.data = pd.DataFrame(dict({'Timestamp': [T0 + timedelta(seconds=s) for s in range(len(words))],
+                                      'Machine_Name': "AM322", 'IO_0502': "9000", 'IO_0550': words},
+                                     **dict.fromkeys(registers, "0000")))
+    return tracker
+
+
+def test_process_data_stops_memory_profiling():
+    tracker = _tracker(["0000", "0001", "0000"])
+    tracker.process_data()
+
+    assert not tracemalloc.is_tracing()
+    assert tracker.metrics.memory._sampler is None
+    assert tracker.metrics.to_dict()['memory']['edge_detection']['calls'] == 1
+
+
+def test_failed_process_data_stops_memory_profiling():
+    tracker = _tracker(["0000", "zz", "0000"])
+    with pytest.raises(ValueError):
+        tracker.process_data()
+    assert not tracemalloc.is_tracing()
+    assert tracker.metrics.memory._sampler is None
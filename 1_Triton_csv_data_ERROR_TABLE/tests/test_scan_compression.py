@@ -0,0 +1,30 @@
+import warnings
+import pandas as pd
+import pytest
+from scan_compression import compress_identical_scans
+
+
+def _scans(machine_dtype=None):
+    data = pd.DataFrame({
+        'Timestamp': pd.to_datetime(['2025-11-27 10:00:00', '2025-11-27 10:00:00', '2025-11-27 10:00:01',
+                                     '2025-11-27 10:00:01', '2025-11-27 10:00:02', '2025-11-27 10:00:03']),
+        'Machine_Name': ['AM322', 'AM323', 'AM322', 'AM323', 'AM322', 'AM322'],
+        'IO_0550': ['0000', '0001', '0000', '0001', '0004', '0004'],
+    })
+    if machine_dtype is not None:
+        data['Machine_Name'] = data['Machine_Name'].astype(machine_dtype)
+    return data
+
+
+@pytest.mark.parametrize("machine_dtype", [None, pd.CategoricalDtype(['AM321', 'AM322', 'AM323'])])
+def test_runs_line_up_with_heads(machine_dtype):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", FutureWarning)
+        heads = compress_identical_scans(_scans(machine_dtype), ['IO_0550'])
+
+    assert heads.index.tolist() == [0, 1, 4]
+    assert heads['Repeat_Count'].tolist() == [2, 2, 2]
+    assert heads['Run_Start'].tolist() == list(pd.to_datetime(
+        ['2025-11-27 10:00:00', '2025-11-27 10:00:00', '2025-11-27 10:00:02']))
+    assert heads['Run_End'].tolist() == list(pd.to_datetime(
+        ['2025-11-27 10:00:01', '2025-11-27 10:00:01', '2025-11-27 10:00:03']))
@@ -1,14 +1,19 @@
 
 
+import logging
 import pandas as pd
+from Tables_config_codes import read_csv_table, setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
 
 data_path1 = "2_postgres_DB/Vina_data/AM322_parsed_output.csv"
 data_path2 = "2_postgres_DB/Vina_data/AM323_parsed_output.csv"
 output_path = "2_postgres_DB/Combined_sorted_parsed_output.csv"
 
 # Read both CSV files
-df1 = pd.read_csv(data_path1)
-df2 = pd.read_csv(data_path2)
+df1 = read_csv_table(data_path1, dtype={'Timestamp': str})
+df2 = read_csv_table(data_path2, dtype={'Timestamp': str})
 
 # Concatenate the dataframes
 combined_df = pd.concat([df1, df2], ignore_index=True)
@@ -19,5 +24,5 @@ combined_df = combined_df.sort_values(by='Timestamp')
 # Save to output file
 combined_df.to_csv(output_path, index=False)
 
-print(f"Combined and sorted data saved to {output_path}")
-print(f"Total rows: {len(combined_df)}")
\ No newline at end of file
+logger.info("Combined and sorted data saved to %s", output_path)
+logger.info("Total rows: %d", len(combined_df))
\ No newline at end of file
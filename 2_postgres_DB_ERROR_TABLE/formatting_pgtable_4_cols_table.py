@@ -1,8 +1,14 @@
+import logging
 import pandas as pd
 from datetime import datetime
+from Tables_config_codes import EventLog, LazyHead, RunMetrics, read_csv_table, setup_logging
+
+logger = logging.getLogger(__name__)
 
 class TableFormatter:
-    def __init__(self, datapath: str, device_name: str = None, start_time: str = None, end_time: str = None):
+    def __init__(self, datapath: str, device_name: str = None, start_time: str = None, end_time: str = None,
+                 log_mode: str = "sampled", log_sample_every: int = 1000, profile_memory: bool = False,
+                 csv_engine: str = "auto"):
         self.filepath = datapath
         self.df = None
         self.device_name = device_name
@@ -11,22 +17,33 @@ class TableFormatter:
         self.to_ignore_columns = ['id', 'device_name', 'recorded_at']
         self.running_column = None
         self.parsed_data = []  # Store parsed records
+        # Stage timers and counters of the run (see export_metrics);
+        # profile_memory adds per-stage peak/retained memory and allocation sites
+        self.metrics = RunMetrics("table_formatter", profile_memory=profile_memory)
+        # Hot-path logging: "full", "sampled" or "summary" (see LOG_MODES)
+        self.run_log = EventLog(logger, mode=log_mode, sample_every=log_sample_every,
+                                counters=self.metrics.counters)
 
         try: 
-            self.df = pd.read_csv(self.filepath)
-            print("Original DataFrame:")
-            print(self.df.head())
-            print(f"\nOriginal shape: {self.df.shape}")
+            with self.metrics.stage("load"):
+                # recorded_at stays text so its +09:00 offset is kept for _filter_by_time
+                self.df = read_csv_table(self.filepath, dtype={'recorded_at': str}, engine=csv_engine)
+            self.metrics.count("rows_read", len(self.df))
+            logger.debug("Original DataFrame:\n%s", LazyHead(self.df))
+            logger.info("Original shape: %s", self.df.shape)
             
             # Process the data
             self._process_data()
             
         except FileNotFoundError:
-            print(f"File not found: {self.filepath}")
+            logger.error("File not found: %s", self.filepath)
             self.df = pd.DataFrame()
         except Exception as e:
-            print(f"An error occurred while reading the file: {e}")
+            logger.exception("An error occurred while reading the file: %s", e)
             self.df = pd.DataFrame()
+        finally:
+            # Stops tracemalloc / RSS sampling with profile_memory
+            self.metrics.close()
     
     def _process_data(self):
         """Process the dataframe according to filtering requirements"""
@@ -36,28 +53,29 @@ class TableFormatter:
         # Step 1: Find the 'running' column
         self.running_column = self._find_running_column()
         if self.running_column is None:
-            print("Warning: No 'running' column found")
+            logger.warning("No 'running' column found")
             return
         
-        print(f"\nFound running column: {self.running_column}")
-        
-        # Step 2: Filter rows where running == True
-        self.df = self.df[self.df[self.running_column] == True].copy()
-        print(f"After filtering running==True: {self.df.shape}")
+        logger.info("Found running column: %s", self.running_column)
         
-        # Step 3: Filter by time range if provided
-        if self.start_time or self.end_time:
-            self._filter_by_time()
-        
-        # Step 4: Drop ignored columns
-        self._drop_columns()
+        with self.metrics.stage("filter"):
+            # Step 2: Filter rows where running == True
+            self.df = self.df[self.df[self.running_column] == True].copy()
+            logger.info("After filtering running==True: %s", self.df.shape)
+            
+            # Step 3: Filter by time range if provided
+            if self.start_time or self.end_time:
+                self._filter_by_time()
+            
+            # Step 4: Drop ignored columns
+            self._drop_columns()
         
-        print("\nProcessed DataFrame:")
-        print(self.df.head())
-        print(f"Final shape: {self.df.shape}")
+        logger.debug("Processed DataFrame:\n%s", LazyHead(self.df))
+        logger.info("Final shape: %s", self.df.shape)
         
         # Step 5: Parse each column's values
-        self._parse_columns()
+        with self.metrics.stage("parse"):
+            self._parse_columns()
     
     def _find_running_column(self):
         """Find column name containing 'running' (case-insensitive)"""
@@ -85,7 +103,7 @@ class TableFormatter:
                 start_dt = start_dt.tz_convert(tz)
             
             self.df = self.df[self.df['recorded_at'] >= start_dt]
-            print(f"After filtering start_time >= {self.start_time}: {self.df.shape}")
+            logger.info("After filtering start_time >= %s: %s", self.start_time, self.df.shape)
         
         if self.end_time:
             # Convert end_time to datetime and localize to the same timezone
@@ -98,7 +116,7 @@ class TableFormatter:
                 end_dt = end_dt.tz_convert(tz)
             
             self.df = self.df[self.df['recorded_at'] <= end_dt]
-            print(f"After filtering end_time <= {self.end_time}: {self.df.shape}")
+            logger.info("After filtering end_time <= %s: %s", self.end_time, self.df.shape)
     
     def _drop_columns(self):
         """Drop ignored columns and running column"""
@@ -112,7 +130,7 @@ class TableFormatter:
         columns_to_drop = [col for col in columns_to_drop if col in self.df.columns]
         
         self.df = self.df.drop(columns=columns_to_drop)
-        print(f"Dropped columns: {columns_to_drop}")
+        logger.info("Dropped columns: %s", columns_to_drop)
     
     def _extract_reg_address(self, column_name):
         """
@@ -131,8 +149,8 @@ class TableFormatter:
     
     def _parse_columns(self):
         """Parse each column's values and create structured records"""
-        print("\n" + "="*80)
-        print("Parsing columns...")
+        logger.info("Parsing columns...")
+        self.metrics.count("cells_scanned", self.df.size)
         
         for index, row in self.df.iterrows():
             for column in self.df.columns:
@@ -159,33 +177,43 @@ class TableFormatter:
                         }
                         
                         self.parsed_data.append(record)
+                        self.run_log.event("records_parsed", "Parsed %s=%s at %s",
+                                           reg_address, value, timestamp)
         
-        print(f"Total records parsed: {len(self.parsed_data)}")
+        logger.info("Total records parsed: %d", len(self.parsed_data))
+        self.run_log.log_summary()
         
         # Create a new dataframe from parsed data
         if self.parsed_data:
             self.parsed_df = pd.DataFrame(self.parsed_data)
-            print("\nParsed DataFrame sample:")
-            print(self.parsed_df.head(10))
-            print(f"\nParsed DataFrame shape: {self.parsed_df.shape}")
+            logger.debug("Parsed DataFrame sample:\n%s", LazyHead(self.parsed_df, 10))
+            logger.info("Parsed DataFrame shape: %s", self.parsed_df.shape)
         else:
-            print("No data was parsed!")
+            logger.warning("No data was parsed!")
             self.parsed_df = pd.DataFrame()
     
     def save_to_csv(self, output_path: str):
         """Save the parsed dataframe to CSV file"""
         if hasattr(self, 'parsed_df') and not self.parsed_df.empty:
             try:
-                self.parsed_df.to_csv(output_path, index=False)
-                print(f"\n✓ Successfully saved to: {output_path}")
-                print(f"  Total records saved: {len(self.parsed_df)}")
+                with self.metrics.stage("export"):
+                    self.parsed_df.to_csv(output_path, index=False)
+                logger.info("✓ Successfully saved to: %s (%d records)", output_path, len(self.parsed_df))
             except Exception as e:
-                print(f"\n✗ Error saving to CSV: {e}")
+                logger.error("✗ Error saving to CSV: %s", e)
         else:
-            print("\n✗ No parsed data to save!")
+            logger.warning("✗ No parsed data to save!")
+
+    
+    def export_metrics(self, output_path: str):
+        """Export the run's stage timings and counters to JSON."""
+        self.metrics.close()
+        self.metrics.export_json(output_path)
+        logger.info("Run metrics exported to %s", output_path)
 
 
 if __name__ == "__main__":
+    setup_logging()
     data_path = "2_postgres_DB/Vina_data/AM322_postgres_old.csv"
     formatter = TableFormatter(
         datapath=data_path, 
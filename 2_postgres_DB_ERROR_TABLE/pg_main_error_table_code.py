@@ -1,17 +1,28 @@
-from Tables_config_codes import ERROR_TABLE, ERROR_PATTERN_TYPES, get_bit_number
+from Tables_config_codes import ERROR_TABLE, ERROR_PATTERN_TYPES, get_bit_number, EventLog, LazyHead, RunMetrics, read_csv_table, setup_logging
+import logging
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 
+logger = logging.getLogger(__name__)
+
 
 class CreateErrorTableCode:
     def __init__(self, machine_name_code=None, day_night="昼勤", 
-                 unit_code="10-1719", work_date=None, data_path=None):
+                 unit_code="10-1719", work_date=None, data_path=None,
+                 log_mode="sampled", log_sample_every=1000, profile_memory=False,
+                 csv_engine="auto"):
         self.day_night = day_night
         self.unit_code = unit_code
         self.machine_name_code = machine_name_code
         self.work_date = work_date  # Format: "YYYY/MM/DD"
         self.data = None
+        # Stage timers and counters of the run (see export_metrics);
+        # profile_memory adds per-stage peak/retained memory and allocation sites
+        self.metrics = RunMetrics("pg_error_table", profile_memory=profile_memory)
+        # Hot-path logging: "full", "sampled" or "summary" (see LOG_MODES)
+        self.run_log = EventLog(logger, mode=log_mode, sample_every=log_sample_every,
+                                counters=self.metrics.counters)
 
         # Initialize ERROR_TABLE
         self.ERROR_TABLE = ERROR_TABLE
@@ -25,24 +36,28 @@ class CreateErrorTableCode:
         self.output_rows = []
         
         if data_path is not None:
-            self.data = pd.read_csv(data_path, encoding="utf-8", dtype=str)
-            # Parse custom timestamp format: HH:MM:SS:mmm
-            time_parsed = pd.to_datetime(
-                self.data['Timestamp'].str.replace(':', '.', n=2),
-                format='%H.%M.%S:%f'
-            )
-            
-            # Combine with work_date if provided
-            if self.work_date:
-                date_obj = pd.to_datetime(self.work_date, format='%Y/%m/%d')
-                self.data['Timestamp'] = pd.to_datetime(
-                    date_obj.strftime('%Y-%m-%d') + ' ' + 
-                    time_parsed.dt.strftime('%H:%M:%S.%f')
+            with self.metrics.stage("load"):
+                self.data = read_csv_table(data_path, dtype=str, engine=csv_engine)
+            self.metrics.count("rows_read", len(self.data))
+
+            with self.metrics.stage("parse"):
+                # Parse custom timestamp format: HH:MM:SS:mmm
+                time_parsed = pd.to_datetime(
+                    self.data['Timestamp'].str.replace(':', '.', n=2),
+                    format='%H.%M.%S:%f'
                 )
-            else:
-                self.data['Timestamp'] = time_parsed
+                
+                # Combine with work_date if provided
+                if self.work_date:
+                    date_obj = pd.to_datetime(self.work_date, format='%Y/%m/%d')
+                    self.data['Timestamp'] = pd.to_datetime(
+                        date_obj.strftime('%Y-%m-%d') + ' ' + 
+                        time_parsed.dt.strftime('%H:%M:%S.%f')
+                    )
+                else:
+                    self.data['Timestamp'] = time_parsed
             
-            print(f"Data loaded: {len(self.data)} rows")
+            logger.info("Data loaded: %d rows", len(self.data))
     
     
     def extract_bit_value(self, register_value, bit_position: int) -> int:
@@ -87,6 +102,14 @@ class CreateErrorTableCode:
     def add_output_row(self, timestamp: datetime, machine_code: int, machine_name: str,
                        bit_number: int, error_type: str, number_status: str, duration: Optional[int]):
         """Add a row to output."""
+        with self.metrics.stage("enrichment"):
+            self._add_output_row(timestamp, machine_code, machine_name, bit_number,
+                                 error_type, number_status, duration)
+        self.metrics.count("events_emitted")
+
+
+    def _add_output_row(self, timestamp: datetime, machine_code: int, machine_name: str,
+                        bit_number: int, error_type: str, number_status: str, duration: Optional[int]):
         columns = self.error_column_names
         timestamp_str = timestamp.strftime("%Y/%m/%d %H:%M:%S")
         date_str = timestamp.date().strftime("%Y/%m/%d")
@@ -130,8 +153,10 @@ class CreateErrorTableCode:
                 # Convert "DM31651" to "D_31651" format
                 register_col = plc_address.replace("M", "_")  # DM31651 -> D_31651
 
-                # Debug print
-                print(f"Looking for: timestamp={timestamp}, machine={machine_name}, reg={register_col}")
+                # Debug print (sampled)
+                self.run_log.event(
+                    "register_lookups", "Looking for: timestamp=%s, machine=%s, reg=%s",
+                    timestamp, machine_name, register_col)
         
                 # Filter data to get the value
                 filtered = self.data.loc[
@@ -162,6 +187,7 @@ class CreateErrorTableCode:
         if machine_name not in self.active_errors:
             self.active_errors[machine_name] = {}
         
+        self.metrics.count("bits_evaluated", 16)
         found_errors = False
         for bit_position in range(16):
             bit_value = self.extract_bit_value(register_value, bit_position)
@@ -181,7 +207,8 @@ class CreateErrorTableCode:
             
             if bit_value == 1 and not is_active:
                 # ERROR STARTED
-                # print(f"[ERROR START] Bit {bit_number} ({error_type}) started at {timestamp}")
+                self.run_log.event("error_starts", "[ERROR START] Bit %d (%s) started at %s",
+                                   bit_number, error_type, timestamp)
                 self.active_errors[machine_name][bit_number] = {
                     'start_time': timestamp,
                     'error_type': error_type
@@ -207,7 +234,8 @@ class CreateErrorTableCode:
                 duration_sec = (timestamp - start_time).total_seconds()
                 duration_sec = round(duration_sec, 3)  # Round to 3 decimal places
                 
-                # print(f"[ERROR END] Bit {bit_number} ({error_type}) ended at {timestamp}, Duration: {duration_sec}s")
+                self.run_log.event("error_ends", "[ERROR END] Bit %d (%s) ended at %s, Duration: %ss",
+                                   bit_number, error_type, timestamp, duration_sec)
                 
                 self.add_output_row(
                     timestamp=timestamp,
@@ -239,52 +267,58 @@ class CreateErrorTableCode:
         if self.data is None:
             raise ValueError("No data loaded. Please provide data_path.")
         
-        # Reset tracking
-        self.active_errors = {}
-        self.output_rows = []
+        try:
+            # Reset tracking
+            self.active_errors = {}
+            self.output_rows = []
         
-        # DEBUG: Check data structure
-        print(f"Columns in data: {self.data.columns.tolist()}")
-        print(f"Sample data:\n{self.data.head(10)}")
-        print(f"Unique machines: {self.data['Machine_Name'].unique()}")
+            # DEBUG: Check data structure
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Columns in data: %s", self.data.columns.tolist())
+                logger.debug("Sample data:\n%s", LazyHead(self.data, 10))
+                logger.debug("Unique machines: %s", self.data['Machine_Name'].unique())
         
-        # Group data by timestamp and machine to reconstruct rows
-        grouped = self.data.groupby(['Timestamp', 'Machine_Name'])
+            # Group data by timestamp and machine to reconstruct rows
+            grouped = self.data.groupby(['Timestamp', 'Machine_Name'])
         
-        print(f"\nTotal timestamp-machine groups: {len(grouped)}")
+            logger.info("Total timestamp-machine groups: %d", len(grouped))
         
-        # Process each timestamp-machine combination
-        for (timestamp, machine_name), group in grouped:
-            
-            if machine_name not in self.machine_name_code:
-                continue
-            
-            # Convert group to a dictionary of register:value pairs
-            register_values = {}
-            for _, row in group.iterrows():
-                reg_col = row['reg_address']  # e.g., 'IO_0550'
-                register_values[reg_col] = row['value']
-            
-            # Get register ranges to monitor for this machine
-            register_ranges = self.get_register_range_for_machine(machine_name)
-            
-            # Check all registers in the monitoring range
-            registers_checked = 0
-            for start_reg, end_reg in register_ranges:
-                for register in range(start_reg, end_reg + 1):
-                    col_name = f"IO_{register:04d}"
-                    
-                    if col_name in register_values:
-                        registers_checked += 1
-                        register_value = register_values[col_name]
-                        self.process_register_bits(machine_name, register, 
-                                                   register_value, timestamp)
+            # Convert each group to a dictionary of register:value pairs
+            with self.metrics.stage("pivot"):
+                scans = [(timestamp, machine_name, dict(zip(group['reg_address'], group['value'])))
+                         for (timestamp, machine_name), group in grouped
+                         if machine_name in self.machine_name_code]
         
-        print(f"\nProcessed {len(grouped)} timestamp groups")
-        print(f"Registers checked: {registers_checked}")
-        print(f"Output rows generated: {len(self.output_rows)}")
+            # Process each timestamp-machine combination
+            # (enrichment is timed as a nested stage of edge_detection)
+            with self.metrics.stage("edge_detection"):
+                for timestamp, machine_name, register_values in scans:
+                
+                    # Get register ranges to monitor for this machine
+                    register_ranges = self.get_register_range_for_machine(machine_name)
+                
+                    # Check all registers in the monitoring range
+                    registers_checked = 0
+                    for start_reg, end_reg in register_ranges:
+                        for register in range(start_reg, end_reg + 1):
+                            col_name = f"IO_{register:04d}"
+                        
+                            if col_name in register_values:
+                                registers_checked += 1
+                                self.run_log.count("registers_scanned")
+                                register_value = register_values[col_name]
+                                self.process_register_bits(machine_name, register, 
+                                                           register_value, timestamp)
+        
+            logger.info("Processed %d timestamp groups", len(grouped))
+            logger.info("Registers checked: %d", registers_checked)
+            logger.info("Output rows generated: %d", len(self.output_rows))
+            self.run_log.log_summary()
         
-        return self.get_output_dataframe()
+            return self.get_output_dataframe()
+        finally:
+            # Stops tracemalloc / RSS sampling with profile_memory
+            self.metrics.close()
     
     
     def get_output_dataframe(self) -> pd.DataFrame:
@@ -299,10 +333,18 @@ class CreateErrorTableCode:
         """Export error log to CSV."""
         df = self.get_output_dataframe()
         if not df.empty:
-            df.to_csv(output_path, index=False, encoding='utf-8-sig')
-            print(f"✓ Error log exported to {output_path} ({len(df)} rows)")
+            with self.metrics.stage("export"):
+                df.to_csv(output_path, index=False, encoding='utf-8-sig')
+            logger.info("✓ Error log exported to %s (%d rows)", output_path, len(df))
         else:
-            print("⚠ No errors to export")
+            logger.warning("⚠ No errors to export")
+    
+    
+    def export_metrics(self, output_path: str):
+        """Export the run's stage timings and counters to JSON."""
+        self.metrics.close()
+        self.metrics.export_json(output_path)
+        logger.info("Run metrics exported to %s", output_path)
     
     
     def get_active_errors_summary(self, current_timestamp: datetime = None) -> Dict:
@@ -324,6 +366,7 @@ class CreateErrorTableCode:
 
 
 if __name__ == "__main__":
+    setup_logging()
     # Machine Configuration
     MACHINE_NAME_CODE = {
         "AM322": {"code": 1, "error_pattern": "pattern_1"}, 
@@ -343,12 +386,13 @@ if __name__ == "__main__":
     )
     
     # Process the data
-    print("Processing data...")
+    logger.info("Processing data...")
     output_df = tracker.process_data()
     
-    print(f"\n=== STATISTICS ===")
-    print(f"Total error events: {len(output_df)}")
-    print(f"Active errors (still ongoing): {sum(len(v) for v in tracker.active_errors.values())}")
+    logger.info("=== STATISTICS ===")
+    logger.info("Total error events: %d", len(output_df))
+    logger.info("Active errors (still ongoing): %d", sum(len(v) for v in tracker.active_errors.values()))
     
     # Export to CSV
-    tracker.export_to_csv("2_postgres_DB/d_error_output.csv")
\ No newline at end of file
+    tracker.export_to_csv("2_postgres_DB/d_error_output.csv")
+    tracker.export_metrics("2_postgres_DB/d_error_output_metrics.json")
\ No newline at end of file
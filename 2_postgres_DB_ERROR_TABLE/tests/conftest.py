@@ -0,0 +1,8 @@
+# Stage modules import each other (and their Tables_config_codes copy) by
+# plain name, as when the scripts are run from the stage directory
+import os
+import sys
+
+STAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if STAGE_DIR not in sys.path:
+    sys.path.insert(0, STAGE_DIR)
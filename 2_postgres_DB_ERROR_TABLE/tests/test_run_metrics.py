@@ -0,0 +1,36 @@
+import tracemalloc
+from formatting_pgtable_4_cols_table import TableFormatter
+from pg_main_error_table_code import CreateErrorTableCode
+
+MACHINE_NAME_CODE = {"AM322": {"code": 1, "error_pattern": "pattern_1"}}
+
+
+def test_process_data_stops_memory_profiling(tmp_path):
+    data_path = tmp_path / "AM322_parsed_output.csv"
+    data_path.write_text("Timestamp,Machine_Name,reg_address,value\n"
+                         "14:15:14:557,AM322,IO_0550,0001\n"
+                         "14:15:16:557,AM322,IO_0550,0000\n")
+    tracker = CreateErrorTableCode(machine_name_code=MACHINE_NAME_CODE, log_mode="summary", profile_memory=True,
+                                   data_path=str(data_path))
+    tracker.process_data()
+
+    assert not tracemalloc.is_tracing()
+    assert tracker.metrics.memory._sampler is None
+
+
+def test_table_formatter_stops_memory_profiling(tmp_path):
+    data_path = tmp_path / "AM322_postgres.csv"
+    data_path.write_text("id,device_name,recorded_at,running,IO_0550\n"
+                         "1,AM322,2025-11-27 14:00:00+09:00,True,0001\n"
+                         "2,AM322,2025-11-27 14:00:01+09:00,False,0000\n")
+    formatter = TableFormatter(str(data_path), device_name="AM322", profile_memory=True)
+
+    assert not tracemalloc.is_tracing()
+    assert formatter.metrics.memory._sampler is None
+    assert 'filter' in formatter.metrics.to_dict()['memory']
+
+
+def test_missing_file_stops_memory_profiling(tmp_path):
+    formatter = TableFormatter(str(tmp_path / "missing.csv"), profile_memory=True)
+    assert formatter.df.empty
+    assert not tracemalloc.is_tracing()
@@ -16,12 +16,37 @@ class PLCDataConverter:
     - REAL32: 32-bit IEEE 754 float (2 words)
     - REAL64: 64-bit IEEE 754 double (4 words)
     - BOOL: Single bit extraction
+
+    Pass a RunMetrics instance (Tables_config_codes) as `metrics` to time
+    convert() calls and count converted values / decoded words.
     """
     
-    def __init__(self):
+    def __init__(self, metrics=None):
         """Initialize the converter"""
-        pass
-    
+        self.metrics = metrics
+
+    def words_from_bytes(self, data):
+        """
+        Split raw FINS response data into 16-bit hex words.
+
+        Args:
+            data: bytes of a memory area read (big-endian words, 2 bytes each)
+
+        Returns:
+            List of 4-digit uppercase hex strings like ["1234", "00FF"]
+
+        Examples:
+            >>> converter.words_from_bytes(bytes.fromhex("123400FF"))
+            ['1234', '00FF']
+        """
+        if len(data) % 2:
+            raise ValueError(f"Word data must have an even number of bytes, got {len(data)}")
+
+        hex_data = bytes(data).hex().upper()
+        if self.metrics is not None:
+            self.metrics.count("words_received", len(data) // 2)
+        return [hex_data[i:i + 4] for i in range(0, len(hex_data), 4)]
+
     def _apply_swaps(self, data_array, word_swap=False, byte_swap=False):
         """
         Apply word and/or byte swapping to the data array.
@@ -284,6 +309,18 @@ class PLCDataConverter:
             >>> converter.convert(["0042"], "REAL16", scale_factor=10)
             6.6
         """
+        if self.metrics is None:
+            return self._convert(data_array, data_type, start_index, word_swap, byte_swap,
+                                 bit_position, scale_factor)
+
+        with self.metrics.stage("convert"):
+            value = self._convert(data_array, data_type, start_index, word_swap, byte_swap,
+                                  bit_position, scale_factor)
+        self.metrics.count("values_converted")
+        return value
+    
+    def _convert(self, data_array, data_type, start_index, word_swap, byte_swap, bit_position, scale_factor):
+        """convert() without instrumentation."""
         # Normalize type to uppercase
         data_type = data_type.upper()
         
@@ -301,6 +338,8 @@ class PLCDataConverter:
         
         # Special handling for BOOL
         if data_type == 'BOOL':
+            if self.metrics is not None:
+                self.metrics.count("bits_evaluated")
             if bit_position is None:
                 raise ValueError("BOOL type requires bit_position parameter")
             if start_index >= len(data_array):
@@ -317,6 +356,8 @@ class PLCDataConverter:
             
             # Apply swaps to the single word
             words = self._apply_swaps([data_array[start_index]], word_swap, byte_swap)
+            if self.metrics is not None:
+                self.metrics.count("words_decoded")
             return self.to_real16(words, scale_factor)
         
         # Validate type
@@ -335,6 +376,8 @@ class PLCDataConverter:
         
         # Apply swaps
         words = self._apply_swaps(words, word_swap, byte_swap)
+        if self.metrics is not None:
+            self.metrics.count("words_decoded", word_count)
         
         # Convert based on word count
         if word_count == 1:
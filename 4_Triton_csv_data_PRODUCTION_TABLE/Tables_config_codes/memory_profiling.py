@@ -0,0 +1,167 @@
+import sysconfig
+import threading
+import tracemalloc
+from typing import Any, Dict, List
+
+try:
+    import psutil
+except ImportError:  # RSS sampling is skipped without psutil
+    psutil = None
+
+# Frames of the profiler itself are left out of the allocation sites
+_IGNORED_FILES = (tracemalloc.__file__, threading.__file__, "<frozen importlib._bootstrap>",
+                  "<frozen importlib._bootstrap_external>")
+# Allocation sites are reported at the innermost frame outside these paths
+_LIBRARY_PATHS = (sysconfig.get_paths()["stdlib"], sysconfig.get_paths()["purelib"],
+                  sysconfig.get_paths()["platlib"], "<frozen ")
+
+
+def _caller_site(traceback) -> str:
+    """Innermost 'file:line' of the traceback that belongs to our own code."""
+    frames = list(traceback)  # oldest -> most recent
+    for frame in reversed(frames):
+        if not frame.filename.startswith(_LIBRARY_PATHS):
+            return f"{frame.filename}:{frame.lineno}"
+    return f"{frames[-1].filename}:{frames[-1].lineno}"
+
+
+class _StageFrame:
+    """Memory figures of one open stage."""
+
+    def __init__(self, name: str, traced_start: int, rss_start):
+        self.name = name
+        self.traced_start = traced_start
+        self.traced_peak = traced_start
+        self.rss_start = rss_start
+        self.rss_peak = rss_start
+        self.snapshot = None
+
+
+class StageMemoryProfiler:
+    """
+    Peak / retained memory per pipeline stage.
+
+    Python allocations are traced with tracemalloc: for every stage call the
+    peak traced size and the size still allocated at the end (retained) are
+    recorded, and for the first `snapshot_calls` calls of each stage two
+    snapshots are compared to find the top allocation sites (attributed to
+    the innermost line of our own code, not to pandas/numpy). Process RSS is
+    sampled every `rss_interval` seconds by a background thread (needs psutil)
+    to catch spikes from numpy/pandas buffers tracemalloc does not see.
+
+    Nested stages are supported; the peak of an outer stage includes its
+    inner stages. Tracing and sampling run from the first stage until
+    stop(). Used through RunMetrics(profile_memory=True).
+
+    Tracing cost grows with `nframes`; nframes=1 is several times cheaper
+    but reports the pandas/numpy line that allocated instead of our caller.
+    """
+
+    def __init__(self, top_n: int = 10, snapshot_calls: int = 3, rss_interval: float = 0.05,
+                 nframes: int = 10):
+        self.top_n = top_n
+        self.snapshot_calls = snapshot_calls
+        self.rss_interval = rss_interval
+        self.nframes = nframes
+        # {stage: {'calls', 'peak_bytes', 'retained_bytes', 'rss_peak_bytes', ...}}
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        # {stage: {site: [size_diff, count_diff]}}
+        self.sites: Dict[str, Dict[str, list]] = {}
+        self._stack: List[_StageFrame] = []
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop = threading.Event()
+        self._process = psutil.Process() if psutil is not None else None
+        self._started_tracing = False
+
+    def _rss(self):
+        return self._process.memory_info().rss if self._process is not None else None
+
+    def _sample_rss(self):
+        while not self._stop.wait(self.rss_interval):
+            rss = self._rss()
+            with self._lock:
+                for frame in self._stack:
+                    frame.rss_peak = max(frame.rss_peak, rss)
+
+    def begin(self, name: str):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.nframes)
+            self._started_tracing = True
+
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = None
+        if self.top_n and self.stages.get(name, {}).get('calls', 0) < self.snapshot_calls:
+            snapshot = tracemalloc.take_snapshot()
+        frame = _StageFrame(name, tracemalloc.get_traced_memory()[0], self._rss())
+        frame.snapshot = snapshot
+
+        with self._lock:
+            if self._stack:
+                # The peak counter is reset for the new stage: keep what the
+                # enclosing stage has reached so far
+                self._stack[-1].traced_peak = max(self._stack[-1].traced_peak, peak)
+            self._stack.append(frame)
+        tracemalloc.reset_peak()
+
+        if self._process is not None and self._sampler is None:
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample_rss, name="rss-sampler", daemon=True)
+            self._sampler.start()
+
+    def end(self):
+        current, peak = tracemalloc.get_traced_memory()
+        rss = self._rss()
+        with self._lock:
+            frame = self._stack.pop()
+            if self._stack:
+                self._stack[-1].rss_peak = max(self._stack[-1].rss_peak, frame.rss_peak)
+        frame.traced_peak = max(frame.traced_peak, peak)
+
+        stats = self.stages.setdefault(frame.name, {
+            'calls': 0, 'peak_bytes': 0, 'retained_bytes': 0,
+            'rss_start_bytes': frame.rss_start, 'rss_peak_bytes': frame.rss_start, 'rss_end_bytes': None,
+        })
+        stats['calls'] += 1
+        stats['peak_bytes'] = max(stats['peak_bytes'], frame.traced_peak - frame.traced_start)
+        stats['retained_bytes'] += current - frame.traced_start
+        if rss is not None:
+            stats['rss_peak_bytes'] = max(stats['rss_peak_bytes'], frame.rss_peak, rss)
+            stats['rss_end_bytes'] = rss
+
+        if frame.snapshot is not None:
+            self._add_sites(frame.name, frame.snapshot)
+
+    def _add_sites(self, name: str, before):
+        ignore = [tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES]
+        after = tracemalloc.take_snapshot().filter_traces(ignore)
+        sites = self.sites.setdefault(name, {})
+        for diff in after.compare_to(before.filter_traces(ignore), 'traceback'):
+            if diff.size_diff == 0:
+                continue
+            totals = sites.setdefault(_caller_site(diff.traceback), [0, 0])
+            totals[0] += diff.size_diff
+            totals[1] += diff.count_diff
+
+    def _stop_sampler(self):
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+
+    def stop(self):
+        """Stop RSS sampling and tracemalloc (if this profiler started it)."""
+        self._stop_sampler()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        report = {}
+        for name, stats in self.stages.items():
+            sites = sorted(self.sites.get(name, {}).items(), key=lambda kv: -abs(kv[1][0]))
+            report[name] = dict(stats, top_allocations=[
+                {'site': site, 'size_diff_bytes': size, 'count_diff': count}
+                for site, (size, count) in sites[:self.top_n]
+            ])
+        return report
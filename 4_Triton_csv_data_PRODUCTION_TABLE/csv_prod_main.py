@@ -1,7 +1,10 @@
-from Tables_config_codes import PRODUCTION_INFO_TABLE, get_bit_number
+from Tables_config_codes import PRODUCTION_INFO_TABLE, get_bit_number, RunMetrics, read_csv_table, setup_logging
+import logging
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
+
+logger = logging.getLogger(__name__)
 # some of the predefined data 
 
 
@@ -9,12 +12,15 @@ from typing import Dict, List, Tuple, Optional
 
 class CreateErrorTableCode:
     def __init__(self, machine_name_code=None, day_night="昼勤", 
-                 unit_code="10-1719", data_path=None):
+                 unit_code="10-1719", data_path=None, profile_memory=False, csv_engine="auto"):
         self.day_night = day_night
         self.unit_code = unit_code
         self.machine_name_code = machine_name_code
         self.working_mode = {"502.12": "自動", "502.13": "手動", "502.14": "払出"}
         self.data = None
+        # Stage timers and counters of the run (see export_metrics);
+        # profile_memory adds per-stage peak/retained memory and allocation sites
+        self.metrics = RunMetrics("production_table", profile_memory=profile_memory)
 
         # Initilaize ERROR_TABLE
         self.PRODUCTION_TABLE = PRODUCTION_INFO_TABLE
@@ -28,8 +34,11 @@ class CreateErrorTableCode:
         self.output_rows = []
         
         if data_path is not None:
-            self.data = pd.read_csv(data_path, encoding="utf-8", dtype=str)
-            print()
+            with self.metrics.stage("load"):
+                self.data = read_csv_table(data_path, dtype=str, timestamp_columns=['Timestamp'],
+                                           engine=csv_engine)
+            self.metrics.count("rows_read", len(self.data))
+            logger.info("Data loaded: %d rows from %s", len(self.data), data_path)
     
     
     def extract_bit_value(self, register_value, bit_position: int) -> int:
@@ -82,7 +91,7 @@ class CreateErrorTableCode:
             date = dt_object.date().strftime("%Y/%m/%d")
             row[columns[1]] = date
         except Exception as e :
-            print("Error parsing timestamp:", timestamp, e)
+            logger.warning("Error parsing timestamp %s: %s", timestamp, e)
         
 
         # column 2 - 昼夜勤
@@ -265,35 +274,42 @@ class CreateErrorTableCode:
         if self.data is None:
             raise ValueError("No data loaded. Please provide data_path.")
         
-        # Reset tracking
-        self.active_errors = {}
-        self.output_rows = []
+        try:
+            # Reset tracking
+            self.active_errors = {}
+            self.output_rows = []
         
-        # Convert Timestamp column to datetime
-        self.data['Timestamp'] = pd.to_datetime(self.data['Timestamp'])
+            # Convert Timestamp column to datetime
+            with self.metrics.stage("parse"):
+                self.data['Timestamp'] = pd.to_datetime(self.data['Timestamp'])
         
-        # Process each row (each cycle)
-        for idx, row in self.data.iterrows():
-            timestamp = row['Timestamp']
-            machine_name = row['Machine_Name']
-            
-            if machine_name not in self.machine_name_code:
-                continue  # Skip unknown machines
-            
-            # Get register ranges to monitor for this machine
-            register_ranges = self.get_register_range_for_machine(machine_name)
-            # print("register_ranges:", register_ranges)
-            # Check all registers in the monitoring range
-            for start_reg, end_reg in register_ranges:
-                for register in range(start_reg, end_reg + 1):
-                    col_name = f"IO_{register:04d}"  # Format: IO_0550
-                    
-                    if col_name in row:
-                        register_value = row[col_name]
-                        self.process_register_bits(machine_name, register, 
-                                                   register_value, timestamp)
+            # Process each row (each cycle)
+            with self.metrics.stage("edge_detection"):
+                for idx, row in self.data.iterrows():
+                    timestamp = row['Timestamp']
+                    machine_name = row['Machine_Name']
+                
+                    if machine_name not in self.machine_name_code:
+                        continue  # Skip unknown machines
+                
+                    # Get register ranges to monitor for this machine
+                    register_ranges = self.get_register_range_for_machine(machine_name)
+                    # print("register_ranges:", register_ranges)
+                    # Check all registers in the monitoring range
+                    for start_reg, end_reg in register_ranges:
+                        for register in range(start_reg, end_reg + 1):
+                            col_name = f"IO_{register:04d}"  # Format: IO_0550
+                        
+                            if col_name in row:
+                                self.metrics.count("registers_scanned")
+                                register_value = row[col_name]
+                                self.process_register_bits(machine_name, register, 
+                                                           register_value, timestamp)
         
-        return self.get_output_dataframe()
+            return self.get_output_dataframe()
+        finally:
+            # Stops tracemalloc / RSS sampling with profile_memory
+            self.metrics.close()
     
     
     def get_output_dataframe(self) -> pd.DataFrame:
@@ -311,10 +327,18 @@ class CreateErrorTableCode:
         """Export error log to CSV."""
         df = self.get_output_dataframe()
         if not df.empty:
-            df.to_csv(output_path, index=False, encoding='utf-8-sig')
-            print(f"Error log exported to {output_path} ({len(df)} rows)")
+            with self.metrics.stage("export"):
+                df.to_csv(output_path, index=False, encoding='utf-8-sig')
+            logger.info("Error log exported to %s (%d rows)", output_path, len(df))
         else:
-            print("No errors to export")
+            logger.warning("No errors to export")
+    
+    
+    def export_metrics(self, output_path: str):
+        """Export the run's stage timings and counters to JSON."""
+        self.metrics.close()
+        self.metrics.export_json(output_path)
+        logger.info("Run metrics exported to %s", output_path)
     
     
     def get_active_errors_summary(self, current_timestamp: datetime = None) -> Dict:
@@ -340,7 +364,8 @@ class CreateErrorTableCode:
 
 
 if __name__ == "__main__":
-        # Machine Configuration
+    setup_logging()
+    # Machine Configuration
     MACHINE_NAME_CODE = {
         "AM322": {"code": 1, }, 
         "AM323": {"code": 2, }
@@ -355,7 +380,7 @@ if __name__ == "__main__":
     )
     
     # Process the data
-    print("Processing data...")
+    logger.info("Processing data...")
     output_df = tracker.process_data()
     
     # # Display results
@@ -0,0 +1,18 @@
+import tracemalloc
+import pandas as pd
+import pytest
+from csv_prod_main import CreateErrorTableCode
+
+MACHINE_NAME_CODE = {"AM322": {"code": 1, "error_pattern": "pattern_1"}}
+
+
+def test_failed_process_data_stops_memory_profiling():
+    tracker = CreateErrorTableCode(machine_name_code=MACHINE_NAME_CODE, profile_memory=True)
+    tracker.data = pd.DataFrame({'Timestamp': ["2025-11-27 10:00:00", "not a time"],
+                                 'Machine_Name': "AM322", 'IO_0510': "0000"})
+    with pytest.raises(ValueError):
+        tracker.process_data()
+
+    assert not tracemalloc.is_tracing()
+    assert tracker.metrics.memory._sampler is None
+    assert tracker.metrics.to_dict()['memory']['parse']['calls'] == 1
@@ -0,0 +1 @@
+ACTUAL_TABLE = {}
\ No newline at end of file
@@ -0,0 +1 @@
+QTY_TABLE = {}
\ No newline at end of file
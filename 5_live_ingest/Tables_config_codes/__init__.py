@@ -0,0 +1,69 @@
+# config/__init__.py
+
+from .ACTUAL_TABLE import ACTUAL_TABLE
+from .ERROR_TABLE import ERROR_TABLE
+from .PRODUCTION_INFO_TABLE import PRODUCTION_INFO_TABLE    
+from .QTY_TABLE import QTY_TABLE
+from .config_helpers import (
+    get_table_config,
+    get_column_names,
+    ALL_TABLES
+)
+
+#----error code calculation module imports----
+from .error_code_calculations import (
+    ERROR_PATTERN_TYPES,
+    get_bit_number,
+    get_register_and_bit,
+    get_register_range,
+    get_bit_range,
+    generate_full_mapping,
+    get_all_patterns,
+    get_pattern_types,
+    validate_register_access,
+)
+
+#----logging helpers----
+from .logging_helpers import (
+    LOG_MODES,
+    EventLog,
+    LazyHead,
+    setup_logging,
+)
+
+#----run instrumentation----
+from .instrumentation import RunMetrics
+
+#----csv reader----
+from .csv_reader import (
+    CSV_ENGINES,
+    read_csv_table,
+)
+
+
+__all__ = [
+    'get_table_config',
+    'get_column_names',
+    'ALL_TABLES',
+    'ACTUAL_TABLE',
+    'ERROR_TABLE',
+    'PRODUCTION_INFO_TABLE',
+    'QTY_TABLE',
+    'ERROR_PATTERN_TYPES',
+    'get_bit_number',
+    'get_register_and_bit',
+    'get_register_range',
+    'get_bit_range',
+    'generate_full_mapping',
+    'get_all_patterns',
+    'get_pattern_types',
+    'validate_register_access',
+    'LOG_MODES',
+    'EventLog',
+    'LazyHead',
+    'setup_logging',
+    'RunMetrics',
+    'CSV_ENGINES',
+    'read_csv_table',
+]
+
@@ -0,0 +1,66 @@
+import logging
+from collections import Counter
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# full:    every hot-path event is logged at DEBUG
+# sampled: every `sample_every`-th occurrence of each event is logged at DEBUG
+# summary: hot-path events are only counted; see EventLog.log_summary()
+LOG_MODES = ("full", "sampled", "summary")
+
+
+def setup_logging(level=logging.INFO):
+    """Configure the root logger for command-line runs of the scripts."""
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+
+
+class LazyHead:
+    """Defer DataFrame.head() formatting until a log record is actually emitted."""
+
+    def __init__(self, df, n: int = 5):
+        self.df = df
+        self.n = n
+
+    def __str__(self):
+        return str(self.df.head(self.n))
+
+
+class EventLog:
+    """
+    Logger wrapper for hot loops: counts every event and logs it according
+    to the mode (see LOG_MODES). Messages use %-style arguments, so nothing
+    is formatted unless DEBUG is enabled and the event is sampled.
+
+    Pass `counters` (e.g. RunMetrics.counters) to share the counts with
+    the run's metrics export.
+    """
+
+    def __init__(self, logger: logging.Logger, mode: str = "sampled", sample_every: int = 1000,
+                 counters: Counter = None):
+        if mode not in LOG_MODES:
+            raise ValueError(f"Log mode '{mode}' not supported. Use one of {LOG_MODES}")
+        self.logger = logger
+        self.mode = mode
+        self.sample_every = max(int(sample_every), 1)
+        self.counters = counters if counters is not None else Counter()
+
+    def event(self, name: str, msg: str, *args):
+        """Count one occurrence of `name` and log it at DEBUG if selected."""
+        self.counters[name] += 1
+        if self.mode == "summary" or not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        if self.mode == "full" or (self.counters[name] - 1) % self.sample_every == 0:
+            self.logger.debug(msg, *args)
+
+    def count(self, name: str, n: int = 1):
+        """Count without logging."""
+        self.counters[name] += n
+
+    def reset(self):
+        self.counters.clear()
+
+    def log_summary(self, level: int = logging.INFO):
+        """Log the aggregated counters of the run."""
+        if self.counters:
+            self.logger.log(level, "Summary: %s",
+                            ", ".join(f"{name}={count}" for name, count in sorted(self.counters.items())))
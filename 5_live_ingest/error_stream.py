@@ -0,0 +1,223 @@
+import stage_paths  # noqa: F401  (sibling stages on sys.path)
+from Tables_config_codes import setup_logging
+import asyncio
+import logging
+import time
+import numpy as np
+import pandas as pd
+from collections import Counter, deque
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from main_error_table_code import CreateErrorTableCode
+from error_events import ON_STATUS
+from fins_client import register_column
+
+logger = logging.getLogger(__name__)
+
+
+class ErrorEvent(NamedTuple):
+    """One error start or end, the EVENT_COLUMNS fields plus its dispatch latency."""
+    timestamp: datetime      # scan timestamp
+    machine_name: str
+    bit_number: int
+    error_type: str
+    number_status: str       # ON_STATUS or OFF_STATUS
+    duration: int            # seconds, 0 for a start
+    latency: float           # seconds from the scan timestamp to dispatch
+
+    @property
+    def is_start(self) -> bool:
+        return self.number_status == ON_STATUS
+
+
+def frame_words(tracker: CreateErrorTableCode, machine_name: str,
+                registers: Dict[str, str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Error words of a register frame as (rows of the machine's ErrorBitLayout, uint16 words)."""
+    layout = tracker.get_bit_layout(machine_name)
+    indices, words = [], []
+    for i, register in enumerate(layout.registers):
+        word = registers.get(register_column("IO", register))
+        if word is not None:
+            indices.append(i)
+            words.append(tracker.parse_register_value(word))
+    return np.array(indices, dtype=np.int64), np.array(words, dtype=np.uint16)
+
+
+class ErrorTracker:
+    """
+    Streaming error start/end detection on live register frames.
+
+    feed() takes the same (machine_name, timestamp, registers) frames as the
+    scan loops, runs them through CreateErrorTableCode.process_words() and
+    hands the resulting events to every callback and queue before it
+    returns, so an alarm goes out in the scan it was read in instead of
+    after process_data() has gone over the whole file.
+
+    Latency of each event is measured from the scan timestamp (taken before
+    the PLC read) to dispatch; latency_summary() reports it together with
+    the time spent in feed() itself.
+
+    Events are not debounced: debouncing needs the matching end, which an
+    alarm cannot wait for. With keep_events the raw events also stay in
+    tracker.error_events, and feed() hands the latest register words of
+    each scan with events to tracker.add_scan_context(), so
+    tracker.flush_error_events(final=False) builds the (debounced) error
+    table rows without a loaded data file.
+
+    Example:
+        >>> errors = ErrorTracker(MACHINE_NAME_CODE)
+        >>> errors.add_callback(lambda event: print(event))
+        >>> alarms = errors.queue()
+        >>> await scan_loop(client, "AM323", blocks, errors.feed)
+    """
+
+    def __init__(self, machine_name_code: Dict, tracker: Optional[CreateErrorTableCode] = None,
+                 keep_events: bool = False, latency_samples: int = 10000):
+        self.tracker = tracker or CreateErrorTableCode(machine_name_code=machine_name_code, log_mode="summary")
+        self.keep_events = keep_events
+        # Latest register words per machine (frames may be partial), kept with keep_events
+        self.words: Dict[str, Dict[str, str]] = {}
+        self.callbacks: List[Callable[[ErrorEvent], None]] = []
+        self.queues: List[asyncio.Queue] = []
+        # frames, starts, ends, callback_errors, events_dropped
+        self.stats = Counter()
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.feed_time_total = 0.0
+        self.feed_time_max = 0.0
+        # Recent event latencies for percentiles
+        self.latencies = deque(maxlen=latency_samples)
+
+    def add_callback(self, callback: Callable[[ErrorEvent], None]):
+        """Call callback(event) for every event; coroutine functions are scheduled as tasks."""
+        self.callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[ErrorEvent], None]):
+        self.callbacks.remove(callback)
+
+    def queue(self, maxsize: int = 0) -> asyncio.Queue:
+        """
+        New asyncio.Queue receiving every event. When a bounded queue is
+        full the oldest event is dropped, so a slow consumer never holds up
+        the scan and always gets the latest alarms.
+        """
+        events = asyncio.Queue(maxsize)
+        self.queues.append(events)
+        return events
+
+    def remove_queue(self, events: asyncio.Queue):
+        self.queues.remove(events)
+
+    def feed(self, machine_name: str, timestamp: datetime, registers: Dict[str, str]) -> List[ErrorEvent]:
+        """Process one register frame and dispatch its error starts/ends; returns the events."""
+        if machine_name not in self.tracker.machine_name_code:
+            return []
+        if self.keep_events:
+            latest = self.words.setdefault(machine_name, {})
+            latest.update(registers)
+        indices, words = frame_words(self.tracker, machine_name, registers)
+        events = self.feed_words(machine_name, timestamp, indices, words)
+        if events and self.keep_events:
+            # Operation mode / DM words for the error table rows built at flush time
+            self.tracker.add_scan_context(machine_name, timestamp, dict(latest))
+        return events
+
+    def feed_words(self, machine_name: str, timestamp: datetime, indices: np.ndarray,
+                   words: np.ndarray) -> List[ErrorEvent]:
+        """feed() for error words already decoded with frame_words()."""
+        started = time.perf_counter()
+        self.stats["frames"] += 1
+        if not len(indices):
+            return []
+
+        queued = len(self.tracker.error_events)
+        self.tracker.process_words(machine_name, indices, words, timestamp)
+        raw_events = self.tracker.error_events[queued:]
+        if not self.keep_events:
+            del self.tracker.error_events[queued:]
+        if not raw_events:
+            self._time_feed(started)
+            return []
+
+        latency = max(0.0, time.time() - timestamp.timestamp())
+        events = [ErrorEvent(*event, latency) for event in raw_events]
+        for event in events:
+            self.stats["starts" if event.is_start else "ends"] += 1
+            self._dispatch(event)
+        self.latency_total += latency * len(events)
+        self.latency_max = max(self.latency_max, latency)
+        self.latencies.extend([latency] * len(events))
+        self._time_feed(started)
+        return events
+
+    def _time_feed(self, started: float):
+        elapsed = time.perf_counter() - started
+        self.feed_time_total += elapsed
+        self.feed_time_max = max(self.feed_time_max, elapsed)
+
+    def _dispatch(self, event: ErrorEvent):
+        for callback in self.callbacks:
+            try:
+                result = callback(event)
+                if asyncio.iscoroutine(result):
+                    asyncio.ensure_future(result)
+            except Exception:
+                # A broken consumer must not stop error detection
+                self.stats["callback_errors"] += 1
+                logger.exception("Error event callback %r failed", callback)
+        for events in self.queues:
+            if events.full():
+                events.get_nowait()
+                self.stats["events_dropped"] += 1
+            events.put_nowait(event)
+
+    def active_errors(self, machine_name: str) -> Dict[int, Tuple[str, datetime]]:
+        """Currently active errors of a machine, {bit number: (error type, start time)}."""
+        layout = self.tracker.get_bit_layout(machine_name)
+        state = self.tracker.get_machine_state(machine_name)
+        return {int(bit): (layout.error_types[int(state.error_types[bit])],
+                           pd.Timestamp(state.start_times[bit]).to_pydatetime())
+                for bit in np.flatnonzero(state.active)}
+
+    def latency_summary(self) -> Dict[str, float]:
+        """Event latency (scan timestamp -> dispatch) and feed() time, in seconds."""
+        events = self.stats["starts"] + self.stats["ends"]
+        frames = self.stats["frames"]
+        recent = np.array(self.latencies) if self.latencies else np.zeros(1)
+        return {
+            'events': events,
+            'mean_latency': self.latency_total / events if events else 0.0,
+            'p99_latency': float(np.percentile(recent, 99)),
+            'max_latency': self.latency_max,
+            'mean_feed_time': self.feed_time_total / frames if frames else 0.0,
+            'max_feed_time': self.feed_time_max,
+        }
+
+
+async def _main():
+    from fins_client import FinsUdpClient, scan_loop
+    from fins_simulator import SyntheticToggles, serve_plcs
+    from read_planner import plan_table_reads
+
+    machine_name_code = {"AM322": {"code": 1, "error_pattern": "pattern_1"}}
+    simulators = await serve_plcs([SyntheticToggles(toggle_probability=0.002, seed=0)], base_port=19600,
+                                  scan_interval=0.05)
+    client = FinsUdpClient("127.0.0.1", 19600)
+    await client.connect()
+
+    errors = ErrorTracker(machine_name_code)
+    errors.add_callback(lambda event: logger.info("%s bit %d %s (%.1f ms)", event.machine_name, event.bit_number,
+                                                  event.number_status, event.latency * 1000))
+    try:
+        await scan_loop(client, "AM322", plan_table_reads(patterns=["pattern_1"]), errors.feed,
+                        interval=0.1, cycles=50)
+    finally:
+        client.close()
+        for simulator in simulators:
+            simulator.stop()
+    logger.info("Latency: %s", errors.latency_summary())
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(_main())
@@ -0,0 +1,79 @@
+from Tables_config_codes import setup_logging
+import asyncio
+import logging
+import time
+import numpy as np
+from typing import Dict, List
+from fins_client import FinsUdpClient, ReadBlock
+from fins_simulator import SyntheticToggles, serve_plcs
+
+logger = logging.getLogger(__name__)
+
+# One error-table scan: mode/error words and the DM counters
+DEFAULT_BLOCKS: List[ReadBlock] = [("IO", 500, 100), ("DM", 31600, 300)]
+
+
+async def run_benchmark(plc_count: int = 4, blocks: List[ReadBlock] = DEFAULT_BLOCKS,
+                        duration: float = 5.0, max_outstanding: int = 8, scans_in_flight: int = 4,
+                        latency: float = 0.0, jitter: float = 0.0, loss: float = 0.0,
+                        timeout: float = 0.5, base_port: int = 19600) -> Dict:
+    """
+    Scan `plc_count` local simulators as fast as possible for `duration` seconds.
+
+    Every PLC runs `scans_in_flight` scan loops on one client, so its reads
+    overlap up to max_outstanding. Returns scans/s, requests/s and scan
+    latency percentiles (ms) measured on the client side.
+    """
+    simulators = await serve_plcs([SyntheticToggles(seed=i) for i in range(plc_count)], base_port=base_port,
+                                  latency=latency, jitter=jitter, loss=loss)
+    clients = []
+    for i in range(plc_count):
+        client = FinsUdpClient("127.0.0.1", base_port + i, timeout=timeout, max_outstanding=max_outstanding)
+        await client.connect()
+        clients.append(client)
+
+    latencies = []
+    failures = 0
+    deadline = time.perf_counter() + duration
+
+    async def scan(client: FinsUdpClient):
+        nonlocal failures
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                await client.read_registers(blocks)
+            except TimeoutError:
+                failures += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(scan(client) for client in clients for _ in range(scans_in_flight)))
+    finally:
+        elapsed = time.perf_counter() - started
+        for client in clients:
+            client.close()
+        for simulator in simulators:
+            simulator.stop()
+
+    requests = sum(client.stats["requests"] for client in clients)
+    scan_ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        'plcs': plc_count,
+        'seconds': elapsed,
+        'scans_per_second': len(latencies) / elapsed,
+        'requests_per_second': requests / elapsed,
+        'failed_scans': failures,
+        'timeouts': sum(client.stats["timeouts"] for client in clients),
+        'scan_ms_p50': float(np.percentile(scan_ms, 50)),
+        'scan_ms_p99': float(np.percentile(scan_ms, 99)),
+        'scan_ms_max': float(scan_ms.max()),
+    }
+
+
+if __name__ == "__main__":
+    setup_logging()
+    for plc_count in (1, 4, 16):
+        result = asyncio.run(run_benchmark(plc_count=plc_count, duration=3.0))
+        logger.info(", ".join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}" for k, v in result.items()))
@@ -0,0 +1,242 @@
+import stage_paths  # noqa: F401  (sibling stages on sys.path)
+import asyncio
+import logging
+import re
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from plc_data_converter import PLCDataConverter
+from fins_protocol import (FINS_PORT, MEMORY_AREA_READ, FinsError, FinsFrame, FinsNode, decode_frame,
+                           decode_read_response, encode_read_request)
+
+logger = logging.getLogger(__name__)
+
+# (area, start address, word count), e.g. ("IO", 550, 40)
+ReadBlock = Tuple[str, int, int]
+
+# Triton register columns: IO_0550, D_31651 or with device prefix/suffix, P7_IO_0550_C
+_TRITON_COLUMN = re.compile(r"(?:^|_)(IO|D)_(\d+)(?:_C)?$")
+
+
+def register_column(area: str, address: int) -> str:
+    """Triton column name of a word address: IO 550 -> IO_0550, DM 31651 -> D_31651."""
+    if area == "IO":
+        return f"IO_{address:04d}"
+    if area == "DM":
+        return f"D_{address}"
+    return f"{area}_{address}"
+
+
+def parse_triton_column(column: str) -> Optional[Tuple[str, int]]:
+    """(area, address) of a Triton register column, None for other columns: P7_D_31651_C -> ("DM", 31651)."""
+    match = _TRITON_COLUMN.search(column)
+    if match is None:
+        return None
+    return ("IO" if match.group(1) == "IO" else "DM"), int(match.group(2))
+
+
+class _PendingRead(NamedTuple):
+    """A read waiting for its response: the future and the word count it asked for."""
+    future: asyncio.Future
+    count: int
+
+
+class _FinsDatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, client: 'FinsUdpClient'):
+        self.client = client
+
+    def datagram_received(self, data: bytes, addr):
+        self.client._on_datagram(data)
+
+    def error_received(self, exc: Exception):
+        logger.warning("FINS %s: %s", self.client.host, exc)
+
+
+class FinsUdpClient:
+    """
+    asyncio FINS/UDP client for one PLC.
+
+    Memory area reads are sent without waiting for earlier ones: each
+    request gets a free service ID (SID, 0-255) and its response is matched
+    back by SID, so up to `max_outstanding` reads are in flight at once.
+    Requests that get no response within `timeout` are resent `retries`
+    times with a new SID; the abandoned SID is not reused for another
+    `timeout` seconds, so its late response is dropped instead of being
+    taken for a newer read. A response must also carry the read command
+    code and the requested word count before it is accepted.
+
+    One event loop can drive many clients (one per PLC), see scan_loop().
+
+    Example:
+        >>> client = FinsUdpClient("192.168.16.1", destination=FinsNode(0, 1, 0))
+        >>> await client.connect()
+        >>> registers = await client.read_registers([("IO", 550, 40), ("DM", 31651, 15)])
+    """
+
+    def __init__(self, host: str, port: int = FINS_PORT, destination: FinsNode = FinsNode(),
+                 source: FinsNode = FinsNode(0, 0xEF, 0), timeout: float = 1.0, retries: int = 1,
+                 max_outstanding: int = 8, converter: Optional[PLCDataConverter] = None):
+        if not 1 <= max_outstanding <= 255:
+            raise ValueError("max_outstanding must be 1-255")
+        self.host = host
+        self.port = port
+        self.destination = destination
+        self.source = source
+        self.timeout = timeout
+        self.retries = retries
+        self.converter = converter or PLCDataConverter()
+        self.transport = None
+        # {sid: read waiting for its response}
+        self.pending: Dict[int, _PendingRead] = {}
+        # {sid: loop time it may be reused}, SIDs of timed-out reads
+        self.quarantine: Dict[int, float] = {}
+        self._next_sid = 0
+        self._slots = asyncio.Semaphore(max_outstanding)
+        # requests, responses, timeouts, retries, late_responses, mismatched_responses, errors
+        self.stats = Counter()
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    async def connect(self):
+        loop = asyncio.get_running_loop()
+        self.transport, _ = await loop.create_datagram_endpoint(
+            lambda: _FinsDatagramProtocol(self), remote_addr=(self.host, self.port))
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+        for read in self.pending.values():
+            read.future.cancel()
+        self.pending.clear()
+
+    def _allocate_sid(self) -> int:
+        now = asyncio.get_running_loop().time()
+        for sid in [sid for sid, until in self.quarantine.items() if until <= now]:
+            del self.quarantine[sid]
+        for _ in range(256):
+            sid = self._next_sid
+            self._next_sid = (self._next_sid + 1) % 256
+            if sid not in self.pending and sid not in self.quarantine:
+                return sid
+        if self.quarantine:
+            # Every free SID is quarantined: reuse the one abandoned longest ago
+            sid = min(self.quarantine, key=self.quarantine.get)
+            del self.quarantine[sid]
+            return sid
+        raise RuntimeError("No free FINS service ID")
+
+    @staticmethod
+    def _matches(frame: FinsFrame, count: int) -> bool:
+        """Whether a response can answer a read of `count` words (error responses carry no data)."""
+        if frame.command != MEMORY_AREA_READ or len(frame.body) < 2:
+            return False
+        if len(frame.body) == 2 + 2 * count:
+            return True
+        return len(frame.body) == 2 and int.from_bytes(frame.body, 'big') & 0x3FFF != 0
+
+    def _on_datagram(self, data: bytes):
+        try:
+            frame = decode_frame(data)
+        except ValueError as e:
+            self.stats["errors"] += 1
+            logger.warning("FINS %s: %s", self.host, e)
+            return
+        read = self.pending.get(frame.sid)
+        if read is None or read.future.done():
+            self.stats["late_responses"] += 1
+            return
+        if not self._matches(frame, read.count):
+            self.stats["mismatched_responses"] += 1
+            logger.warning("FINS %s: response for SID %d does not match its read, dropped", self.host, frame.sid)
+            return
+        del self.pending[frame.sid]
+        read.future.set_result(frame)
+
+    async def read_words(self, area: str, address: int, count: int) -> bytes:
+        """Read `count` words and return the raw response data (2 bytes per word)."""
+        if self.transport is None:
+            raise ConnectionError("Client not connected; call connect() first")
+
+        async with self._slots:
+            for attempt in range(self.retries + 1):
+                sid = self._allocate_sid()
+                future = asyncio.get_running_loop().create_future()
+                self.pending[sid] = _PendingRead(future, count)
+                started = time.perf_counter()
+                self.transport.sendto(encode_read_request(self.destination, self.source, sid,
+                                                          area, address, count))
+                self.stats["requests"] += 1
+                try:
+                    frame = await asyncio.wait_for(future, self.timeout)
+                except asyncio.TimeoutError:
+                    self.pending.pop(sid, None)
+                    self.quarantine[sid] = asyncio.get_running_loop().time() + self.timeout
+                    self.stats["timeouts"] += 1
+                    if attempt < self.retries:
+                        self.stats["retries"] += 1
+                    continue
+
+                latency = time.perf_counter() - started
+                self.stats["responses"] += 1
+                self.latency_total += latency
+                self.latency_max = max(self.latency_max, latency)
+                data = decode_read_response(frame)
+                if len(data) != 2 * count:
+                    raise ValueError(f"FINS {self.host}: expected {2 * count} bytes, got {len(data)}")
+                return data
+
+        raise TimeoutError(f"FINS {self.host}: no response for {area} {address} x{count}")
+
+    async def read_hex_words(self, area: str, address: int, count: int) -> List[str]:
+        """Read `count` words as hex strings (PLCDataConverter input)."""
+        return self.converter.words_from_bytes(await self.read_words(area, address, count))
+
+    async def read_blocks(self, blocks: Iterable[ReadBlock]) -> List[List[str]]:
+        """Read several blocks concurrently; results are hex word lists in block order."""
+        return list(await asyncio.gather(*(self.read_hex_words(*block) for block in blocks)))
+
+    async def read_registers(self, blocks: Iterable[ReadBlock]) -> Dict[str, str]:
+        """Read blocks into one register frame {Triton column: hex word}."""
+        blocks = list(blocks)
+        registers = {}
+        for (area, address, _), words in zip(blocks, await self.read_blocks(blocks)):
+            for offset, word in enumerate(words):
+                registers[register_column(area, address + offset)] = word
+        return registers
+
+    def latency_summary(self) -> Dict[str, float]:
+        responses = self.stats["responses"]
+        return {
+            'responses': responses,
+            'mean_latency': self.latency_total / responses if responses else 0.0,
+            'max_latency': self.latency_max,
+        }
+
+
+async def scan_loop(client: FinsUdpClient, machine_name: str, blocks: List[ReadBlock],
+                    on_scan: Callable[[str, datetime, Dict[str, str]], Optional[Awaitable]],
+                    interval: float = 0.1, cycles: Optional[int] = None):
+    """
+    Poll `blocks` every `interval` seconds and pass each register frame to
+    on_scan(machine_name, timestamp, registers). Run one per PLC with
+    asyncio.gather() to scan many PLCs from one process. Scans that fail
+    (timeout / FINS error) are logged and skipped.
+    """
+    cycle = 0
+    next_tick = time.perf_counter()
+    while cycles is None or cycle < cycles:
+        cycle += 1
+        timestamp = datetime.now()
+        try:
+            registers = await client.read_registers(blocks)
+        except (TimeoutError, FinsError, ValueError) as e:
+            logger.warning("Scan of %s failed: %s", machine_name, e)
+        else:
+            result = on_scan(machine_name, timestamp, registers)
+            if asyncio.iscoroutine(result):
+                await result
+
+        next_tick += interval
+        await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
@@ -0,0 +1,106 @@
+import struct
+from typing import NamedTuple
+
+# FINS/UDP default port
+FINS_PORT = 9600
+
+# Memory area codes for word access (CS/CJ/NJ series)
+MEMORY_AREAS = {
+    "IO": 0xB0,   # CIO area, Triton columns IO_xxxx
+    "WR": 0xB1,
+    "HR": 0xB2,
+    "AR": 0xB3,
+    "DM": 0x82,   # DM area, Triton columns D_xxxxx
+}
+AREA_NAMES = {code: name for name, code in MEMORY_AREAS.items()}
+
+# Command codes (MRC, SRC)
+MEMORY_AREA_READ = (0x01, 0x01)
+MEMORY_AREA_WRITE = (0x01, 0x02)
+
+# Largest number of words in one memory area read / write
+MAX_READ_WORDS = 999
+
+# ICF: command with response required / response
+ICF_COMMAND = 0x80
+ICF_RESPONSE = 0xC0
+
+END_CODE_OK = 0x0000
+
+_HEADER = struct.Struct(">BBBBBBBBBB")   # ICF RSV GCT DNA DA1 DA2 SNA SA1 SA2 SID
+_READ_PARAMS = struct.Struct(">BBBHBH")  # MRC SRC area address bit count
+
+
+class FinsError(Exception):
+    """FINS response with a non-zero end code."""
+
+    def __init__(self, end_code: int):
+        self.end_code = end_code
+        super().__init__(f"FINS end code 0x{end_code:04X}")
+
+
+class FinsNode(NamedTuple):
+    """FINS address of one node (network, node, unit)."""
+    network: int = 0
+    node: int = 0
+    unit: int = 0
+
+
+class FinsFrame(NamedTuple):
+    """Decoded FINS header plus command code and the rest of the frame."""
+    icf: int
+    destination: FinsNode
+    source: FinsNode
+    sid: int
+    command: tuple
+    body: bytes
+
+    @property
+    def is_response(self) -> bool:
+        return bool(self.icf & 0x40)
+
+
+def encode_header(icf: int, destination: FinsNode, source: FinsNode, sid: int, gct: int = 0x02) -> bytes:
+    return _HEADER.pack(icf, 0x00, gct, destination.network, destination.node, destination.unit,
+                        source.network, source.node, source.unit, sid & 0xFF)
+
+
+def encode_read_request(destination: FinsNode, source: FinsNode, sid: int,
+                        area: str, address: int, count: int) -> bytes:
+    """Memory area read command for `count` words from `area` at `address`."""
+    if area not in MEMORY_AREAS:
+        raise ValueError(f"Memory area '{area}' not supported. Use one of {list(MEMORY_AREAS)}")
+    if not 1 <= count <= MAX_READ_WORDS:
+        raise ValueError(f"Read count must be 1-{MAX_READ_WORDS}, got {count}")
+    return (encode_header(ICF_COMMAND, destination, source, sid)
+            + _READ_PARAMS.pack(*MEMORY_AREA_READ, MEMORY_AREAS[area], address, 0, count))
+
+
+def decode_frame(data: bytes) -> FinsFrame:
+    """Split a datagram into header fields, command code and body."""
+    if len(data) < _HEADER.size + 2:
+        raise ValueError(f"FINS frame too short ({len(data)} bytes)")
+    icf, _, _, dna, da1, da2, sna, sa1, sa2, sid = _HEADER.unpack_from(data)
+    return FinsFrame(icf=icf, destination=FinsNode(dna, da1, da2), source=FinsNode(sna, sa1, sa2),
+                     sid=sid, command=(data[10], data[11]), body=data[12:])
+
+
+def decode_read_request(frame: FinsFrame):
+    """(area name, address, count) of a memory area read command."""
+    area_code, address, _, count = struct.unpack_from(">BHBH", frame.body)
+    return AREA_NAMES.get(area_code), address, count
+
+
+def encode_response(request: FinsFrame, data: bytes = b"", end_code: int = END_CODE_OK) -> bytes:
+    """Response to `request` (source and destination swapped, same SID)."""
+    return (encode_header(ICF_RESPONSE, request.source, request.destination, request.sid)
+            + bytes(request.command) + struct.pack(">H", end_code) + data)
+
+
+def decode_read_response(frame: FinsFrame) -> bytes:
+    """Word data of a memory area read response (raises FinsError on a bad end code)."""
+    end_code = struct.unpack_from(">H", frame.body)[0]
+    # Bit 15/14 of the end code only flag network relay / fatal CPU errors
+    if end_code & 0x3FFF != END_CODE_OK:
+        raise FinsError(end_code)
+    return frame.body[2:]
@@ -0,0 +1,217 @@
+from Tables_config_codes import setup_logging
+import asyncio
+import logging
+import random
+import numpy as np
+import pandas as pd
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from fins_client import parse_triton_column
+from fins_protocol import (FINS_PORT, MEMORY_AREA_READ, MEMORY_AREAS, FinsNode, decode_frame,
+                           decode_read_request, encode_response)
+
+logger = logging.getLogger(__name__)
+
+# Words per memory area (CJ2 sizes)
+AREA_WORDS = {"IO": 6144, "WR": 512, "HR": 1536, "AR": 960, "DM": 32768}
+
+# FINS end codes returned by the simulator
+END_CODE_AREA_MISSING = 0x1101
+END_CODE_ADDRESS_RANGE = 0x1103
+END_CODE_NOT_SUPPORTED = 0x0401
+
+# Error bits of pattern_1 / pattern_2 (IO_0550 - IO_0589)
+ERROR_REGISTERS = range(550, 590)
+
+
+class PLCMemory:
+    """Word memory of one simulated PLC (big-endian, as sent on the wire)."""
+
+    def __init__(self):
+        self.areas = {area: np.zeros(words, dtype=">u2") for area, words in AREA_WORDS.items()}
+
+    def read(self, area: str, address: int, count: int) -> bytes:
+        return self.areas[area][address:address + count].tobytes()
+
+    def write(self, area: str, addresses: np.ndarray, values: np.ndarray):
+        self.areas[area][addresses] = values
+
+
+class TritonReplay:
+    """
+    Register values replayed from a Triton CSV export, one row per step.
+
+    Works with the raw device exports (P7_IO_0500_C, ...) and with the
+    combined exports (IO_0500, ..., Machine_Name); pass machine_name to pick
+    one machine from a combined file. Replay wraps around at the end.
+    """
+
+    def __init__(self, csv_path: str, machine_name: Optional[str] = None):
+        df = pd.read_csv(csv_path, dtype=str)
+        if machine_name is not None and 'Machine_Name' in df.columns:
+            df = df[df['Machine_Name'] == machine_name]
+        if df.empty:
+            raise ValueError(f"No rows to replay in {csv_path}")
+
+        # {area: (addresses, values[row, column])}
+        self.columns: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        registers = {col: parse_triton_column(col) for col in df.columns}
+        for area in ("IO", "DM"):
+            matches = [(col, register[1]) for col, register in registers.items()
+                       if register is not None and register[0] == area]
+            if not matches:
+                continue
+            words = df[[col for col, _ in matches]].fillna("0").apply(
+                lambda column: column.map(lambda word: int(word, 16) if word else 0))
+            self.columns[area] = (np.array([address for _, address in matches]),
+                                  words.to_numpy(dtype=np.uint16))
+        self.rows = len(df)
+        self.position = 0
+        logger.info("Replaying %d rows of %s", self.rows, csv_path)
+
+    def step(self, memory: PLCMemory):
+        for area, (addresses, values) in self.columns.items():
+            memory.write(area, addresses, values[self.position])
+        self.position = (self.position + 1) % self.rows
+
+
+class SyntheticToggles:
+    """
+    Random error bits in IO_0550 - IO_0589: each step every bit flips with
+    probability `toggle_probability`. Operation mode IO_0502 is set to
+    automatic (9000).
+    """
+
+    def __init__(self, registers: Iterable[int] = ERROR_REGISTERS, toggle_probability: float = 0.01,
+                 seed: Optional[int] = None):
+        self.addresses = np.array(list(registers))
+        self.toggle_probability = toggle_probability
+        self.rng = np.random.default_rng(seed)
+        self.words = np.zeros(len(self.addresses), dtype=np.uint16)
+
+    def step(self, memory: PLCMemory):
+        flips = self.rng.random((len(self.addresses), 16)) < self.toggle_probability
+        self.words ^= (flips * (1 << np.arange(16))).sum(axis=1).astype(np.uint16)
+        memory.write("IO", self.addresses, self.words)
+        memory.write("IO", np.array([502]), np.array([0x9000]))
+
+
+class FinsPLCSimulator(asyncio.DatagramProtocol):
+    """
+    FINS/UDP server answering memory area reads from PLCMemory.
+
+    Responses are sent after `latency` (+ uniform `jitter`) seconds, and each
+    request is dropped with probability `loss`. With no latency the reply is
+    sent from datagram_received directly, which keeps up with thousands of
+    requests per second on one core.
+
+    Example:
+        >>> simulator = FinsPLCSimulator(source=TritonReplay("Triton_AM323_192_168_16_1.csv"))
+        >>> await simulator.start("127.0.0.1", 9600, scan_interval=0.1)
+    """
+
+    def __init__(self, source=None, node: FinsNode = FinsNode(0, 1, 0), latency: float = 0.0,
+                 jitter: float = 0.0, loss: float = 0.0, seed: Optional[int] = None):
+        self.memory = PLCMemory()
+        self.source = source
+        self.node = node
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.random = random.Random(seed)
+        self.transport = None
+        self._scan_task = None
+        # requests, responses, dropped, errors, scans
+        self.stats = Counter()
+
+    async def start(self, host: str = "127.0.0.1", port: int = FINS_PORT, scan_interval: float = 0.1):
+        """Bind the UDP endpoint and step the value source every scan_interval seconds."""
+        loop = asyncio.get_running_loop()
+        self.transport, _ = await loop.create_datagram_endpoint(lambda: self, local_addr=(host, port))
+        if self.source is not None:
+            self.source.step(self.memory)
+            self._scan_task = asyncio.create_task(self._scan(scan_interval))
+        logger.info("FINS simulator listening on %s:%d", host, port)
+
+    def stop(self):
+        if self._scan_task is not None:
+            self._scan_task.cancel()
+            self._scan_task = None
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+    async def _scan(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            self.source.step(self.memory)
+            self.stats["scans"] += 1
+
+    def datagram_received(self, data: bytes, addr):
+        self.stats["requests"] += 1
+        if self.loss and self.random.random() < self.loss:
+            self.stats["dropped"] += 1
+            return
+        try:
+            response = self.handle(data)
+        except ValueError as e:
+            self.stats["errors"] += 1
+            logger.debug("Bad FINS request from %s: %s", addr, e)
+            return
+
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._send, response, addr)
+        else:
+            self._send(response, addr)
+
+    def _send(self, response: bytes, addr):
+        if self.transport is not None:
+            self.transport.sendto(response, addr)
+            self.stats["responses"] += 1
+
+    def handle(self, data: bytes) -> bytes:
+        """Response frame for one request datagram."""
+        frame = decode_frame(data)
+        if frame.command != MEMORY_AREA_READ:
+            return encode_response(frame, end_code=END_CODE_NOT_SUPPORTED)
+        area, address, count = decode_read_request(frame)
+        if area not in MEMORY_AREAS or area not in self.memory.areas:
+            return encode_response(frame, end_code=END_CODE_AREA_MISSING)
+        if address + count > len(self.memory.areas[area]):
+            return encode_response(frame, end_code=END_CODE_ADDRESS_RANGE)
+        return encode_response(frame, self.memory.read(area, address, count))
+
+
+async def serve_plcs(sources: List, host: str = "127.0.0.1", base_port: int = FINS_PORT,
+                     scan_interval: float = 0.1, **options) -> List[FinsPLCSimulator]:
+    """Start one simulator per source on consecutive ports (base_port, base_port + 1, ...)."""
+    simulators = []
+    for i, source in enumerate(sources):
+        simulator = FinsPLCSimulator(source=source, **options)
+        await simulator.start(host, base_port + i, scan_interval)
+        simulators.append(simulator)
+    return simulators
+
+
+async def _main():
+    sources = [
+        TritonReplay("../raw_data_2025_11_27/AM323/Triton_csv/Triton_AM323_192_168_16_1.csv"),
+        TritonReplay("../raw_data_2025_11_27/AM323/Triton_csv/Triton_AM323_192_168_16_2.csv"),
+        TritonReplay("../raw_data_2025_11_27/AM321/Triton_csv/Triton_AM321_192_168_16_2.csv"),
+        SyntheticToggles(seed=0),
+    ]
+    simulators = await serve_plcs(sources, base_port=FINS_PORT, latency=0.002, jitter=0.001, loss=0.001)
+    try:
+        while True:
+            await asyncio.sleep(10)
+            for simulator in simulators:
+                logger.info("%s: %s", simulator.transport.get_extra_info('sockname'), dict(simulator.stats))
+    finally:
+        for simulator in simulators:
+            simulator.stop()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(_main())
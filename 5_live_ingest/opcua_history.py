@@ -0,0 +1,233 @@
+import stage_paths  # noqa: F401  (sibling stages on sys.path)
+import logging
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Tuple
+from asyncua import ua
+from asyncua.server.history import HistoryManager, HistoryStorageInterface
+from error_events import MODE_NAMES
+from register_archive import RegisterArchive
+
+logger = logging.getLogger(__name__)
+
+# Aggregates answered by ReadProcessed, {aggregate NodeId: name}
+AGGREGATES = {
+    ua.NodeId(ua.ObjectIds.AggregateFunction_Minimum): 'Minimum',
+    ua.NodeId(ua.ObjectIds.AggregateFunction_Maximum): 'Maximum',
+    ua.NodeId(ua.ObjectIds.AggregateFunction_Average): 'Average',
+    ua.NodeId(ua.ObjectIds.AggregateFunction_Count): 'Count',
+    ua.NodeId(ua.ObjectIds.AggregateFunction_Start): 'Start',
+    ua.NodeId(ua.ObjectIds.AggregateFunction_End): 'End',
+}
+
+_MODE_WORDS = {int(word, 16): mode for word, mode in MODE_NAMES.items()}
+
+
+def _archive_ns(timestamp: Optional[datetime]) -> Optional[int]:
+    """OPC UA (UTC) time -> archive time (ns of naive local time); None when unset."""
+    if timestamp is None or timestamp <= ua.get_win_epoch().replace(tzinfo=timestamp.tzinfo):
+        return None
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return pd.Timestamp(timestamp.astimezone().replace(tzinfo=None)).value
+
+
+def _opcua_time(time_ns: int) -> datetime:
+    return pd.Timestamp(int(time_ns)).to_pydatetime().astimezone(timezone.utc)
+
+
+def decode_words(spec, words: np.ndarray) -> np.ndarray:
+    """Vectorized PLCDataConverter decoding of aligned word columns for a TagSpec."""
+    if spec is None:
+        return words[:, 0]
+    if spec.data_type == "MODE":
+        return np.array([_MODE_WORDS.get(int(word), "None") for word in words[:, 0]], dtype=object)
+    if spec.data_type == "UINT32":
+        return (words[:, 0] << 16) | words[:, 1]
+    if spec.data_type == "REAL16":
+        return words[:, 0] / spec.scale_factor
+    return words[:, 0]
+
+
+def aggregate(times: np.ndarray, values: np.ndarray, start_ns: int, end_ns: int, interval_ns: int,
+              name: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    One aggregate per interval over [start_ns, end_ns), computed with ufunc.reduceat.
+
+    The archive is change-only, so values are stepped: each interval starts
+    with the value in effect at its start (pass the series with its prior
+    point), Average is weighted by how long each value was held, and Count
+    counts the stored changes inside the interval.
+
+    Returns (interval start times, values, point counts); intervals before
+    the first point have value NaN.
+    """
+    if interval_ns <= 0:
+        interval_ns = max(end_ns - start_ns, 1)
+    starts = np.arange(start_ns, end_ns, interval_ns, dtype=np.int64)
+    ends = np.minimum(starts + interval_ns, end_ns)
+    counts = np.searchsorted(times, ends, side='left') - np.searchsorted(times, starts, side='left')
+    if name == 'Count':
+        return starts, counts.astype(float), counts
+    if name not in AGGREGATES.values():
+        raise ValueError(f"Aggregate '{name}' not supported. Use one of {list(AGGREGATES.values())}")
+
+    # Bound point at every interval start holding the value in effect there;
+    # sorted before a stored point at the same time, so it gets no weight
+    prior = np.searchsorted(times, starts, side='right') - 1
+    held = prior >= 0
+    times = np.concatenate([starts[held], times])
+    values = np.concatenate([values[prior[held]], values]).astype(float)
+    order = np.argsort(times, kind='stable')
+    order = order[times[order] < end_ns]
+    times, values = times[order], values[order]
+
+    first = np.searchsorted(times, starts, side='left')
+    last = np.searchsorted(times, ends, side='left')
+    filled = last > first
+    result = np.full(len(starts), np.nan)
+    if filled.any():
+        index = first[filled]
+        if name == 'Minimum':
+            result[filled] = np.minimum.reduceat(values, index)
+        elif name == 'Maximum':
+            result[filled] = np.maximum.reduceat(values, index)
+        elif name == 'Average':
+            interval_end = ends[np.clip(np.searchsorted(starts, times, side='right') - 1, 0, len(starts) - 1)]
+            following = np.append(times[1:], end_ns)
+            weights = (np.minimum(following, interval_end) - times).clip(min=0).astype(float)
+            weighted = np.add.reduceat(values * weights, index)
+            total = np.add.reduceat(weights, index)
+            result[filled] = np.where(total > 0, weighted / np.where(total > 0, total, 1),
+                                      values[last[filled] - 1])
+        elif name == 'Start':
+            result[filled] = values[index]
+        elif name == 'End':
+            result[filled] = values[last[filled] - 1]
+    return starts, result, counts
+
+
+class ArchiveHistoryStorage(HistoryStorageInterface):
+    """
+    asyncua history backend answering raw HistoryRead from a RegisterArchive.
+
+    `resolve(node_id)` maps a node to (machine name, series names, TagSpec
+    or None), or None for nodes without history. Values are written to the
+    archive by the server itself, so the save_* hooks do nothing.
+    """
+
+    def __init__(self, archive: RegisterArchive, resolve: Callable, max_history_data_response_size: int = 10000):
+        super().__init__(max_history_data_response_size)
+        self.archive = archive
+        self.resolve = resolve
+
+    async def init(self):
+        pass
+
+    async def new_historized_node(self, node_id, period, count=0):
+        pass
+
+    async def save_node_value(self, node_id, datavalue):
+        pass
+
+    async def new_historized_event(self, source_id, evtypes, period, count=0):
+        pass
+
+    async def save_event(self, event):
+        pass
+
+    async def read_event_history(self, source_id, start, end, nb_values, evfilter):
+        return [], None
+
+    async def stop(self):
+        pass
+
+    def series(self, node_id: ua.NodeId, start_ns: Optional[int], end_ns: Optional[int],
+               include_prior: bool = False) -> Optional[Tuple[np.ndarray, np.ndarray, object]]:
+        """Decoded (times, values, spec) of a node in the window, None if the node has no history."""
+        target = self.resolve(node_id)
+        if target is None:
+            return None
+        machine_name, names, spec = target
+        times, words = self.archive.window(machine_name, names, start_ns, end_ns, include_prior)
+        return times, decode_words(spec, words), spec
+
+    async def read_node_history(self, node_id, start, end, nb_values):
+        start_ns, end_ns = _archive_ns(start), _archive_ns(end)
+        reverse = start_ns is not None and end_ns is not None and start_ns > end_ns
+        if reverse:
+            start_ns, end_ns = end_ns, start_ns
+        found = self.series(node_id, start_ns, end_ns)
+        if found is None:
+            return [], None
+        times, values, spec = found
+        if reverse:
+            times, values = times[::-1], values[::-1]
+
+        limit = min(nb_values or self.max_history_data_response_size, self.max_history_data_response_size)
+        continuation = _opcua_time(times[limit]) if len(times) > limit else None
+        variant_type = spec.variant_type if spec is not None else ua.VariantType.UInt32
+        data_values = [
+            ua.DataValue(ua.Variant(value.item() if isinstance(value, np.generic) else value, variant_type),
+                         SourceTimestamp=_opcua_time(time_ns), ServerTimestamp=_opcua_time(time_ns))
+            for time_ns, value in zip(times[:limit], values[:limit])
+        ]
+        return data_values, continuation
+
+
+class RegisterHistoryManager(HistoryManager):
+    """
+    HistoryManager adding ReadProcessed (Minimum / Maximum / Average / Count
+    / Start / End per ProcessingInterval) on top of the raw reads of
+    ArchiveHistoryStorage. Aggregates are computed on the archive arrays
+    with reduceat, so a client asking for hourly maxima of a day gets 24
+    values instead of every raw point.
+    """
+
+    def __init__(self, iserver, storage: ArchiveHistoryStorage):
+        super().__init__(iserver)
+        self.storage = storage
+
+    async def read_history(self, params: ua.HistoryReadParameters) -> List[ua.HistoryReadResult]:
+        details = params.HistoryReadDetails
+        if not isinstance(details, ua.ReadProcessedDetails):
+            return await super().read_history(params)
+        return [self._read_processed(details, rv, i) for i, rv in enumerate(params.NodesToRead)]
+
+    def _read_processed(self, details: ua.ReadProcessedDetails, rv: ua.HistoryReadValueId,
+                        index: int) -> ua.HistoryReadResult:
+        result = ua.HistoryReadResult()
+        aggregate_ids = details.AggregateType
+        aggregate_id = aggregate_ids[index] if index < len(aggregate_ids) else (aggregate_ids[-1] if aggregate_ids else None)
+        name = AGGREGATES.get(aggregate_id)
+        start_ns, end_ns = _archive_ns(details.StartTime), _archive_ns(details.EndTime)
+        if name is None:
+            result.StatusCode = ua.StatusCode(ua.StatusCodes.BadAggregateNotSupported)
+            return result
+        if start_ns is None or end_ns is None or start_ns >= end_ns:
+            result.StatusCode = ua.StatusCode(ua.StatusCodes.BadInvalidTimestampArgument)
+            return result
+
+        found = self.storage.series(rv.NodeId, start_ns, end_ns, include_prior=True)
+        if found is None:
+            result.StatusCode = ua.StatusCode(ua.StatusCodes.BadHistoryOperationUnsupported)
+            return result
+        times, values, spec = found
+        if spec is not None and spec.data_type == "MODE" and name != 'Count':
+            result.StatusCode = ua.StatusCode(ua.StatusCodes.BadAggregateInvalidInputs)
+            return result
+        starts, aggregated, _ = aggregate(times, values, start_ns, end_ns,
+                                          int(details.ProcessingInterval * 1e6), name)
+
+        data_values = []
+        for start, value in zip(starts, aggregated):
+            timestamp = _opcua_time(start)
+            if np.isnan(value):
+                data_values.append(ua.DataValue(StatusCode=ua.StatusCode(ua.StatusCodes.BadNoData),
+                                                SourceTimestamp=timestamp, ServerTimestamp=timestamp))
+            else:
+                data_values.append(ua.DataValue(ua.Variant(float(value), ua.VariantType.Double),
+                                                SourceTimestamp=timestamp, ServerTimestamp=timestamp))
+        result.HistoryData = ua.HistoryData(DataValues=data_values)
+        return result
@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from asyncua import Client, ua
+from fins_client import ReadBlock, register_column
+
+logger = logging.getLogger(__name__)
+
+# {machine name: {register column: NodeId string}}
+TagMap = Dict[str, Dict[str, str]]
+ScanCallback = Callable[[str, datetime, Dict[str, str]], Optional[Awaitable]]
+
+
+def block_registers(blocks: Iterable[ReadBlock]) -> List[str]:
+    """Register columns covered by read blocks, e.g. [("IO", 550, 2)] -> ["IO_0550", "IO_0551"]."""
+    return [register_column(area, address + offset) for area, address, count in blocks for offset in range(count)]
+
+
+def build_tag_map(machines: Iterable[str], registers: Iterable[str], namespace_index: int = 2,
+                  template: str = "{machine}.{register}") -> TagMap:
+    """
+    String NodeIds of every register of every machine.
+
+    Example:
+        >>> build_tag_map(["AM323"], ["IO_0550"])
+        {'AM323': {'IO_0550': 'ns=2;s=AM323.IO_0550'}}
+    """
+    registers = list(registers)
+    return {machine: {register: f"ns={namespace_index};s=" + template.format(machine=machine, register=register)
+                      for register in registers}
+            for machine in machines}
+
+
+def word_to_hex(value: Any) -> str:
+    """Tag value as a 4-digit hex word (the FINS / Triton register format)."""
+    if isinstance(value, str):
+        return value.upper().zfill(4)
+    if value is None:
+        return "0000"
+    return f"{int(value) & 0xFFFF:04X}"
+
+
+def _local_time(timestamp: Optional[datetime]) -> datetime:
+    """Source timestamp of a value as naive local time, like the FINS scan timestamps."""
+    if timestamp is None:
+        return datetime.now()
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone().replace(tzinfo=None)
+
+
+class _DataChangeHandler:
+    """
+    Collects the notifications of one publish response into frames, one per
+    machine and source timestamp: with queue_size > 1 a register can change
+    several times in one publish, and each of its values becomes a frame of
+    its own instead of only the last one being kept.
+    """
+
+    def __init__(self, ingest: 'OpcUaIngest'):
+        self.ingest = ingest
+        # {(machine name, source timestamp): {register column: word}}
+        self.pending: Dict[Tuple[str, datetime], Dict[str, str]] = {}
+        self.flush_scheduled = False
+
+    def datachange_notification(self, node, val, data):
+        tag = self.ingest.tags_by_node.get(node.nodeid.to_string())
+        if tag is None:
+            return
+        machine_name, register = tag
+        value = data.monitored_item.Value
+        timestamp = _local_time(value.SourceTimestamp or value.ServerTimestamp)
+        self.pending.setdefault((machine_name, timestamp), {})[register] = word_to_hex(val)
+        self.ingest.stats["updates"] += 1
+        if not self.flush_scheduled:
+            # Notifications of one publish are dispatched back to back, so a
+            # flush queued behind the first one runs after all of them
+            self.flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def _flush(self):
+        self.flush_scheduled = False
+        frames, self.pending = self.pending, {}
+        for (machine_name, timestamp), registers in sorted(frames.items(), key=lambda item: item[0][1]):
+            self.ingest._emit(machine_name, timestamp, registers)
+
+
+class OpcUaIngest:
+    """
+    Register frames from an OPC UA server, for the same on_scan callbacks
+    as the FINS scan_loop() / PollScheduler.
+
+    Two modes:
+      - poll(): batched Read service calls, max_nodes_per_read NodeIds per
+        request, the chunks of one machine sent concurrently.
+      - subscribe(): one subscription with a monitored item per tag
+        (sampling interval, queue size and optional absolute deadband);
+        the values of one publish response become one frame per machine
+        and source timestamp, stamped with that timestamp.
+
+    Tag values (UInt16/Int16 words) are turned into 4-digit hex words so the
+    frames look like the FINS ones and go through PLCDataConverter unchanged.
+
+    Example:
+        >>> tags = build_tag_map(["AM323"], block_registers(plan_table_reads()))
+        >>> ingest = OpcUaIngest("opc.tcp://localhost:4840", tags, on_scan)
+        >>> await ingest.connect()
+        >>> await ingest.subscribe(sampling_interval=100)
+    """
+
+    def __init__(self, url: str, tags: TagMap, on_scan: ScanCallback, max_nodes_per_read: int = 1000,
+                 timeout: float = 4.0):
+        self.url = url
+        self.tags = tags
+        self.on_scan = on_scan
+        self.max_nodes_per_read = max_nodes_per_read
+        self.client = Client(url, timeout=timeout)
+        self.subscription = None
+        self.tags_by_node: Dict[str, Tuple[str, str]] = {}
+        self._nodes: Dict[str, List[Tuple[str, Any]]] = {}
+        # reads, updates, frames
+        self.stats = Counter()
+
+    async def connect(self):
+        await self.client.connect()
+        for machine_name, registers in self.tags.items():
+            self._nodes[machine_name] = []
+            for register, node_id in registers.items():
+                node = self.client.get_node(node_id)
+                self._nodes[machine_name].append((register, node))
+                self.tags_by_node[node.nodeid.to_string()] = (machine_name, register)
+        logger.info("Connected to %s (%d tags)", self.url, len(self.tags_by_node))
+
+    async def disconnect(self):
+        if self.subscription is not None:
+            await self.subscription.delete()
+            self.subscription = None
+        await self.client.disconnect()
+
+    def _emit(self, machine_name: str, timestamp: datetime, registers: Dict[str, str]):
+        self.stats["frames"] += 1
+        result = self.on_scan(machine_name, timestamp, registers)
+        if asyncio.iscoroutine(result):
+            asyncio.ensure_future(result)
+
+    async def read(self, machine_name: str) -> Dict[str, str]:
+        """Read every tag of one machine with batched Read requests."""
+        nodes = self._nodes[machine_name]
+        chunks = [nodes[i:i + self.max_nodes_per_read] for i in range(0, len(nodes), self.max_nodes_per_read)]
+        values = await asyncio.gather(*(self.client.read_values([node for _, node in chunk]) for chunk in chunks))
+        self.stats["reads"] += len(chunks)
+        return {register: word_to_hex(value)
+                for chunk, chunk_values in zip(chunks, values)
+                for (register, _), value in zip(chunk, chunk_values)}
+
+    async def poll(self, interval: float = 0.1, cycles: Optional[int] = None):
+        """Read all machines every `interval` seconds and pass each frame to on_scan."""
+        cycle = 0
+        next_tick = time.perf_counter()
+        while cycles is None or cycle < cycles:
+            cycle += 1
+            timestamp = datetime.now()
+            frames = await asyncio.gather(*(self.read(machine_name) for machine_name in self._nodes),
+                                          return_exceptions=True)
+            for machine_name, registers in zip(self._nodes, frames):
+                if isinstance(registers, Exception):
+                    logger.warning("OPC UA read of %s failed: %s", machine_name, registers)
+                    continue
+                result = self.on_scan(machine_name, timestamp, registers)
+                if asyncio.iscoroutine(result):
+                    await result
+                self.stats["frames"] += 1
+            next_tick += interval
+            await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+
+    async def subscribe(self, sampling_interval: float = 100.0, publishing_interval: float = 100.0,
+                        queue_size: int = 1, deadband: Optional[float] = None):
+        """
+        Monitor every tag; changed values arrive as frames via on_scan.
+
+        Args:
+            sampling_interval: Server-side sampling per item (ms)
+            publishing_interval: How often the server sends notifications (ms)
+            queue_size: Values queued per item between publishes (1 = latest only);
+                        each queued value is delivered in its own frame
+            deadband: Absolute deadband; changes smaller than this are not reported
+        """
+        self.subscription = await self.client.create_subscription(publishing_interval, _DataChangeHandler(self))
+        mfilter = None
+        if deadband is not None:
+            mfilter = ua.DataChangeFilter(Trigger=ua.DataChangeTrigger.StatusValue,
+                                          DeadbandType=ua.DeadbandType.Absolute, DeadbandValue=deadband)
+
+        requests = []
+        for handle, (register, node) in enumerate(
+                (item for nodes in self._nodes.values() for item in nodes), start=1):
+            requests.append(ua.MonitoredItemCreateRequest(
+                ItemToMonitor=ua.ReadValueId(NodeId=node.nodeid, AttributeId=ua.AttributeIds.Value),
+                MonitoringMode=ua.MonitoringMode.Reporting,
+                RequestedParameters=ua.MonitoringParameters(
+                    ClientHandle=handle, SamplingInterval=sampling_interval, Filter=mfilter,
+                    QueueSize=queue_size, DiscardOldest=True)))
+
+        failed = 0
+        for i in range(0, len(requests), self.max_nodes_per_read):
+            results = await self.subscription.create_monitored_items(requests[i:i + self.max_nodes_per_read])
+            failed += sum(isinstance(result, ua.StatusCode) for result in results)
+        if failed:
+            logger.warning("%d of %d monitored items could not be created", failed, len(requests))
+        logger.info("Subscribed to %d tags on %s", len(requests) - failed, self.url)
@@ -0,0 +1,262 @@
+import stage_paths  # noqa: F401  (sibling stages on sys.path)
+from Tables_config_codes import ERROR_TABLE, PRODUCTION_INFO_TABLE
+import logging
+import numpy as np
+import pandas as pd
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from asyncua import Server, ua
+from plc_data_converter import PLCDataConverter
+from main_error_table_code import CreateErrorTableCode
+from error_events import MODE_NAMES
+from fins_client import register_column
+from read_planner import parse_plc_address
+from register_archive import ERROR_COUNT_SERIES, RegisterArchive
+from opcua_history import ArchiveHistoryStorage, RegisterHistoryManager
+from error_stream import frame_words
+
+logger = logging.getLogger(__name__)
+
+# "[.00]" -> two decimals -> raw word / 100
+_SCALES = {"[.00]": 100, "[.0]": 10, "[0]": 1}
+
+# Normal_Data_Type -> OPC UA type of a WORD value
+_WORD_TYPES = {"UDINT": ua.VariantType.UInt32, "USINT": ua.VariantType.UInt16}
+
+# Nodes of the active error state under <machine>/ActiveErrors
+ERROR_NODES = {
+    'Count': (ua.VariantType.UInt32, 0),
+    'BitNumbers': (ua.VariantType.Int32, []),
+    'ErrorTypes': (ua.VariantType.String, []),
+    'StartTimes': (ua.VariantType.DateTime, []),
+}
+
+
+class TagSpec(NamedTuple):
+    """How one table column is decoded from register words and published."""
+    name: str                       # browse name (English_Name, else the column name)
+    column: str                     # table column
+    registers: Tuple[str, ...]      # register columns in converter order, e.g. ("D_31601", "D_31600")
+    data_type: str                  # PLCDataConverter type, or "MODE" for the operation mode
+    scale_factor: int
+    variant_type: ua.VariantType
+
+
+def build_tag_specs(tables: Iterable[Dict] = (ERROR_TABLE, PRODUCTION_INFO_TABLE)) -> List[TagSpec]:
+    """
+    Tag specs for every PLC-backed column, typed from PLC_Data_Type,
+    Normal_Data_Type and Scale. A name that appears in several tables is
+    published once.
+    """
+    specs = {}
+    for table in tables:
+        for column, details in table.get("columns", {}).items():
+            address = details.get("PLC_Memory_Address", "")
+            plc_type = details.get("PLC_Data_Type", "")
+            normal_type = details.get("Normal_Data_Type", "")
+            name = details.get("English_Name") or column
+            if not address or name in specs:
+                continue
+            registers = tuple(dict.fromkeys(register_column(area, word) for area, word in parse_plc_address(address)))
+
+            if "." in address:
+                # Operation mode bits 502.12 / 502.13 / 502.14
+                spec = TagSpec(name, column, registers[:1], "MODE", 1, ua.VariantType.String)
+            elif plc_type == "DWORD":
+                spec = TagSpec(name, column, registers, "UINT32", 1, ua.VariantType.UInt32)
+            elif plc_type == "WORD" and normal_type == "REAL":
+                spec = TagSpec(name, column, registers, "REAL16", _SCALES.get(details.get("Scale", ""), 1),
+                               ua.VariantType.Double)
+            elif plc_type == "WORD" and normal_type.startswith("STRING"):
+                spec = TagSpec(name, column, registers, "UINT16", 1, ua.VariantType.String)
+            elif plc_type == "WORD":
+                spec = TagSpec(name, column, registers, "UINT16", 1,
+                               _WORD_TYPES.get(normal_type, ua.VariantType.UInt16))
+            else:
+                continue
+            specs[name] = spec
+    return list(specs.values())
+
+
+def _utc(timestamp: datetime) -> datetime:
+    return timestamp.astimezone(timezone.utc) if timestamp.tzinfo is None else timestamp
+
+
+class PLCTagServer:
+    """
+    OPC UA server publishing decoded tags and active errors per machine.
+
+    Address space (namespace `namespace_uri`, string NodeIds):
+        <machine>/<tag>                        e.g. "AM323.Torque_Hold"
+        <machine>/ActiveErrors/Count           number of active error bits
+        <machine>/ActiveErrors/BitNumbers      active bit numbers
+        <machine>/ActiveErrors/ErrorTypes      error type per active bit
+        <machine>/ActiveErrors/StartTimes      start time per active bit
+
+    publish() takes the same (machine_name, timestamp, registers) frames as
+    the scan loops, so it can be passed to them as on_scan. Per frame only
+    the tags whose words arrived are decoded, and only values that differ
+    from the last published ones are written - in one batched Write.
+    The error state comes from CreateErrorTableCode.process_words(), so an
+    error start is visible to subscribers in the scan it was read.
+
+    With an `archive` (RegisterArchive) every frame is also archived and the
+    tags and ActiveErrors/Count answer HistoryRead: raw values and
+    processed Minimum / Maximum / Average / Count / Start / End.
+
+    Example:
+        >>> server = PLCTagServer(MACHINE_NAME_CODE)
+        >>> await server.start()
+        >>> await scheduler.run_many(clients, server.publish)
+    """
+
+    def __init__(self, machine_name_code: Dict, endpoint: str = "opc.tcp://0.0.0.0:4840/plc/",
+                 namespace_uri: str = "urn:plc-live-ingest", tag_specs: Optional[List[TagSpec]] = None,
+                 tracker: Optional[CreateErrorTableCode] = None, converter: Optional[PLCDataConverter] = None,
+                 archive: Optional[RegisterArchive] = None):
+        self.machine_name_code = machine_name_code
+        self.endpoint = endpoint
+        self.namespace_uri = namespace_uri
+        self.tag_specs = tag_specs if tag_specs is not None else build_tag_specs()
+        self.tracker = tracker or CreateErrorTableCode(machine_name_code=machine_name_code, log_mode="summary")
+        self.converter = converter or PLCDataConverter()
+        self.server = Server()
+        self.namespace_index = None
+        self.archive = archive
+        self.specs_by_name = {spec.name: spec for spec in self.tag_specs}
+        if archive is not None:
+            self.server.iserver.history_manager = RegisterHistoryManager(
+                self.server.iserver, ArchiveHistoryStorage(archive, self._history_series))
+        # {register column: [tag specs reading it]}
+        self.specs_by_register: Dict[str, List[TagSpec]] = {}
+        for spec in self.tag_specs:
+            for register in spec.registers:
+                self.specs_by_register.setdefault(register, []).append(spec)
+        # Latest word per machine and register (frames may be partial)
+        self.words: Dict[str, Dict[str, str]] = {machine: {} for machine in machine_name_code}
+        # Last published value per NodeId string
+        self.published: Dict[str, Any] = {}
+        # frames, values_written, writes, decode_errors
+        self.stats = Counter()
+
+    def node_id(self, machine_name: str, name: str) -> ua.NodeId:
+        return ua.NodeId(f"{machine_name}.{name}", self.namespace_index)
+
+    def _history_series(self, node_id: ua.NodeId):
+        """(machine name, archive series, tag spec) behind a node, None if it has no history."""
+        machine_name, _, name = str(node_id.Identifier).partition(".")
+        if machine_name not in self.machine_name_code:
+            return None
+        if name == ERROR_COUNT_SERIES:
+            return machine_name, [ERROR_COUNT_SERIES], None
+        spec = self.specs_by_name.get(name)
+        if spec is None:
+            return None
+        return machine_name, list(spec.registers), spec
+
+    async def _add_variable(self, parent, machine_name: str, name: str, browse_name: str, value: ua.Variant):
+        variable = await parent.add_variable(self.node_id(machine_name, name), browse_name, value)
+        if self.archive is not None and self._history_series(variable.nodeid) is not None:
+            for attribute in (ua.AttributeIds.AccessLevel, ua.AttributeIds.UserAccessLevel):
+                await variable.set_attr_bit(attribute, ua.AccessLevel.HistoryRead)
+            await variable.write_attribute(ua.AttributeIds.Historizing, ua.DataValue(ua.Variant(True)))
+        return variable
+
+    async def start(self):
+        await self.server.init()
+        self.server.set_endpoint(self.endpoint)
+        self.server.set_server_name("PLC live ingest")
+        self.namespace_index = await self.server.register_namespace(self.namespace_uri)
+        objects = self.server.nodes.objects
+
+        for machine_name in self.machine_name_code:
+            machine = await objects.add_object(ua.NodeId(machine_name, self.namespace_index), machine_name)
+            for spec in self.tag_specs:
+                default = "" if spec.variant_type == ua.VariantType.String else 0
+                await self._add_variable(machine, machine_name, spec.name, spec.name,
+                                         ua.Variant(default, spec.variant_type))
+            errors = await machine.add_object(self.node_id(machine_name, "ActiveErrors"), "ActiveErrors")
+            for name, (variant_type, default) in ERROR_NODES.items():
+                await self._add_variable(errors, machine_name, f"ActiveErrors.{name}", name,
+                                         ua.Variant(default, variant_type))
+
+        await self.server.start()
+        logger.info("OPC UA server on %s (%d machines, %d tags each)",
+                    self.endpoint, len(self.machine_name_code), len(self.tag_specs))
+
+    async def stop(self):
+        await self.server.stop()
+
+    def _decode(self, spec: TagSpec, words: Dict[str, str]):
+        if spec.data_type == "MODE":
+            return MODE_NAMES.get(words[spec.registers[0]], "None")
+        value = self.converter.convert([words[register] for register in spec.registers], spec.data_type,
+                                       scale_factor=spec.scale_factor)
+        return str(value) if spec.variant_type == ua.VariantType.String else value
+
+    def _tag_values(self, machine_name: str, registers: Dict[str, str]) -> Dict[str, Tuple[Any, ua.VariantType]]:
+        """Decoded values of the tags touched by a frame, {tag name: (value, type)}."""
+        words = self.words[machine_name]
+        words.update(registers)
+        specs = {spec.name: spec for register in registers for spec in self.specs_by_register.get(register, ())}
+        values = {}
+        for spec in specs.values():
+            if not all(register in words for register in spec.registers):
+                continue
+            try:
+                values[spec.name] = (self._decode(spec, words), spec.variant_type)
+            except ValueError as e:
+                self.stats["decode_errors"] += 1
+                logger.debug("Cannot decode %s of %s: %s", spec.name, machine_name, e)
+        return values
+
+    def _error_values(self, machine_name: str, registers: Dict[str, str],
+                      timestamp: datetime) -> Dict[str, Tuple[Any, ua.VariantType]]:
+        """Feed the error words of a frame to the tracker and return the active error nodes."""
+        indices, words = frame_words(self.tracker, machine_name, registers)
+        if not len(indices):
+            return {}
+        self.tracker.process_words(machine_name, indices, words, timestamp)
+        # The server only publishes the state; rows are the batch job's business
+        self.tracker.error_events.clear()
+
+        layout = self.tracker.get_bit_layout(machine_name)
+        state = self.tracker.get_machine_state(machine_name)
+        bits = np.flatnonzero(state.active)
+        return {
+            'ActiveErrors.Count': (len(bits), ua.VariantType.UInt32),
+            'ActiveErrors.BitNumbers': (bits.tolist(), ua.VariantType.Int32),
+            'ActiveErrors.ErrorTypes': ([layout.error_types[int(code)] for code in state.error_types[bits]],
+                                        ua.VariantType.String),
+            'ActiveErrors.StartTimes': ([_utc(pd.Timestamp(start).to_pydatetime()) for start in state.start_times[bits]],
+                                        ua.VariantType.DateTime),
+        }
+
+    async def publish(self, machine_name: str, timestamp: datetime, registers: Dict[str, str]):
+        """Decode one register frame and write the changed values in one batch."""
+        if machine_name not in self.words:
+            return
+        self.stats["frames"] += 1
+        values = self._tag_values(machine_name, registers)
+        values.update(self._error_values(machine_name, registers, timestamp))
+        if self.archive is not None:
+            self.archive.append(machine_name, timestamp, registers)
+            if 'ActiveErrors.Count' in values:
+                self.archive.record(machine_name, ERROR_COUNT_SERIES, timestamp, values['ActiveErrors.Count'][0])
+
+        source_time = _utc(timestamp)
+        writes = []
+        for name, (value, variant_type) in values.items():
+            key = f"{machine_name}.{name}"
+            if self.published.get(key) == value:
+                continue
+            self.published[key] = value
+            writes.append(ua.WriteValue(
+                NodeId=self.node_id(machine_name, name), AttributeId=ua.AttributeIds.Value,
+                Value=ua.DataValue(ua.Variant(value, variant_type), SourceTimestamp=source_time,
+                                   ServerTimestamp=datetime.now(timezone.utc))))
+        if writes:
+            await self.server.iserver.isession.write(ua.WriteParameters(NodesToWrite=writes))
+            self.stats["writes"] += 1
+            self.stats["values_written"] += len(writes)
@@ -0,0 +1,396 @@
+import stage_paths  # noqa: F401  (sibling stages on sys.path)
+from Tables_config_codes import ERROR_TABLE, setup_logging
+import asyncio
+import logging
+import os
+import time
+import numpy as np
+import pandas as pd
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+from main_error_table_code import CreateErrorTableCode
+from error_stream import ErrorEvent, ErrorTracker, frame_words
+from fins_client import register_column
+from read_planner import MODE_REGISTER, parse_plc_address
+
+logger = logging.getLogger(__name__)
+
+# handler(batch) -> output items (or None); may be a coroutine function
+StageHandler = Callable[[List[Any]], Optional[Iterable[Any]]]
+
+# Item telling ErrorRowBuilder.enrich to flush the episodes held by the debouncer
+FINAL_FLUSH = object()
+
+
+class Frame(NamedTuple):
+    """One register frame as passed to on_scan."""
+    machine_name: str
+    timestamp: datetime
+    registers: Dict[str, str]
+
+
+class ScanWords(NamedTuple):
+    """A frame decoded for edge detection."""
+    machine_name: str
+    timestamp: datetime
+    indices: np.ndarray          # rows of the machine's ErrorBitLayout
+    words: np.ndarray            # uint16 error words
+    context: Dict[str, str]      # latest words of the registers the output row needs
+
+
+class Stage:
+    """
+    One pipeline stage: a bounded input queue and a worker applying
+    `handler` to batches of items.
+
+    A batch is whatever is queued when the worker gets to it, up to
+    batch_size; with max_wait > 0 the worker also waits that long for a
+    batch to fill (for sinks that prefer bulk writes). Outputs are put on
+    the downstream queues with an awaited put, so a full queue stops this
+    worker, which in turn lets its own queue fill: a slow sink slows the
+    source instead of growing memory.
+    """
+
+    def __init__(self, name: str, handler: StageHandler, batch_size: int = 256, max_wait: float = 0.0,
+                 queue_size: int = 1024):
+        self.name = name
+        self.handler = handler
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue(queue_size)
+        self.outputs: List['Stage'] = []
+        # items_in, items_out, batches, errors
+        self.stats = Counter()
+        self.busy_time = 0.0
+        self.blocked_time = 0.0
+        self.max_depth = 0
+
+    async def _next_batch(self) -> List[Any]:
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self):
+        while True:
+            batch = await self._next_batch()
+            self.max_depth = max(self.max_depth, len(batch) + self.queue.qsize())
+            started = time.perf_counter()
+            try:
+                outputs = self.handler(batch)
+                if asyncio.iscoroutine(outputs):
+                    outputs = await outputs
+            except Exception:
+                # Keep the stage alive; the batch is lost (see spool for sinks)
+                self.stats["errors"] += 1
+                logger.exception("Stage %s failed on a batch of %d", self.name, len(batch))
+                outputs = None
+            self.busy_time += time.perf_counter() - started
+            self.stats["items_in"] += len(batch)
+            self.stats["batches"] += 1
+
+            if outputs:
+                started = time.perf_counter()
+                for item in outputs:
+                    self.stats["items_out"] += 1
+                    for stage in self.outputs:
+                        await stage.queue.put(item)
+                self.blocked_time += time.perf_counter() - started
+            for _ in batch:
+                self.queue.task_done()
+
+
+class Pipeline:
+    """
+    Stages chained by bounded queues: stages[0] -> stages[1] -> ... ->
+    every sink. Each stage runs one worker, so items keep their order
+    (per machine and overall).
+
+    on_scan() feeds register frames into the first stage and can be passed
+    to the scan loops / PollScheduler directly; it waits while the first
+    queue is full, which delays the next scan.
+
+    Example:
+        >>> pipeline = build_error_pipeline(MACHINE_NAME_CODE, {"csv": CsvSink("live_errors.csv")})
+        >>> await pipeline.start()
+        >>> await scheduler.run_many(clients, pipeline.on_scan)
+    """
+
+    def __init__(self, stages: List[Stage], sinks: List[Stage]):
+        self.stages = stages
+        self.sinks = sinks
+        for upstream, downstream in zip(stages, stages[1:]):
+            upstream.outputs = [downstream]
+        stages[-1].outputs = list(sinks)
+        self.tasks: List[asyncio.Task] = []
+        self.started = None
+        # frames, submit_blocked (frames that had to wait for room)
+        self.stats = Counter()
+        self.submit_blocked_time = 0.0
+
+    async def start(self):
+        self.started = time.perf_counter()
+        self.tasks = [asyncio.create_task(stage.run(), name=f"stage-{stage.name}")
+                      for stage in self.stages + self.sinks]
+
+    async def submit(self, item: Any):
+        self.stats["frames"] += 1
+        queue = self.stages[0].queue
+        if queue.full():
+            self.stats["submit_blocked"] += 1
+            started = time.perf_counter()
+            await queue.put(item)
+            self.submit_blocked_time += time.perf_counter() - started
+        else:
+            queue.put_nowait(item)
+
+    async def on_scan(self, machine_name: str, timestamp: datetime, registers: Dict[str, str]):
+        await self.submit(Frame(machine_name, timestamp, registers))
+
+    async def drain(self):
+        """Wait until everything submitted so far has gone through every stage and sink."""
+        for stage in self.stages:
+            await stage.queue.join()
+        for sink in self.sinks:
+            await sink.queue.join()
+
+    async def stop(self, drain: bool = True):
+        if drain:
+            await self.drain()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per stage: queue depth, throughput (items/s), mean batch, busy and blocked share of the uptime."""
+        uptime = max(time.perf_counter() - self.started, 1e-9) if self.started else 1e-9
+        metrics = {'source': {
+            'frames': self.stats["frames"],
+            'frames_per_second': self.stats["frames"] / uptime,
+            'submit_blocked': self.stats["submit_blocked"],
+            'submit_blocked_seconds': self.submit_blocked_time,
+        }}
+        for stage in self.stages + self.sinks:
+            batches = stage.stats["batches"]
+            metrics[stage.name] = {
+                'queue_depth': stage.queue.qsize(),
+                'queue_size': stage.queue.maxsize,
+                'max_depth': stage.max_depth,
+                'items_in': stage.stats["items_in"],
+                'items_out': stage.stats["items_out"],
+                'items_per_second': stage.stats["items_in"] / uptime,
+                'mean_batch': stage.stats["items_in"] / batches if batches else 0.0,
+                'busy': stage.busy_time / uptime,
+                'blocked': stage.blocked_time / uptime,
+                'errors': stage.stats["errors"],
+            }
+        return metrics
+
+    async def log_metrics(self, interval: float = 10.0):
+        """Log metrics() every `interval` seconds (run as a task)."""
+        while True:
+            await asyncio.sleep(interval)
+            for name, values in self.metrics().items():
+                logger.info("%s: %s", name, ", ".join(
+                    f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}" for k, v in values.items()))
+
+
+class ErrorRowBuilder:
+    """
+    Pipeline handlers turning register frames into ERROR_TABLE rows.
+
+    decode:  Frame -> ScanWords (error words + the context the row needs)
+    detect:  ScanWords -> ErrorEvent via ErrorTracker.feed_words
+    enrich:  ErrorEvent -> ERROR_TABLE row dict
+
+    Rows are built by the tracker itself: detect hands the context words of
+    every scan with events to add_scan_context(), and enrich runs
+    flush_error_events(final=False), so the rows match
+    CreateErrorTableCode.add_output_row() and follow its debounce_config.
+    Episodes the debouncer may still change are held back; while any are
+    held, detect also passes on the latest scan time so enrich can release
+    them in quiet periods. finish() flushes what is still held at shutdown.
+    """
+
+    def __init__(self, machine_name_code: Dict, errors: Optional[ErrorTracker] = None,
+                 day_night: str = "昼勤", unit_code: str = "10-1719", debounce_config: Optional[Dict] = None):
+        self.machine_name_code = machine_name_code
+        if errors is None:
+            tracker = CreateErrorTableCode(machine_name_code=machine_name_code, day_night=day_night,
+                                           unit_code=unit_code, debounce_config=debounce_config, log_mode="summary")
+            errors = ErrorTracker(machine_name_code, tracker, keep_events=True)
+        elif not errors.keep_events:
+            raise ValueError("ErrorRowBuilder needs an ErrorTracker with keep_events=True")
+        self.errors = errors
+        # Register columns of the PLC-backed columns after the fixed ones
+        column_registers = []
+        for column in list(ERROR_TABLE["columns"])[15:]:
+            addresses = parse_plc_address(ERROR_TABLE["columns"][column].get("PLC_Memory_Address", ""))
+            if addresses:
+                column_registers.append(register_column(*addresses[0]))
+        self.context_registers = [register_column("IO", MODE_REGISTER)] + column_registers
+        # Latest context words per machine (frames may be partial)
+        self.context: Dict[str, Dict[str, str]] = {}
+        # decode_errors, unknown_machines
+        self.stats = Counter()
+
+    @property
+    def tracker(self) -> CreateErrorTableCode:
+        return self.errors.tracker
+
+    def decode(self, frames: List[Frame]) -> List[ScanWords]:
+        scans = []
+        for frame in frames:
+            if frame.machine_name not in self.machine_name_code:
+                self.stats["unknown_machines"] += 1
+                continue
+            try:
+                indices, words = frame_words(self.tracker, frame.machine_name, frame.registers)
+            except ValueError as e:
+                self.stats["decode_errors"] += 1
+                logger.debug("Cannot decode frame of %s: %s", frame.machine_name, e)
+                continue
+            context = self.context.setdefault(frame.machine_name, {})
+            for register in self.context_registers:
+                word = frame.registers.get(register)
+                if word is not None:
+                    context[register] = word
+            scans.append(ScanWords(frame.machine_name, frame.timestamp, indices, words, dict(context)))
+        return scans
+
+    def detect(self, scans: List[ScanWords]) -> List[Any]:
+        """Error events of the scans, plus the latest scan time while the debouncer holds episodes."""
+        outputs = []
+        for scan in scans:
+            events = self.errors.feed_words(scan.machine_name, scan.timestamp, scan.indices, scan.words)
+            if events:
+                self.tracker.add_scan_context(scan.machine_name, scan.timestamp, scan.context)
+                outputs.extend(events)
+        debouncer = self.tracker.debouncer
+        if scans and debouncer is not None and (outputs or len(debouncer.held)):
+            outputs.append(max(scan.timestamp for scan in scans))
+        return outputs
+
+    def enrich(self, items: List[Any]) -> List[Dict[str, Any]]:
+        final = any(item is FINAL_FLUSH for item in items)
+        times = [item.timestamp if isinstance(item, ErrorEvent) else item
+                 for item in items if item is not FINAL_FLUSH]
+        return self.flush_rows(final=final, as_of=max(times) if times else None)
+
+    def flush_rows(self, final: bool = False, as_of: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Rows of the events queued in the tracker (see CreateErrorTableCode.flush_error_events)."""
+        self.tracker.flush_error_events(final=final, as_of=as_of)
+        rows, self.tracker.output_rows = self.tracker.output_rows, []
+        # The rows go to the sinks; a long-running tracker keeps no event history
+        self.tracker.event_log.clear()
+        return rows
+
+    async def finish(self, pipeline: Pipeline):
+        """Drain the pipeline, then send the rows still held back by debouncing to the sinks."""
+        await pipeline.drain()
+        await pipeline.stages[-1].queue.put(FINAL_FLUSH)
+        await pipeline.drain()
+
+
+class CsvSink:
+    """Appends ERROR_TABLE rows to a CSV file (header on the first write), off the event loop."""
+
+    def __init__(self, path: str, columns: Optional[List[str]] = None):
+        self.path = path
+        self.columns = columns or list(ERROR_TABLE["columns"])
+
+    def write(self, rows: List[Dict[str, Any]]):
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        pd.DataFrame(rows, columns=self.columns).to_csv(
+            self.path, mode='a', header=new_file, index=False, encoding='utf-8-sig' if new_file else 'utf-8')
+
+    async def __call__(self, rows: List[Dict[str, Any]]):
+        await asyncio.to_thread(self.write, rows)
+
+
+def build_error_pipeline(machine_name_code: Dict, sinks: Dict[str, StageHandler],
+                         builder: Optional[ErrorRowBuilder] = None, queue_size: int = 1024,
+                         batch_size: int = 256, sink_batch_size: int = 1000,
+                         sink_max_wait: float = 0.5) -> Pipeline:
+    """
+    source -> decode -> detect -> enrich -> sinks for ERROR_TABLE rows.
+
+    Args:
+        sinks: {name: handler(rows)}, e.g. {"csv": CsvSink("live_errors.csv")}; wrap sinks
+               that can go down in SpooledSink so their rows survive an outage
+        builder: ErrorRowBuilder to use (e.g. with debounce_config, or an ErrorTracker that has
+                 alarm callbacks); call builder.finish(pipeline) before stopping to flush held rows
+        sink_batch_size / sink_max_wait: Rows per sink write and how long a sink waits to fill it
+    """
+    builder = builder or ErrorRowBuilder(machine_name_code)
+    stages = [
+        Stage("decode", builder.decode, batch_size, queue_size=queue_size),
+        Stage("detect", builder.detect, batch_size, queue_size=queue_size),
+        Stage("enrich", builder.enrich, batch_size, queue_size=queue_size),
+    ]
+    sink_stages = [Stage(name, handler, sink_batch_size, sink_max_wait, queue_size=queue_size)
+                   for name, handler in sinks.items()]
+    return Pipeline(stages, sink_stages)
+
+
+async def _main():
+    from fins_client import FinsUdpClient, scan_loop
+    from fins_simulator import SyntheticToggles, serve_plcs
+    from read_planner import plan_table_reads
+    from spool import DiskSpool, SpooledSink
+
+    machine_name_code = {f"SIM{i}": {"code": i + 1, "error_pattern": "pattern_1"} for i in range(4)}
+    simulators = await serve_plcs([SyntheticToggles(toggle_probability=0.01, seed=i) for i in range(4)],
+                                  base_port=19600, scan_interval=0.05)
+    clients = []
+    for i in range(len(simulators)):
+        client = FinsUdpClient("127.0.0.1", 19600 + i)
+        await client.connect()
+        clients.append(client)
+
+    async def slow_database(rows):
+        # Stand-in for a database that needs 0.2 s per insert
+        await asyncio.sleep(0.2)
+
+    database = SpooledSink(slow_database, DiskSpool("spool/database"))
+    # Drop error blips shorter than one scan cycle of the simulators
+    debounce = {error_type: {'min_on_time': 0.05, 'min_off_time': 0.05} for error_type in ("起動時異常", "運転中異常")}
+    builder = ErrorRowBuilder(machine_name_code, debounce_config=debounce)
+    pipeline = build_error_pipeline(machine_name_code, {"csv": CsvSink("live_errors.csv"), "database": database},
+                                    builder=builder, queue_size=256)
+    await pipeline.start()
+    reporter = asyncio.create_task(pipeline.log_metrics(2.0))
+    blocks = plan_table_reads(patterns=["pattern_1"])
+    try:
+        await asyncio.gather(*(scan_loop(client, machine_name, blocks, pipeline.on_scan, interval=0.01, cycles=500)
+                               for client, machine_name in zip(clients, machine_name_code)))
+        await builder.finish(pipeline)
+        await pipeline.stop()
+    finally:
+        reporter.cancel()
+        await database.close()
+        for client in clients:
+            client.close()
+        for simulator in simulators:
+            simulator.stop()
+    for name, values in pipeline.metrics().items():
+        logger.info("%s: %s", name, values)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(_main())
@@ -0,0 +1,185 @@
+from Tables_config_codes import ERROR_PATTERN_TYPES, ERROR_TABLE, PRODUCTION_INFO_TABLE
+import asyncio
+import logging
+import math
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Set
+from fins_client import FinsUdpClient, FinsError, ReadBlock
+from fins_protocol import MAX_READ_WORDS
+from read_planner import MODE_REGISTER, parse_plc_address, plan_reads, required_addresses
+
+logger = logging.getLogger(__name__)
+
+# Default polling interval (seconds) per address category
+DEFAULT_INTERVALS = {
+    'error_bits': 0.1,     # IO 550-589, alarm edges
+    'mode': 0.1,           # IO 502 operation mode
+    'work_station': 0.5,   # IO 510-512 working / OK / NG bits
+    'counters': 5.0,       # DM counters, operator / product info
+}
+
+
+class PollGroup(NamedTuple):
+    """Addresses polled together at one interval, {area: {address, ...}}."""
+    name: str
+    interval: float
+    addresses: Dict[str, Set[int]]
+
+
+def _table_column_addresses(column: str) -> Dict[str, Set[int]]:
+    for table in (ERROR_TABLE, PRODUCTION_INFO_TABLE):
+        details = table.get("columns", {}).get(column)
+        if details is not None:
+            addresses = {}
+            for area, word in parse_plc_address(details.get("PLC_Memory_Address", "")):
+                addresses.setdefault(area, set()).add(word)
+            return addresses
+    raise ValueError(f"Column '{column}' not found in ERROR_TABLE or PRODUCTION_INFO_TABLE")
+
+
+def build_poll_groups(intervals: Optional[Dict[str, float]] = None,
+                      column_intervals: Optional[Dict[str, float]] = None,
+                      patterns: Optional[List[str]] = None) -> List[PollGroup]:
+    """
+    Split the addresses the tables need into polling groups.
+
+    Args:
+        intervals: Overrides of DEFAULT_INTERVALS per category
+        column_intervals: {table column: interval} for single columns,
+                          e.g. {"作業者": 30.0} polls DM31600-31601 every 30 s
+        patterns: Error patterns to poll (all by default)
+
+    A column interval wins over the category of its addresses, whether it
+    is faster or slower. Otherwise an address that falls in several groups
+    is polled only by the fastest.
+    """
+    intervals = dict(DEFAULT_INTERVALS, **(intervals or {}))
+    addresses = required_addresses(patterns=patterns)
+    error_bits = set()
+    for pattern in (ERROR_PATTERN_TYPES if patterns is None else patterns):
+        for config in ERROR_PATTERN_TYPES[pattern].values():
+            error_bits.update(range(config['register_start'], config['register_end'] + 1))
+    work_station = PRODUCTION_INFO_TABLE["iot_info"]["Work_station_pattern"]
+    station_bits = {work_station[key] for key in ("Working_bit_reg", "OK_bit_reg", "NG_bit_reg")}
+
+    groups = [
+        PollGroup('error_bits', intervals['error_bits'], {"IO": error_bits}),
+        PollGroup('mode', intervals['mode'], {"IO": {MODE_REGISTER}}),
+        PollGroup('work_station', intervals['work_station'], {"IO": station_bits}),
+        PollGroup('counters', intervals['counters'], {
+            "IO": addresses.get("IO", set()) - error_bits - station_bits - {MODE_REGISTER},
+            "DM": addresses.get("DM", set())}),
+    ]
+    # Explicit column intervals take their addresses out of the categories
+    column_groups = [PollGroup(column, interval, _table_column_addresses(column))
+                     for column, interval in (column_intervals or {}).items()]
+    for column_group in column_groups:
+        for group in groups:
+            for area, words in column_group.addresses.items():
+                group.addresses.get(area, set()).difference_update(words)
+    groups += column_groups
+
+    # Keep each address in its fastest group only
+    claimed = {}
+    for group in sorted(groups, key=lambda g: g.interval):
+        for area, words in group.addresses.items():
+            words -= claimed.setdefault(area, set())
+            claimed[area] |= words
+    return [group for group in groups if any(group.addresses.values())]
+
+
+class PollScheduler:
+    """
+    Multi-rate polling of register groups over one FinsUdpClient per PLC.
+
+    Time runs in ticks of the greatest common divisor of the group
+    intervals; a group is due every interval / tick ticks. The groups due
+    on the same tick are merged into one coalesced read plan (cached per
+    combination of groups), so a tick costs as few round-trips as possible.
+
+    With many PLCs, each one is shifted by a fraction of a tick and its
+    slow groups by whole ticks, so the PLCs do not all send their large
+    counter reads at once. When a scan overruns its tick the missed ticks
+    are skipped rather than sent as a burst.
+
+    Example:
+        >>> scheduler = PollScheduler(build_poll_groups())
+        >>> await scheduler.run_many({"AM322": client_322, "AM323": client_323}, on_scan)
+    """
+
+    def __init__(self, groups: List[PollGroup], gap_tolerance: int = 16, max_words: int = MAX_READ_WORDS):
+        if not groups:
+            raise ValueError("No polling groups")
+        self.groups = groups
+        self.gap_tolerance = gap_tolerance
+        self.max_words = max_words
+        intervals_ms = [max(1, round(group.interval * 1000)) for group in groups]
+        tick_ms = math.gcd(*intervals_ms)
+        self.tick = tick_ms / 1000
+        self.periods = {group.name: interval_ms // tick_ms for group, interval_ms in zip(groups, intervals_ms)}
+        self._plans: Dict[FrozenSet[str], List[ReadBlock]] = {}
+        # ticks, skipped_ticks, reads, words_read, failed_scans
+        self.stats = Counter()
+
+    def due_groups(self, tick: int, phase: int = 0) -> FrozenSet[str]:
+        """Names of the groups polled on `tick` by a PLC shifted by `phase` ticks."""
+        return frozenset(group.name for group in self.groups
+                         if (tick + phase) % self.periods[group.name] == 0)
+
+    def plan(self, names: FrozenSet[str]) -> List[ReadBlock]:
+        """Coalesced block reads for a set of due groups."""
+        if names not in self._plans:
+            addresses = {}
+            for group in self.groups:
+                if group.name in names:
+                    for area, words in group.addresses.items():
+                        addresses.setdefault(area, set()).update(words)
+            self._plans[names] = plan_reads(addresses, self.gap_tolerance, self.max_words)
+        return self._plans[names]
+
+    async def run(self, client: FinsUdpClient, machine_name: str,
+                  on_scan: Callable[[str, datetime, Dict[str, str]], Optional[Awaitable]],
+                  plc_index: int = 0, plc_count: int = 1, ticks: Optional[int] = None):
+        """
+        Poll one PLC and pass every (partial) register frame to
+        on_scan(machine_name, timestamp, registers), like scan_loop().
+        """
+        await asyncio.sleep(self.tick * plc_index / max(plc_count, 1))
+        started = time.perf_counter()
+        tick = 0
+        while ticks is None or tick < ticks:
+            names = self.due_groups(tick, phase=plc_index)
+            if names:
+                blocks = self.plan(names)
+                timestamp = datetime.now()
+                try:
+                    registers = await client.read_registers(blocks)
+                except (TimeoutError, FinsError, ValueError) as e:
+                    self.stats["failed_scans"] += 1
+                    logger.warning("Scan of %s (%s) failed: %s", machine_name, ", ".join(sorted(names)), e)
+                else:
+                    self.stats["reads"] += len(blocks)
+                    self.stats["words_read"] += len(registers)
+                    result = on_scan(machine_name, timestamp, registers)
+                    if asyncio.iscoroutine(result):
+                        await result
+            self.stats["ticks"] += 1
+
+            # Next tick on the fixed grid; skip the ones already missed
+            elapsed_ticks = int((time.perf_counter() - started) / self.tick)
+            if elapsed_ticks > tick + 1:
+                self.stats["skipped_ticks"] += elapsed_ticks - tick - 1
+                tick = elapsed_ticks
+            else:
+                tick += 1
+            await asyncio.sleep(max(0.0, started + tick * self.tick - time.perf_counter()))
+
+    async def run_many(self, clients: Dict[str, FinsUdpClient],
+                       on_scan: Callable[[str, datetime, Dict[str, str]], Optional[Awaitable]],
+                       ticks: Optional[int] = None):
+        """Poll several PLCs ({machine name: client}) from one event loop, staggered."""
+        await asyncio.gather(*(self.run(client, machine_name, on_scan, plc_index=i,
+                                        plc_count=len(clients), ticks=ticks)
+                               for i, (machine_name, client) in enumerate(clients.items())))
@@ -0,0 +1,118 @@
+from Tables_config_codes import ERROR_PATTERN_TYPES, ERROR_TABLE, PRODUCTION_INFO_TABLE
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Set
+from fins_client import ReadBlock
+from fins_protocol import MAX_READ_WORDS
+
+logger = logging.getLogger(__name__)
+
+# Operation mode word (502.12 自動 / 502.13 手動 / 502.14 払出)
+MODE_REGISTER = 502
+
+# "DM31651" -> DM word, "502.12" -> CIO word 502 (bit 12), "510" -> CIO word
+_ADDRESS = re.compile(r"^(?:(DM)(\d+)|(\d+)(?:\.\d+)?)$")
+
+
+def parse_plc_address(address: str) -> List[tuple]:
+    """
+    Word addresses referenced by a PLC_Memory_Address config value.
+
+    Examples:
+        >>> parse_plc_address("DM31651")
+        [('DM', 31651)]
+        >>> parse_plc_address("[502.12,502.13,502.14]")
+        [('IO', 502), ('IO', 502), ('IO', 502)]
+        >>> parse_plc_address("")
+        []
+    """
+    words = []
+    for part in str(address).strip().strip("[]").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        match = _ADDRESS.match(part)
+        if match is None:
+            raise ValueError(f"Unrecognised PLC address '{part}' in '{address}'")
+        if match.group(1):
+            words.append(("DM", int(match.group(2))))
+        else:
+            words.append(("IO", int(match.group(3))))
+    return words
+
+
+def required_addresses(tables: Iterable[Dict] = (ERROR_TABLE, PRODUCTION_INFO_TABLE),
+                       patterns: Optional[Iterable[str]] = None) -> Dict[str, Set[int]]:
+    """
+    Every word the tables need per scan, as {area: {address, ...}}.
+
+    Collects the columns' PLC_Memory_Address values, the work station
+    registers of PRODUCTION_INFO_TABLE, the operation mode word and the
+    error registers of the given patterns (all of ERROR_PATTERN_TYPES by default).
+    """
+    addresses = {"IO": {MODE_REGISTER}, "DM": set()}
+
+    def add(address):
+        for area, word in parse_plc_address(address):
+            addresses[area].add(word)
+
+    for table in tables:
+        for details in table.get("columns", {}).values():
+            add(details.get("PLC_Memory_Address", ""))
+        work_stations = table.get("iot_info", {}).get("Work_station_pattern")
+        if work_stations:
+            for key in ("Working_bit_reg", "OK_bit_reg", "NG_bit_reg"):
+                add(work_stations[key])
+            for station in work_stations["table"]:
+                for key in ("DM_reg", "work_bit", "OK_bit", "NG_bit"):
+                    add(station[key])
+
+    for pattern in (ERROR_PATTERN_TYPES if patterns is None else patterns):
+        for config in ERROR_PATTERN_TYPES[pattern].values():
+            addresses["IO"].update(range(config['register_start'], config['register_end'] + 1))
+
+    return {area: words for area, words in addresses.items() if words}
+
+
+def plan_reads(addresses: Dict[str, Iterable[int]], gap_tolerance: int = 16,
+               max_words: int = MAX_READ_WORDS) -> List[ReadBlock]:
+    """
+    Merge word addresses into as few contiguous block reads as possible.
+
+    Two addresses share a block when at most `gap_tolerance` unused words lie
+    between them and the block stays within `max_words`. Reading a few
+    spare words is much cheaper than another PLC round-trip.
+
+    Example:
+        >>> plan_reads({"IO": [502, 510, 511, 512, 550]}, gap_tolerance=8)
+        [('IO', 502, 11), ('IO', 550, 1)]
+    """
+    if not 1 <= max_words <= MAX_READ_WORDS:
+        raise ValueError(f"max_words must be 1-{MAX_READ_WORDS}")
+    if gap_tolerance < 0:
+        raise ValueError("gap_tolerance must be >= 0")
+
+    blocks = []
+    for area in sorted(addresses):
+        start = end = None
+        for address in sorted(set(addresses[area])):
+            if start is not None and address - end - 1 <= gap_tolerance and address - start < max_words:
+                end = address
+                continue
+            if start is not None:
+                blocks.append((area, start, end - start + 1))
+            start = end = address
+        if start is not None:
+            blocks.append((area, start, end - start + 1))
+    return blocks
+
+
+def plan_table_reads(gap_tolerance: int = 16, max_words: int = MAX_READ_WORDS,
+                     patterns: Optional[Iterable[str]] = None) -> List[ReadBlock]:
+    """Block reads covering ERROR_TABLE, PRODUCTION_INFO_TABLE and the error patterns."""
+    addresses = required_addresses(patterns=patterns)
+    blocks = plan_reads(addresses, gap_tolerance, max_words)
+    logger.info("Read plan: %d words in %d blocks (%d words read)",
+                sum(len(words) for words in addresses.values()), len(blocks),
+                sum(count for _, _, count in blocks))
+    return blocks
@@ -0,0 +1,176 @@
+import logging
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from fins_client import parse_triton_column, register_column
+
+logger = logging.getLogger(__name__)
+
+# Series name of the active error count (same as the OPC UA node under the machine)
+ERROR_COUNT_SERIES = "ActiveErrors.Count"
+
+
+class _ChangeSeries:
+    """
+    Values of one (machine, register) stored on change only, sorted by time.
+
+    Live values are buffered in lists and merged into the numpy arrays on
+    the next read, so appending costs O(1) and reading stays two binary
+    searches plus a slice.
+    """
+
+    def __init__(self):
+        self.times = np.empty(0, dtype=np.int64)
+        self.values = np.empty(0, dtype=np.int64)
+        self._pending_times = []
+        self._pending_values = []
+        self._last = None
+
+    def append(self, time_ns: int, value: int):
+        if value == self._last:
+            return
+        self._last = value
+        self._pending_times.append(time_ns)
+        self._pending_values.append(value)
+
+    def extend(self, times: np.ndarray, values: np.ndarray):
+        """Bulk add (times sorted); keeps only values differing from the previous one."""
+        self._consolidate()
+        times = np.concatenate([self.times, times])
+        values = np.concatenate([self.values, values])
+        if len(times) > 1 and (np.diff(times) < 0).any():
+            order = np.argsort(times, kind='stable')
+            times, values = times[order], values[order]
+        keep = np.ones(len(values), dtype=bool)
+        keep[1:] = values[1:] != values[:-1]
+        self.times, self.values = times[keep], values[keep]
+        self._last = int(self.values[-1]) if len(self.values) else None
+
+    def _consolidate(self):
+        if self._pending_times:
+            self.times = np.concatenate([self.times, np.array(self._pending_times, dtype=np.int64)])
+            self.values = np.concatenate([self.values, np.array(self._pending_values, dtype=np.int64)])
+            self._pending_times = []
+            self._pending_values = []
+
+    def slice(self, start_ns: Optional[int], end_ns: Optional[int],
+              include_prior: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """Values with start_ns <= time <= end_ns (plus the one in effect at start_ns)."""
+        self._consolidate()
+        lo = 0 if start_ns is None else int(np.searchsorted(self.times, start_ns, side='left'))
+        hi = len(self.times) if end_ns is None else int(np.searchsorted(self.times, end_ns, side='right'))
+        if include_prior and lo > 0 and (lo == len(self.times) or start_ns is None or self.times[lo] > start_ns):
+            lo -= 1
+        return self.times[lo:hi], self.values[lo:hi]
+
+
+class RegisterArchive:
+    """
+    Time-indexed history of register words and active error counts per machine.
+
+    Every (machine, register) is kept as a change-only series, so a day of
+    0.1 s scans of a counter that changes twice costs two points, and a
+    one-hour trend of a tag touches only the rows inside that hour.
+
+    Sources:
+        load_triton()   - Triton wide exports (raw device or combined format)
+        load_episodes() - ErrorEpisodeStore episodes, as the active error count
+        append()        - live register frames (on_scan signature)
+        record()        - any other live value, e.g. the active error count
+
+    Times are nanoseconds of naive local timestamps, like the error tracker.
+    """
+
+    def __init__(self):
+        self.series: Dict[Tuple[str, str], _ChangeSeries] = {}
+
+    def _series(self, machine_name: str, name: str) -> _ChangeSeries:
+        key = (machine_name, name)
+        if key not in self.series:
+            self.series[key] = _ChangeSeries()
+        return self.series[key]
+
+    def machines(self) -> List[str]:
+        return sorted({machine for machine, _ in self.series})
+
+    def load_triton(self, path: str, machine_name: Optional[str] = None):
+        """
+        Add a Triton export (CSV or Parquet). Combined exports carry
+        Machine_Name; raw device exports need machine_name.
+        """
+        df = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path, dtype=str)
+        if 'Machine_Name' not in df.columns:
+            if machine_name is None:
+                raise ValueError(f"{path} has no Machine_Name column; pass machine_name")
+            df['Machine_Name'] = machine_name
+        elif machine_name is not None:
+            df = df[df['Machine_Name'] == machine_name]
+
+        registers = {col: parse_triton_column(col) for col in df.columns}
+        registers = {col: register_column(*register) for col, register in registers.items() if register is not None}
+        times = pd.to_datetime(df['Timestamp']).values.astype('datetime64[ns]').astype(np.int64)
+        words = df[list(registers)].fillna("0").apply(
+            lambda column: column.map(lambda word: int(word, 16) if word else 0)).to_numpy(dtype=np.int64)
+
+        for machine in df['Machine_Name'].unique():
+            rows = np.flatnonzero((df['Machine_Name'] == machine).to_numpy())
+            order = rows[np.argsort(times[rows], kind='stable')]
+            for i, register in enumerate(registers.values()):
+                self._series(machine, register).extend(times[order], words[order, i])
+        logger.info("Archived %d rows x %d registers from %s", len(df), len(registers), path)
+
+    def load_episodes(self, episodes: pd.DataFrame):
+        """Add the active error count per machine as a step series from episodes (EPISODE_COLUMNS)."""
+        for machine, group in episodes.groupby('Machine_Name'):
+            starts = pd.to_datetime(group['start']).values.astype('datetime64[ns]').astype(np.int64)
+            ends = pd.to_datetime(group['end'])
+            ends = ends[ends.notna()].values.astype('datetime64[ns]').astype(np.int64)
+            times = np.concatenate([starts, ends])
+            deltas = np.concatenate([np.ones(len(starts), dtype=np.int64), -np.ones(len(ends), dtype=np.int64)])
+            order = np.argsort(times, kind='stable')
+            times, counts = times[order], np.cumsum(deltas[order])
+            # One point per timestamp: the count after all changes at that time
+            last = np.ones(len(times), dtype=bool)
+            last[:-1] = times[1:] != times[:-1]
+            self._series(machine, ERROR_COUNT_SERIES).extend(times[last], counts[last])
+
+    def append(self, machine_name: str, timestamp: datetime, registers: Dict[str, str]):
+        """Archive one live register frame (hex words)."""
+        time_ns = pd.Timestamp(timestamp).value
+        for register, word in registers.items():
+            self._series(machine_name, register).append(time_ns, int(word, 16))
+
+    def record(self, machine_name: str, name: str, timestamp: datetime, value: int):
+        self._series(machine_name, name).append(pd.Timestamp(timestamp).value, int(value))
+
+    def window(self, machine_name: str, names: Iterable[str], start_ns: Optional[int], end_ns: Optional[int],
+               include_prior: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Aligned values of several series in [start_ns, end_ns].
+
+        Returns (times, values[n_times, n_names]) at every time any of the
+        series changed, each column holding the value in effect at that
+        time. Times before all series have a value are dropped.
+        """
+        names = list(names)
+        # Slice with the prior value of every series so multi-word values
+        # changing in one word only still get the other word's value
+        parts = [self.series[(machine_name, name)].slice(start_ns, end_ns, include_prior=True)
+                 if (machine_name, name) in self.series else (np.empty(0, np.int64), np.empty(0, np.int64))
+                 for name in names]
+        times = np.unique(np.concatenate([part_times for part_times, _ in parts]))
+        values = np.zeros((len(times), len(names)), dtype=np.int64)
+        valid = np.ones(len(times), dtype=bool)
+        for i, (part_times, part_values) in enumerate(parts):
+            position = np.searchsorted(part_times, times, side='right') - 1
+            valid &= position >= 0
+            values[:, i] = part_values[np.maximum(position, 0)] if len(part_values) else 0
+        times, values = times[valid], values[valid]
+
+        if start_ns is not None:
+            first = int(np.searchsorted(times, start_ns, side='left'))
+            if include_prior and first > 0 and (first == len(times) or times[first] > start_ns):
+                first -= 1
+            times, values = times[first:], values[first:]
+        return times, values
@@ -0,0 +1,290 @@
+import asyncio
+import json
+import logging
+import os
+import struct
+import zlib
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Record header: payload length, CRC32 of the payload
+_RECORD_HEADER = struct.Struct('<II')
+_SEGMENT_SUFFIX = ".seg"
+_CURSOR_FILE = "cursor.json"
+
+# (segment id, byte offset) in the spool
+Position = Tuple[int, int]
+
+
+class DiskSpool:
+    """
+    Append-only on-disk FIFO of row batches, for sinks that can go away.
+
+    Batches are written as records [length][crc32][JSON rows] to segment
+    files of about `segment_bytes` in `directory`; a cursor file keeps the
+    position of the oldest batch not yet delivered. Batches come back out in
+    the order they went in, so rows of one machine stay in order.
+
+    A record whose checksum does not match (a torn write at a crash, a bad
+    disk block) ends its segment: the rest of that segment is skipped and
+    counted as corrupt. When the spool would grow past `max_bytes` the
+    oldest segments are dropped, so an outage that outlasts the disk
+    budget loses the oldest rows rather than stopping ingestion.
+
+    With fsync every append and cursor update is forced to disk; without
+    it a power cut can lose the last few batches, but not order or
+    integrity of the rest.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 16 * 2**20, max_bytes: int = 1024 * 2**20,
+                 fsync: bool = False):
+        if max_bytes < 2 * segment_bytes:
+            raise ValueError("max_bytes must hold at least two segments")
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.fsync = fsync
+        # appended_batches, appended_rows, delivered_rows, corrupt_records,
+        # segments_dropped, bytes_dropped
+        self.stats = Counter()
+        os.makedirs(directory, exist_ok=True)
+
+        self.segments: Dict[int, int] = {}   # {segment id: size in bytes}
+        for name in os.listdir(directory):
+            if name.endswith(_SEGMENT_SUFFIX):
+                segment_id = int(name[:-len(_SEGMENT_SUFFIX)])
+                self.segments[segment_id] = os.path.getsize(self._path(segment_id))
+        self.cursor = self._load_cursor()
+        for segment_id in [s for s in self.segments if s < self.cursor[0]]:
+            self._remove(segment_id)
+        if not self.segments:
+            self.segments[self.cursor[0]] = 0
+            open(self._path(self.cursor[0]), 'ab').close()
+        self._recover_tail()
+        self.writer = open(self._path(self.write_segment), 'ab')
+        logger.info("Spool %s: %d segments, %d bytes pending", directory, len(self.segments), self.pending_bytes)
+
+    def _path(self, segment_id: int) -> str:
+        return os.path.join(self.directory, f"{segment_id:012d}{_SEGMENT_SUFFIX}")
+
+    @property
+    def write_segment(self) -> int:
+        return max(self.segments)
+
+    @property
+    def pending_bytes(self) -> int:
+        """Bytes not yet delivered."""
+        return sum(self.segments.values()) - (self.cursor[1] if self.cursor[0] in self.segments else 0)
+
+    @property
+    def empty(self) -> bool:
+        return self.cursor == (self.write_segment, self.segments[self.write_segment])
+
+    def _load_cursor(self) -> Position:
+        path = os.path.join(self.directory, _CURSOR_FILE)
+        if os.path.exists(path):
+            with open(path) as f:
+                cursor = json.load(f)
+            return cursor['segment'], cursor['offset']
+        return (min(self.segments), 0) if self.segments else (0, 0)
+
+    def _save_cursor(self):
+        path = os.path.join(self.directory, _CURSOR_FILE)
+        with open(path + ".tmp", 'w') as f:
+            json.dump({'segment': self.cursor[0], 'offset': self.cursor[1]}, f)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    def _remove(self, segment_id: int):
+        os.remove(self._path(segment_id))
+        del self.segments[segment_id]
+
+    def _recover_tail(self):
+        """Cut a torn record off the end of the write segment."""
+        segment_id = self.write_segment
+        start = self.cursor[1] if self.cursor[0] == segment_id else 0
+        end = start
+        for _, end in self._records(segment_id, start):
+            pass
+        if end < self.segments[segment_id]:
+            logger.warning("Spool segment %d: truncating %d bytes after offset %d",
+                           segment_id, self.segments[segment_id] - end, end)
+            with open(self._path(segment_id), 'r+b') as f:
+                f.truncate(end)
+            self.segments[segment_id] = end
+
+    def _records(self, segment_id: int, offset: int):
+        """Yield (rows, offset after the record) from offset until the end or the first bad record."""
+        with open(self._path(segment_id), 'rb') as f:
+            f.seek(offset)
+            while True:
+                header = f.read(_RECORD_HEADER.size)
+                if not header:
+                    return
+                if len(header) < _RECORD_HEADER.size:
+                    self._corrupt(segment_id, offset, "truncated header")
+                    return
+                length, checksum = _RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    self._corrupt(segment_id, offset, "checksum mismatch")
+                    return
+                offset += _RECORD_HEADER.size + length
+                yield json.loads(payload), offset
+
+    def _corrupt(self, segment_id: int, offset: int, reason: str):
+        self.stats["corrupt_records"] += 1
+        logger.error("Spool segment %d: %s at offset %d, skipping the rest of the segment",
+                     segment_id, reason, offset)
+
+    def append(self, rows: List[Dict[str, Any]]):
+        """Append one batch of rows (JSON-serialisable values; others are stored as str)."""
+        if not rows:
+            return
+        payload = json.dumps(rows, ensure_ascii=False, default=str).encode('utf-8')
+        record = _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        if self.segments[self.write_segment] + len(record) > self.segment_bytes \
+                and self.segments[self.write_segment] > 0:
+            self._roll()
+        self._enforce_budget(len(record))
+
+        self.writer.write(record)
+        self.writer.flush()
+        if self.fsync:
+            os.fsync(self.writer.fileno())
+        self.segments[self.write_segment] += len(record)
+        self.stats["appended_batches"] += 1
+        self.stats["appended_rows"] += len(rows)
+
+    def _roll(self):
+        self.writer.close()
+        self.segments[self.write_segment + 1] = 0
+        self.writer = open(self._path(self.write_segment), 'ab')
+
+    def _enforce_budget(self, incoming: int):
+        while sum(self.segments.values()) + incoming > self.max_bytes and len(self.segments) > 1:
+            oldest = min(self.segments)
+            dropped = self.segments[oldest] - (self.cursor[1] if self.cursor[0] == oldest else 0)
+            self._remove(oldest)
+            self.stats["segments_dropped"] += 1
+            self.stats["bytes_dropped"] += dropped
+            logger.error("Spool over %d bytes: dropped segment %d (%d undelivered bytes)",
+                         self.max_bytes, oldest, dropped)
+            if self.cursor[0] <= oldest:
+                self.cursor = (min(self.segments), 0)
+                self._save_cursor()
+
+    def read(self, max_rows: int = 10000) -> Tuple[List[Dict[str, Any]], Position]:
+        """
+        Oldest undelivered rows, whole batches up to max_rows (at least one
+        batch), and the position to ack() once they are delivered.
+        """
+        rows = []
+        segment_id, offset = self.cursor
+        while segment_id <= self.write_segment and len(rows) < max_rows:
+            if segment_id not in self.segments:
+                segment_id, offset = segment_id + 1, 0
+                continue
+            for batch, offset in self._records(segment_id, offset):
+                rows.extend(batch)
+                if len(rows) >= max_rows:
+                    break
+            else:
+                # End of the segment, or a bad record: skip what is left of it
+                offset = self.segments[segment_id]
+                if segment_id < self.write_segment:
+                    segment_id, offset = segment_id + 1, 0
+                    continue
+            break
+        return rows, (segment_id, offset)
+
+    def ack(self, position: Position, rows: int = 0):
+        """Mark everything before `position` delivered and delete finished segments."""
+        self.cursor = position
+        for segment_id in [s for s in self.segments if s < position[0]]:
+            self._remove(segment_id)
+        self._save_cursor()
+        self.stats["delivered_rows"] += rows
+
+    def close(self):
+        self.writer.close()
+
+
+class SpooledSink:
+    """
+    Sink handler that never fails: rows the wrapped sink cannot take are
+    appended to a DiskSpool and replayed in large batches once it is back.
+
+    While anything is spooled, new rows go to the spool too, so the sink
+    receives every machine's rows in their original order. Replay runs as
+    a background task retrying every `retry_interval` seconds (doubling up
+    to `max_retry_interval` while the sink stays down).
+
+    Example:
+        >>> database = SpooledSink(insert_rows, DiskSpool("spool/database"))
+        >>> pipeline = build_error_pipeline(MACHINE_NAME_CODE, {"database": database})
+    """
+
+    def __init__(self, handler: Callable[[List[Dict[str, Any]]], Any], spool: DiskSpool,
+                 replay_rows: int = 10000, retry_interval: float = 1.0, max_retry_interval: float = 30.0):
+        self.handler = handler
+        self.spool = spool
+        self.replay_rows = replay_rows
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self._replay_task: Optional[asyncio.Task] = None
+        # delivered_rows, spooled_rows, failures, replayed_rows
+        self.stats = Counter()
+
+    async def _deliver(self, rows: List[Dict[str, Any]]):
+        result = self.handler(rows)
+        if asyncio.iscoroutine(result):
+            await result
+
+    async def __call__(self, rows: List[Dict[str, Any]]):
+        if self.spool.empty:
+            try:
+                await self._deliver(rows)
+                self.stats["delivered_rows"] += len(rows)
+                return
+            except Exception as e:
+                self.stats["failures"] += 1
+                logger.warning("Sink failed (%s), spooling %d rows", e, len(rows))
+        self.spool.append(rows)
+        self.stats["spooled_rows"] += len(rows)
+        self.start()
+
+    def start(self):
+        """Start replaying if anything is spooled (e.g. left over from the last run)."""
+        if not self.spool.empty and (self._replay_task is None or self._replay_task.done()):
+            self._replay_task = asyncio.ensure_future(self.replay())
+
+    async def replay(self):
+        """Deliver the spool oldest first until it is empty."""
+        delay = self.retry_interval
+        while not self.spool.empty:
+            rows, position = self.spool.read(self.replay_rows)
+            try:
+                if rows:
+                    await self._deliver(rows)
+            except Exception as e:
+                self.stats["failures"] += 1
+                logger.warning("Sink still failing (%s), retrying in %.1fs (%d bytes spooled)",
+                               e, delay, self.spool.pending_bytes)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_interval)
+                continue
+            self.spool.ack(position, len(rows))
+            self.stats["replayed_rows"] += len(rows)
+            delay = self.retry_interval
+        logger.info("Spool replayed (%d rows so far)", self.stats["replayed_rows"])
+
+    async def close(self):
+        if self._replay_task is not None:
+            self._replay_task.cancel()
+            await asyncio.gather(self._replay_task, return_exceptions=True)
+        self.spool.close()
@@ -0,0 +1,15 @@
+# Make the sibling stage directories importable when running from 5_live_ingest
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SIBLING_STAGES = (
+    "3_data_converter",                # PLCDataConverter
+    "1_Triton_csv_data_ERROR_TABLE",   # CreateErrorTableCode, ErrorBitLayout
+)
+
+for stage in SIBLING_STAGES:
+    stage_dir = os.path.join(ROOT_DIR, stage)
+    if stage_dir not in sys.path:
+        sys.path.append(stage_dir)
@@ -0,0 +1,10 @@
+# Stage modules import each other by plain name, as when the scripts are
+# run from the stage directory; stage_paths adds the sibling stages
+import os
+import sys
+
+STAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if STAGE_DIR not in sys.path:
+    sys.path.insert(0, STAGE_DIR)
+
+import stage_paths  # noqa: E402,F401
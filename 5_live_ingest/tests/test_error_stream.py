@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+from error_events import OFF_STATUS, ON_STATUS
+from error_stream import ErrorTracker
+from main_error_table_code import CreateErrorTableCode
+
+MACHINE_NAME_CODE = {"AM322": {"code": 1, "error_pattern": "pattern_1"}}
+T0 = datetime(2025, 11, 27, 10, 0, 0)
+
+
+def _frames(errors):
+    errors.feed("AM322", T0, {"IO_0502": "9000", "IO_0550": "0000", "D_31651": "0007"})
+    errors.feed("AM322", T0 + timedelta(seconds=1), {"IO_0550": "0001"})
+    errors.feed("AM322", T0 + timedelta(seconds=4), {"IO_0502": "A000", "IO_0550": "0000"})
+
+
+def test_feed_dispatches_start_and_end():
+    errors = ErrorTracker(MACHINE_NAME_CODE)
+    received = []
+    errors.add_callback(received.append)
+    _frames(errors)
+
+    assert [event.number_status for event in received] == [ON_STATUS, OFF_STATUS]
+    assert received[1].duration == 3
+    assert errors.tracker.error_events == []
+
+
+def test_keep_events_flush_builds_rows_from_streamed_frames():
+    errors = ErrorTracker(MACHINE_NAME_CODE, keep_events=True)
+    _frames(errors)
+    errors.tracker.flush_error_events(final=False)
+
+    rows = errors.tracker.get_output_dataframe()
+    columns = list(rows.columns)
+    assert rows[columns[12]].tolist() == [ON_STATUS, OFF_STATUS]      # ON/OFF
+    assert rows[columns[8]].tolist() == ["自動", "手動"]               # 運転モード
+    assert rows[columns[15]].tolist() == ["0007", "0007"]             # ﾜｰｸ№ST1 (D_31651)
+    assert rows[columns[13]].tolist() == [0, 3]                       # 起動時異常停止時間(s)
+    assert errors.tracker.scan_context == {}
+
+
+def test_keep_events_flush_with_debounce_across_flushes():
+    tracker = CreateErrorTableCode(machine_name_code=MACHINE_NAME_CODE, log_mode="summary",
+                                   debounce_config={'起動時異常': {'min_on_time': 2}})
+    errors = ErrorTracker(MACHINE_NAME_CODE, tracker=tracker, keep_events=True)
+    errors.feed("AM322", T0, {"IO_0502": "9000", "IO_0550": "0001"})
+    tracker.flush_error_events(final=False)
+    # Start held back until it outlives min_on_time, with its scan words
+    assert tracker.output_rows == [] and len(tracker.scan_context) == 1
+
+    errors.feed("AM322", T0 + timedelta(seconds=5), {"IO_0550": "0000"})
+    tracker.flush_error_events(final=False)
+    rows = tracker.get_output_dataframe()
+    columns = list(rows.columns)
+    assert rows[columns[12]].tolist() == [ON_STATUS, OFF_STATUS]
+    assert rows[columns[8]].tolist() == ["自動", "自動"]
+    assert tracker.scan_context == {}
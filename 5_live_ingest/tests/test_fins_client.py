@@ -0,0 +1,77 @@
+import asyncio
+import socket
+import numpy as np
+import pytest
+from fins_client import FinsUdpClient, _PendingRead
+from fins_protocol import FinsNode, decode_frame, encode_read_request, encode_response
+from fins_simulator import FinsPLCSimulator
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _serve(latency: float):
+    simulator = FinsPLCSimulator(latency=latency)
+    simulator.memory.write("IO", np.array([550]), np.array([0x1111]))
+    simulator.memory.write("DM", np.array([31600]), np.array([0x2222]))
+    port = _free_port()
+    await simulator.start("127.0.0.1", port)
+    return simulator, port
+
+
+def test_late_response_is_not_taken_for_a_newer_read_on_the_same_sid():
+    async def main():
+        simulator, port = await _serve(latency=0.15)
+        client = FinsUdpClient("127.0.0.1", port, timeout=0.1, retries=0)
+        await client.connect()
+        try:
+            with pytest.raises(TimeoutError):
+                await client.read_hex_words("IO", 550, 1)
+            abandoned = next(iter(client.quarantine))
+            # As if the SIDs had wrapped around: the next read would reuse it
+            client._next_sid = abandoned
+            client.timeout = 1.0
+            words = await client.read_hex_words("DM", 31600, 1)
+            return words, abandoned, client
+        finally:
+            client.close()
+            simulator.stop()
+
+    words, abandoned, client = asyncio.run(main())
+    assert words == ["2222"]
+    assert client.stats["late_responses"] == 1
+    assert abandoned in client.quarantine
+
+
+def test_response_with_other_word_count_is_dropped():
+    async def main():
+        client = FinsUdpClient("127.0.0.1")
+        sid = client._allocate_sid()
+        future = asyncio.get_running_loop().create_future()
+        client.pending[sid] = _PendingRead(future, 2)
+        request = decode_frame(encode_read_request(FinsNode(), FinsNode(0, 0xEF, 0), sid, "IO", 550, 2))
+        client._on_datagram(encode_response(request, b"\x00\x01"))             # 1 word
+        assert not future.done() and sid in client.pending
+        client._on_datagram(encode_response(request, b"\x00\x01\x00\x02"))     # 2 words
+        assert future.done() and sid not in client.pending
+        return client
+
+    client = asyncio.run(main())
+    assert client.stats["mismatched_responses"] == 1
+
+
+def test_quarantined_sids_are_released_after_the_timeout():
+    async def main():
+        client = FinsUdpClient("127.0.0.1", timeout=0.05)
+        now = asyncio.get_running_loop().time()
+        client.quarantine = {0: now + 0.05}
+        assert client._allocate_sid() == 1
+        await asyncio.sleep(0.06)
+        client._next_sid = 0
+        assert client._allocate_sid() == 0
+        assert client.quarantine == {}
+
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import datetime, timedelta
+from asyncua import ua
+from opcua_history import AGGREGATES, ArchiveHistoryStorage, RegisterHistoryManager, aggregate
+from register_archive import RegisterArchive
+
+S = 10**9
+T0 = datetime(2025, 11, 27, 10, 0, 0)
+T0_NS = pd.Timestamp(T0).value
+
+# Change-only series: 10 from 0 s, 20 from 3 s, 5 from 5 s
+TIMES = np.array([0, 3, 5], dtype=np.int64) * S
+VALUES = np.array([10, 20, 5], dtype=np.int64)
+
+# Intervals of 2 s from -2 s to 8 s; the last one has no point of its own
+EXPECTED = {
+    'Minimum': [np.nan, 10, 10, 5, 5],
+    'Maximum': [np.nan, 10, 20, 20, 5],
+    'Average': [np.nan, 10, 15, 12.5, 5],
+    'Start': [np.nan, 10, 10, 20, 5],
+    'End': [np.nan, 10, 20, 5, 5],
+    'Count': [0, 1, 1, 1, 0],
+}
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_stepped_aggregates_per_interval(name):
+    starts, values, counts = aggregate(TIMES, VALUES, -2 * S, 8 * S, 2 * S, name)
+
+    assert starts.tolist() == [t * S for t in (-2, 0, 2, 4, 6)]
+    np.testing.assert_array_equal(values, EXPECTED[name])
+    assert counts.tolist() == EXPECTED['Count']
+
+
+def test_average_is_weighted_by_hold_time():
+    # 10 for 1 s, then 40 for 3 s
+    _, values, _ = aggregate(np.array([0, S]), np.array([10, 40]), 0, 4 * S, 4 * S, 'Average')
+    assert values.tolist() == [(10 * 1 + 40 * 3) / 4]
+
+
+def test_interval_starts_with_prior_value_only_when_passed():
+    # Sliced without the prior point, the first interval has no value in effect
+    _, values, _ = aggregate(TIMES[1:], VALUES[1:], 2 * S, 4 * S, 2 * S, 'Minimum')
+    assert values.tolist() == [20]
+    _, values, _ = aggregate(TIMES, VALUES, 2 * S, 4 * S, 2 * S, 'Minimum')
+    assert values.tolist() == [10]
+
+
+def _archive():
+    archive = RegisterArchive()
+    for seconds, registers in [(1, {"D_31652": "0001", "D_31653": "0000"}), (2, {"D_31653": "0002"}),
+                               (3, {"D_31653": "0003"}), (5, {"D_31652": "0002"})]:
+        archive.append("AM322", T0 + timedelta(seconds=seconds), registers)
+    return archive
+
+
+def test_window_aligns_words_with_their_prior_values():
+    times, values = _archive().window("AM322", ["D_31652", "D_31653"], T0_NS + 4 * S, None)
+    # Only the high word changes at 5 s; the low word keeps its value from 3 s
+    assert (times - T0_NS).tolist() == [5 * S]
+    assert values.tolist() == [[2, 3]]
+
+
+def test_window_with_prior_starts_at_the_row_in_effect():
+    times, values = _archive().window("AM322", ["D_31652", "D_31653"], T0_NS + 4 * S, T0_NS + 10 * S,
+                                      include_prior=True)
+    assert (times - T0_NS).tolist() == [3 * S, 5 * S]
+    assert values.tolist() == [[1, 3], [2, 3]]
+
+
+def test_window_drops_times_before_every_series_has_a_value():
+    archive = _archive()
+    archive.append("AM322", T0, {"D_31654": "0007"})
+    times, values = archive.window("AM322", ["D_31652", "D_31654"], None, None)
+    assert (times - T0_NS).tolist() == [1 * S, 5 * S]
+    assert values.tolist() == [[1, 7], [2, 7]]
+
+
+def test_read_processed_answers_hourly_intervals_with_bad_no_data_before_the_first_point():
+    archive = RegisterArchive()
+    for seconds, word in [(0, "000A"), (3, "0014"), (5, "0005")]:
+        archive.append("AM322", T0 + timedelta(seconds=seconds), {"D_31651": word})
+    storage = ArchiveHistoryStorage(archive, lambda node_id: ("AM322", ["D_31651"], None))
+    manager = RegisterHistoryManager(None, storage)
+    aggregate_id = next(node_id for node_id, name in AGGREGATES.items() if name == 'Average')
+    details = ua.ReadProcessedDetails(
+        StartTime=(T0 - timedelta(seconds=2)).astimezone(), EndTime=(T0 + timedelta(seconds=8)).astimezone(),
+        ProcessingInterval=2000, AggregateType=[aggregate_id])
+
+    result = manager._read_processed(details, ua.HistoryReadValueId(NodeId=ua.NodeId("AM322.D_31651", 2)), 0)
+    data_values = result.HistoryData.DataValues
+    assert data_values[0].StatusCode.value == ua.StatusCodes.BadNoData
+    assert [data_value.Value.Value for data_value in data_values[1:]] == EXPECTED['Average'][1:]
@@ -0,0 +1,83 @@
+import asyncio
+import socket
+from datetime import datetime, timedelta, timezone
+from asyncua import Server, ua
+from opcua_ingest import OpcUaIngest, build_tag_map
+
+REGISTERS = ["IO_0550", "IO_0551"]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _start_server(port: int):
+    server = Server()
+    await server.init()
+    server.set_endpoint(f"opc.tcp://127.0.0.1:{port}/test/")
+    namespace_index = await server.register_namespace("urn:test-plc")
+    machine = await server.nodes.objects.add_object(ua.NodeId("AM323", namespace_index), "AM323")
+    for register in REGISTERS:
+        await machine.add_variable(ua.NodeId(f"AM323.{register}", namespace_index), register,
+                                   ua.Variant(0, ua.VariantType.UInt16))
+    await server.start()
+    return server, namespace_index
+
+
+async def _write(server, namespace_index, register, value, source_time):
+    await server.write_attribute_value(ua.NodeId(f"AM323.{register}", namespace_index), ua.DataValue(
+        ua.Variant(value, ua.VariantType.UInt16), SourceTimestamp=source_time))
+
+
+def _run(scenario):
+    async def main():
+        port = _free_port()
+        server, namespace_index = await _start_server(port)
+        frames = []
+        ingest = OpcUaIngest(f"opc.tcp://127.0.0.1:{port}/test/",
+                             build_tag_map(["AM323"], REGISTERS, namespace_index=namespace_index),
+                             lambda machine_name, timestamp, registers: frames.append(
+                                 (machine_name, timestamp, registers)))
+        await ingest.connect()
+        try:
+            await scenario(server, namespace_index, ingest, frames)
+        finally:
+            await ingest.disconnect()
+            await server.stop()
+        return frames
+    return asyncio.run(main())
+
+
+def test_poll_reads_every_tag_as_hex_words():
+    async def scenario(server, namespace_index, ingest, frames):
+        await _write(server, namespace_index, "IO_0550", 0x1CA2, datetime.now(timezone.utc))
+        await ingest.poll(interval=0.01, cycles=2)
+
+    frames = _run(scenario)
+    assert len(frames) == 2
+    machine_name, timestamp, registers = frames[0]
+    assert machine_name == "AM323"
+    assert registers == {"IO_0550": "1CA2", "IO_0551": "0000"}
+    assert abs((datetime.now() - timestamp).total_seconds()) < 10
+
+
+def test_subscribe_delivers_every_queued_value_with_its_source_time():
+    source_times = []
+
+    async def scenario(server, namespace_index, ingest, frames):
+        await ingest.subscribe(sampling_interval=0, publishing_interval=500, queue_size=10)
+        await asyncio.sleep(0.8)
+        del frames[:]   # initial values
+        # A 0 -> 1 -> 0 pulse within one publishing interval
+        base = datetime.now(timezone.utc).replace(microsecond=0)
+        for i, value in enumerate([0x0001, 0x0000]):
+            source_times.append(base + timedelta(milliseconds=100 * (i + 1)))
+            await _write(server, namespace_index, "IO_0550", value, source_times[-1])
+        await asyncio.sleep(1.2)
+
+    frames = _run(scenario)
+    assert [registers for _, _, registers in frames] == [{"IO_0550": "0001"}, {"IO_0550": "0000"}]
+    assert [timestamp for _, timestamp, _ in frames] == \
+        [t.astimezone().replace(tzinfo=None) for t in source_times]
@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime, timedelta
+from error_events import OFF_STATUS, ON_STATUS
+from error_stream import ErrorTracker
+from pipeline import ErrorRowBuilder, build_error_pipeline
+
+MACHINE_NAME_CODE = {"AM322": {"code": 1, "error_pattern": "pattern_1"}}
+T0 = datetime(2025, 11, 27, 10, 0, 0)
+DEBOUNCE = {'起動時異常': {'min_on_time': 2, 'min_off_time': 2}}
+
+
+def _at(seconds: float) -> datetime:
+    return T0 + timedelta(seconds=seconds)
+
+
+def _run(frames, builder=None, finish=True, **options):
+    """Rows the pipeline hands to its sink for (seconds, registers) frames."""
+    rows = []
+    builder = builder or ErrorRowBuilder(MACHINE_NAME_CODE)
+
+    async def main():
+        pipeline = build_error_pipeline(MACHINE_NAME_CODE, {"rows": rows.extend}, builder=builder, **options)
+        await pipeline.start()
+        for seconds, registers in frames:
+            await pipeline.on_scan("AM322", _at(seconds), registers)
+        if finish:
+            await builder.finish(pipeline)
+        await pipeline.stop()
+        return pipeline
+
+    return rows, asyncio.run(main())
+
+
+def test_rows_match_the_tracker_flush():
+    frames = [(0, {"IO_0502": "9000", "IO_0550": "0000", "D_31651": "0007"}),
+              (1, {"IO_0550": "0001"}),
+              (4, {"IO_0502": "A000", "IO_0550": "0000"})]
+    rows, _ = _run(frames)
+
+    errors = ErrorTracker(MACHINE_NAME_CODE, keep_events=True)
+    for seconds, registers in frames:
+        errors.feed("AM322", _at(seconds), registers)
+    errors.tracker.flush_error_events(final=False)
+    assert rows == errors.tracker.output_rows
+    assert [row["ON/OFF"] for row in rows] == [ON_STATUS, OFF_STATUS]
+
+
+def test_debounced_rows_are_released_by_later_scans():
+    # 0.5 s blip merged into the error that restarts 0.5 s later; quiet
+    # scans past min_off_time release the end before the final flush
+    frames = [(0, {"IO_0502": "9000", "IO_0550": "0001"}), (0.5, {"IO_0550": "0000"}),
+              (1, {"IO_0550": "0001"}), (5, {"IO_0550": "0000"}),
+              (6, {"IO_0550": "0000"}), (8, {"IO_0550": "0000"})]
+    rows, _ = _run(frames, ErrorRowBuilder(MACHINE_NAME_CODE, debounce_config=DEBOUNCE), finish=False)
+
+    columns = list(rows[0])
+    assert [row[columns[0]] for row in rows] == ["2025/11/27 10:00:00", "2025/11/27 10:00:05"]
+    assert [row[columns[12]] for row in rows] == [ON_STATUS, OFF_STATUS]
+    assert rows[1][columns[13]] == 5
+    assert [row[columns[8]] for row in rows] == ["自動", "自動"]
+
+
+def test_finish_flushes_held_rows():
+    # The episode ends with the last scan, so a restart could still merge it
+    frames = [(0, {"IO_0502": "9000", "IO_0550": "0001"}), (5, {"IO_0550": "0000"})]
+    rows, _ = _run(frames, ErrorRowBuilder(MACHINE_NAME_CODE, debounce_config=DEBOUNCE), finish=False)
+    assert rows == []
+
+    rows, _ = _run(frames, ErrorRowBuilder(MACHINE_NAME_CODE, debounce_config=DEBOUNCE))
+    assert [row["ON/OFF"] for row in rows] == [ON_STATUS, OFF_STATUS]
+
+
+def test_slow_sink_throttles_submission_with_bounded_queues():
+    rows = []
+
+    async def slow_sink(batch):
+        await asyncio.sleep(0.005)
+        rows.extend(batch)
+
+    async def main():
+        pipeline = build_error_pipeline(MACHINE_NAME_CODE, {"slow": slow_sink}, queue_size=8, batch_size=4,
+                                        sink_batch_size=4, sink_max_wait=0.0)
+        await pipeline.start()
+        # Every frame toggles an error bit, so every frame becomes a row
+        for i in range(200):
+            await pipeline.on_scan("AM322", _at(i), {"IO_0502": "9000", "IO_0550": "0001" if i % 2 else "0000"})
+        await pipeline.stop()
+        return pipeline
+
+    pipeline = asyncio.run(main())
+    metrics = pipeline.metrics()
+    assert metrics["source"]["submit_blocked"] > 0
+    for stage in pipeline.stages + pipeline.sinks:
+        assert stage.queue.maxsize == 8
+        assert metrics[stage.name]["max_depth"] <= 8 + stage.batch_size
+    assert len(rows) == 199
+    assert [row["日付"] for row in rows] == sorted(row["日付"] for row in rows)
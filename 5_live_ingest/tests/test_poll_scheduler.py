@@ -0,0 +1,38 @@
+from poll_scheduler import DEFAULT_INTERVALS, build_poll_groups
+
+
+def _groups_of(groups, area, word):
+    return [group.name for group in groups if word in group.addresses.get(area, set())]
+
+
+def test_each_address_in_one_group():
+    groups = build_poll_groups()
+    seen = {}
+    for group in groups:
+        for area, words in group.addresses.items():
+            for word in words:
+                assert (area, word) not in seen, f"{area}{word} in {seen[(area, word)]} and {group.name}"
+                seen[(area, word)] = group.name
+
+
+def test_slower_column_interval_wins_over_its_category():
+    assert DEFAULT_INTERVALS['counters'] < 30.0
+    groups = build_poll_groups(column_intervals={"作業者": 30.0})
+    by_name = {group.name: group for group in groups}
+
+    assert by_name["作業者"].interval == 30.0
+    assert by_name["作業者"].addresses == {"DM": {31600, 31601}}
+    assert _groups_of(groups, "DM", 31600) == ["作業者"]
+    assert _groups_of(groups, "DM", 31601) == ["作業者"]
+
+
+def test_faster_column_interval_wins_over_its_category():
+    groups = build_poll_groups(column_intervals={"作業者": 1.0})
+    assert _groups_of(groups, "DM", 31600) == ["作業者"]
+    assert {group.name: group.interval for group in groups}["作業者"] == 1.0
+
+
+def test_column_interval_takes_bit_addresses_from_their_category():
+    groups = build_poll_groups(column_intervals={"運転モード": 1.0})
+    assert _groups_of(groups, "IO", 502) == ["運転モード"]
+    assert "mode" not in {group.name for group in groups}
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import random
+from collections import deque
+from spool import DiskSpool, SpooledSink
+
+
+def _batch(i, rows=3):
+    return [{'batch': i, 'row': j, 'machine': "AM322"} for j in range(rows)]
+
+
+def _drain(spool, max_rows=7):
+    rows = []
+    while not spool.empty:
+        batch, position = spool.read(max_rows)
+        rows.extend(batch)
+        spool.ack(position, len(batch))
+    return rows
+
+
+def test_order_is_kept_across_segment_rolls_and_reopen(tmp_path):
+    spool = DiskSpool(str(tmp_path), segment_bytes=300, max_bytes=100000)
+    for i in range(40):
+        spool.append(_batch(i))
+    assert len(spool.segments) > 5
+    rows, position = spool.read(10)
+    spool.ack(position, len(rows))
+    spool.close()
+
+    spool = DiskSpool(str(tmp_path), segment_bytes=300, max_bytes=100000)
+    for i in range(40, 50):
+        spool.append(_batch(i))
+    rows += _drain(spool)
+    assert [(row['batch'], row['row']) for row in rows] == [(i, j) for i in range(50) for j in range(3)]
+    # Delivered segments are deleted
+    assert len(spool.segments) == 1
+
+
+def test_torn_tail_is_truncated_on_reopen(tmp_path):
+    spool = DiskSpool(str(tmp_path))
+    for i in range(3):
+        spool.append(_batch(i))
+    spool.close()
+    path = spool._path(spool.write_segment)
+    good_size = os.path.getsize(path)
+    with open(path, 'ab') as f:
+        f.write(b'\x40\x00\x00\x00\x12\x34')   # header of a record that never got written
+
+    spool = DiskSpool(str(tmp_path))
+    assert os.path.getsize(path) == good_size
+    spool.append(_batch(3))
+    assert [row['batch'] for row in _drain(spool)] == [0] * 3 + [1] * 3 + [2] * 3 + [3] * 3
+    assert spool.stats["corrupt_records"] == 1
+
+
+def test_corrupt_record_skips_the_rest_of_its_segment(tmp_path):
+    spool = DiskSpool(str(tmp_path), segment_bytes=300, max_bytes=100000)
+    for i in range(10):
+        spool.append(_batch(i))
+    first = min(spool.segments)
+    with open(spool._path(first), 'r+b') as f:
+        f.seek(20)
+        f.write(b'xx')   # inside the first record's payload
+    rows = _drain(spool)
+    assert spool.stats["corrupt_records"] == 1
+    batches = sorted({row['batch'] for row in rows})
+    assert batches == list(range(batches[0], 10))
+
+
+def test_budget_eviction_drops_oldest_segments_and_moves_the_cursor(tmp_path):
+    spool = DiskSpool(str(tmp_path), segment_bytes=300, max_bytes=600)
+    for i in range(30):
+        spool.append(_batch(i))
+    assert spool.stats["segments_dropped"] > 0
+    assert sum(spool.segments.values()) <= 600
+    assert spool.cursor == (min(spool.segments), 0)
+
+    batches = [row['batch'] for row in _drain(spool)]
+    # The newest rows survive, still in order
+    assert batches == sorted(batches) and batches[-1] == 29 and batches[0] > 0
+
+
+def test_random_append_read_ack_reopen_keeps_fifo(tmp_path):
+    rng = random.Random(0)
+    spool = DiskSpool(str(tmp_path), segment_bytes=400, max_bytes=10**6)
+    expected, delivered, unacked = deque(), [], None
+    for i in range(400):
+        op = rng.random()
+        if op < 0.5:
+            batch = _batch(i, rng.randint(1, 4))
+            spool.append(batch)
+            expected.extend(row['batch'] for row in batch)
+        elif op < 0.8:
+            rows, position = spool.read(rng.randint(1, 10))
+            if rng.random() < 0.8:
+                spool.ack(position, len(rows))
+                delivered.extend(row['batch'] for row in rows)
+        else:
+            spool.close()
+            spool = DiskSpool(str(tmp_path), segment_bytes=400, max_bytes=10**6)
+    delivered.extend(row['batch'] for row in _drain(spool))
+    assert delivered == list(expected)
+
+
+def test_spooled_sink_replays_in_order_once_the_sink_is_back(tmp_path):
+    received, state = [], {'down': True}
+
+    async def insert(rows):
+        if state['down']:
+            raise ConnectionError("database down")
+        received.extend(rows)
+
+    async def main():
+        sink = SpooledSink(insert, DiskSpool(str(tmp_path)), replay_rows=4, retry_interval=0.01,
+                           max_retry_interval=0.02)
+        for i in range(5):
+            await sink(_batch(i))
+        assert received == [] and sink.stats["spooled_rows"] == 15
+        state['down'] = False
+        # New rows queue behind the spooled ones
+        await sink(_batch(5))
+        for _ in range(200):
+            if sink.spool.empty:
+                break
+            await asyncio.sleep(0.01)
+        await sink.close()
+        return sink
+
+    sink = asyncio.run(main())
+    assert [(row['batch'], row['row']) for row in received] == [(i, j) for i in range(6) for j in range(3)]
+    assert sink.stats["failures"] >= 1
+    assert sink.stats["replayed_rows"] == 18
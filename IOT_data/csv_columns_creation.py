@@ -1,12 +1,15 @@
 import csv
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 def csv_to_dict(csv_file_path, json_output_path):
     # Detect headers
     with open(csv_file_path, mode='r', encoding='utf-8-sig') as f:
         reader = csv.reader(f)
         headers = next(reader)
-        print("Detected headers:", headers)
+        logger.info("Detected headers: %s", headers)
     columns = {}
 
     with open(csv_file_path, mode='r', encoding='utf-8-sig') as f:
@@ -25,8 +28,9 @@ def csv_to_dict(csv_file_path, json_output_path):
     with open(json_output_path, mode='w', encoding='utf-8') as out:
         json.dump({"columns": columns}, out, ensure_ascii=False, indent=4)
 
-    print(f"Saved dictionary to {json_output_path}")
+    logger.info("Saved dictionary to %s", json_output_path)
 
 
 # Example usage
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 csv_to_dict("production_table_details.csv", "PRODUCTION_output.json")
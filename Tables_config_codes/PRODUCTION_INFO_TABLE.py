@@ -24,7 +24,7 @@ WORK_STATION_TABLE = {
     "Working_bit_reg":510,
     "OK_bit_reg" : 511,
     "NG_bit_reg" :512,
-    "table" : {
+    "table" : [
         {"id" :"1", "DM_reg":"DM31651", "work_bit":"510.01", "OK_bit":"511.01", "NG_bit":"512.01"},
         {"id" :"2", "DM_reg":"DM31652", "work_bit":"510.02", "OK_bit":"511.02", "NG_bit":"512.02"},
         {"id" :"3", "DM_reg":"DM31653", "work_bit":"510.03", "OK_bit":"511.03", "NG_bit":"512.03"},
@@ -40,7 +40,7 @@ WORK_STATION_TABLE = {
         {"id" :"13", "DM_reg":"DM31663", "work_bit":"510.13", "OK_bit":"511.13", "NG_bit":"512.13"},
         {"id" :"14", "DM_reg":"DM31664", "work_bit":"510.14", "OK_bit":"511.14", "NG_bit":"512.14"},
         {"id" :"15", "DM_reg":"DM31665", "work_bit":"510.15", "OK_bit":"511.15", "NG_bit":"512.15"},  
-    }
+    ]
 }
 PRODUCTION_INFO_TABLE = {
     "table_name": "PRODUCTION_TABLE",